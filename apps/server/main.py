@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
+import time
 import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
 from datetime import datetime, UTC, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from .models import (
     AnalyzeWeatherInput,
@@ -19,10 +24,56 @@ from .models import (
     ToolMeta,
     ToolResponse,
 )
+from apps.server.services.admission import Overloaded, admission, lane_for
+from apps.server.services.cache_snapshot import (
+    CACHE_SNAPSHOT_PATH,
+    restore_snapshot,
+    run_cache_snapshots,
+    save_snapshot,
+)
+from apps.server.services.deadline import (
+    DEFAULT_BUDGET_MS,
+    MAX_BUDGET_MS,
+    MIN_BUDGET_MS,
+    deadline_scope,
+    remaining_s,
+)
 from apps.server.services.faa_airspace import analyze_airspace
 from apps.server.services.faa_tfr import determine_us_state_from_latlon, fetch_tfr_list_json, filter_tfrs_by_state
-from apps.server.services.nws_weather import fetch_latest_observation_by_latlon, fetch_forecast_by_latlon, part107_compliance_assessment
-from packages.core.rules import decide_preflight
+from apps.server.services.metar_bulk import bulk_ingestion_enabled, run_bulk_ingestion
+from apps.server.services.metrics import (
+    CACHE_ENTRIES,
+    CACHE_LOOKUPS,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    REGISTRY as METRICS_REGISTRY,
+    render_metrics,
+    upstream_call,
+)
+from apps.server.services.nws_weather import (
+    ForecastTimeline,
+    fetch_forecast_by_latlon,
+    fetch_gridpoint_forecast_by_latlon,
+    fetch_latest_observation_by_latlon,
+    forecast_hour_assessment,
+    part107_compliance_assessment,
+)
+from apps.server.services.fast_json import FAST_JSON_ENABLED, FastJSONResponse
+from apps.server.services.prefetch import PREFETCH_ENABLED, PREFETCH_SEED_LIMIT, record_location, run_prefetcher
+from apps.server.services.ratelimit import BACKGROUND, INTERACTIVE, PRIORITY_BY_NAME, request_priority
+from apps.server.services.resilience import UpstreamUnavailable
+from apps.server.services.timing import (
+    current_timings,
+    end_request_timings,
+    server_timing_header,
+    span,
+    start_request_timings,
+)
+from packages.core.rules import decide_preflight_cached, decision_cache_stats
+
+logger = logging.getLogger(__name__)
 
 # Optional: Supabase logging (Phase 1 advisory snapshots)
 _SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -62,7 +113,8 @@ async def _log_advisory_snapshot(payload: dict[str, Any]) -> str | None:
 
     try:
         # Note: keep naming neutral: "advisory snapshot" not "flight log".
-        resp = sb.table(_SUPABASE_TABLE).insert(payload).execute()
+        with upstream_call("supabase", "insert"):
+            resp = await asyncio.to_thread(sb.table(_SUPABASE_TABLE).insert(payload).execute)
         # supabase-py returns .data list on success
         if getattr(resp, "data", None) and isinstance(resp.data, list) and resp.data:
             inserted = resp.data[0]
@@ -72,11 +124,58 @@ async def _log_advisory_snapshot(payload: dict[str, Any]) -> str | None:
         return None
 
 
+def _snapshot_locations() -> list[dict[str, Any]]:
+    """
+    Recent advisory snapshot locations, to seed the prefetcher (blocking; run in a thread).
+    """
+    sb = _get_supabase()
+    if sb is None:
+        return []
+    resp = (
+        sb.table(_SUPABASE_TABLE)
+        .select("location_lat,location_lon,altitude_ft,timestamp_utc")
+        .order("timestamp_utc", desc=True)
+        .limit(PREFETCH_SEED_LIMIT)
+        .execute()
+    )
+    return list(getattr(resp, "data", None) or [])
+
+
 APP_NAME = "Drone Ops & Compliance Tool Server"
 VERSION = os.getenv("APP_VERSION", "0.7.0")
 GIT_COMMIT = os.getenv("GIT_COMMIT", "unknown")
 
-app = FastAPI(title=APP_NAME, version=VERSION)
+# NWS forecasts cover the next 7 days.
+MAX_FORECAST_HOURS = 168
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background: list[asyncio.Task] = []
+    if CACHE_SNAPSHOT_PATH:
+        # Warm the caches before this worker takes traffic.
+        restored = restore_snapshot(CACHE_SNAPSHOT_PATH)
+        if restored:
+            logger.info(f"Restored cache snapshot: {restored}")
+        background.append(asyncio.create_task(run_cache_snapshots(CACHE_SNAPSHOT_PATH)))
+    with request_priority(BACKGROUND):
+        if bulk_ingestion_enabled():
+            background.append(asyncio.create_task(run_bulk_ingestion()))
+        if PREFETCH_ENABLED:
+            background.append(asyncio.create_task(run_prefetcher(seed=_snapshot_locations)))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        if CACHE_SNAPSHOT_PATH:
+            try:
+                await save_snapshot(CACHE_SNAPSHOT_PATH)
+            except Exception as e:
+                logger.error(f"Cache snapshot at shutdown failed: {e}")
+
+
+app = FastAPI(title=APP_NAME, version=VERSION, lifespan=lifespan)
 
 # CORS configuration for direct API access (mobile apps, external clients)
 app.add_middleware(
@@ -93,6 +192,95 @@ app.add_middleware(
 )
 
 
+# Per-endpoint request metrics cover the API routes only (bounded label set).
+_INSTRUMENTED_PREFIXES = ("/api/", "/tools/")
+_instrumented_paths: frozenset[str] | None = None
+
+
+def _is_instrumented(path: str) -> bool:
+    global _instrumented_paths
+    if _instrumented_paths is None:
+        _instrumented_paths = frozenset(
+            r.path for r in app.routes if getattr(r, "path", "").startswith(_INSTRUMENTED_PREFIXES)
+        )
+    return path in _instrumented_paths
+
+
+def _upstream_priority(request: Request) -> int:
+    """
+    API calls are interactive by default. Callers doing rechecks or other bulk work
+    send X-Request-Priority: batch|background to yield to pilots waiting on a
+    preflight; the header can only lower priority.
+    """
+    requested = PRIORITY_BY_NAME.get(request.headers.get("x-request-priority", "").strip().lower())
+    return max(INTERACTIVE, requested) if requested is not None else INTERACTIVE
+
+
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    path = request.url.path
+    if not _is_instrumented(path):
+        return await call_next(request)
+
+    in_flight = HTTP_IN_FLIGHT.labels(path)
+    in_flight.inc()
+    timings_token = start_request_timings()
+    start = time.perf_counter()
+    status = 500
+    try:
+        priority = _upstream_priority(request)
+        try:
+            with request_priority(priority):
+                async with admission(lane_for(priority)):
+                    response = await call_next(request)
+        except Overloaded as e:
+            response = _overloaded_response(e)
+        status = response.status_code
+        spans = end_request_timings(timings_token)
+        timings_token = None
+        if spans is not None:
+            response.headers["Server-Timing"] = server_timing_header(
+                spans, total_ms=(time.perf_counter() - start) * 1000.0
+            )
+        return response
+    finally:
+        end_request_timings(timings_token)
+        in_flight.dec()
+        HTTP_LATENCY.labels(path).observe(time.perf_counter() - start)
+        HTTP_REQUESTS.labels(path, status).inc()
+
+
+def _overloaded_response(exc: Overloaded) -> Response:
+    # Shed before any work was done; same envelope as the tool responses.
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": exc.retry_after_header},
+        content={
+            "result": {"status": "ERROR", "message": str(exc)},
+            "meta": _tool_meta(
+                sources=["server"],
+                coverage={"admission": f"shed_{exc.reason}", "lane": exc.lane},
+                errors=[str(exc)],
+            ),
+        },
+    )
+
+
+def _export_decision_cache_metrics() -> None:
+    stats = decision_cache_stats()
+    CACHE_LOOKUPS.labels("rules_decision", "hit").set_total(stats["hits"])
+    CACHE_LOOKUPS.labels("rules_decision", "miss").set_total(stats["misses"])
+    CACHE_ENTRIES.labels("rules_decision").set(stats["size"])
+
+
+METRICS_REGISTRY.add_scrape_hook(_export_decision_cache_metrics)
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/healthz")
 def healthz() -> dict[str, Any]:
     return {"ok": True, "service": APP_NAME, "timestamp_utc": utc_now_iso()}
@@ -103,14 +291,39 @@ def version() -> dict[str, Any]:
     return {"service": APP_NAME, "version": VERSION, "git_commit": GIT_COMMIT, "timestamp_utc": utc_now_iso()}
 
 
-def _tool_meta(sources: list[str], coverage: dict[str, str] | None = None, errors: list[str] | None = None, request_id: str | None = None) -> ToolMeta:
-    return ToolMeta(
-        data_timestamp_utc=utc_now_iso(),
-        sources=sources,
-        coverage=coverage or {},
-        errors=errors or [],
-        request_id=request_id,
-    )
+def _with_timings(meta: dict[str, Any]) -> dict[str, Any]:
+    timings = current_timings()
+    if timings is not None:
+        meta["timings_ms"] = timings
+    return meta
+
+
+def _tool_meta(sources: list[str], coverage: dict[str, str] | None = None, errors: list[str] | None = None, request_id: str | None = None) -> dict[str, Any]:
+    # Same keys, in the same order, as ToolMeta.model_dump().
+    return _with_timings({
+        "data_timestamp_utc": utc_now_iso(),
+        "sources": sources,
+        "coverage": coverage or {},
+        "errors": errors or [],
+        "request_id": request_id,
+    })
+
+
+def _tool_response(result: dict[str, Any], meta: dict[str, Any]) -> Response | ToolResponse:
+    """
+    Tool handlers build result and meta themselves. In fast mode those are encoded
+    as-is instead of being re-validated against ToolResponse, which stays the
+    documented response_model.
+    """
+    if FAST_JSON_ENABLED:
+        return FastJSONResponse({"result": result, "meta": meta})
+    return ToolResponse(result=result, meta=ToolMeta(**meta))
+
+
+def _json_response(content: dict[str, Any] | Response) -> dict[str, Any] | Response:
+    if FAST_JSON_ENABLED and not isinstance(content, Response):
+        return FastJSONResponse(content)
+    return content
 
 
 @app.exception_handler(Exception)
@@ -125,11 +338,119 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
                 coverage={"exception": "unhandled"},
                 errors=[str(exc)],
                 request_id=None,
-            ).model_dump(),
+            ),
         },
     )
 
 
+async def _preflight_airspace_data(latitude: float, longitude: float, altitude_ft: int) -> dict[str, Any]:
+    airspace_res = await analyze_airspace(latitude, longitude, altitude_ft)
+    return {
+        **airspace_res.summary(),
+        "coordinates": {"lat": latitude, "lon": longitude},
+        "altitude_ft_agl": altitude_ft,
+    }
+
+
+async def _preflight_tfr_data(latitude: float, longitude: float) -> dict[str, Any]:
+    state = None
+    unavailable = None
+    try:
+        with span("state_lookup"):
+            state = await determine_us_state_from_latlon(latitude, longitude)
+    except UpstreamUnavailable as e:
+        unavailable = str(e)
+    tfr_data = {
+        "state": state,
+        "tfr_count": 0,
+        "status": "CLEAR",
+        "advisory": "State-level TFR check only. Verify at tfr.faa.gov before flight.",
+    }
+
+    if state:
+        try:
+            with span("tfr_fetch"):
+                full_tfrs = await fetch_tfr_list_json()
+            filtered_tfrs = filter_tfrs_by_state(full_tfrs, state)
+            tfr_data["tfr_count"] = len(filtered_tfrs)
+            tfr_data["status"] = "CLEAR" if len(filtered_tfrs) == 0 else "UNKNOWN"
+        except Exception as e:
+            # The TFR list could not be checked: never report CLEAR.
+            tfr_data["status"] = "UNKNOWN"
+            if isinstance(e, UpstreamUnavailable):
+                unavailable = str(e)
+
+    if unavailable:
+        tfr_data["status"] = "UNKNOWN"
+        tfr_data["coverage"] = {"tfr": "upstream_unavailable", "error": unavailable}
+
+    return tfr_data
+
+
+async def _preflight_weather(
+    latitude: float, longitude: float, mode: str, flight_time: datetime
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Forecast or latest observation; a short-circuited NWS yields empty conditions,
+    which the compliance check reports as UNKNOWN.
+    """
+    try:
+        if mode == "FORECAST":
+            return await fetch_forecast_by_latlon(latitude, longitude, flight_time)
+        return await fetch_latest_observation_by_latlon(latitude, longitude)
+    except UpstreamUnavailable as e:
+        return {}, {"weather": "upstream_unavailable", "error": str(e)}
+
+
+_T = TypeVar("_T")
+
+# Snapshot inserts still running after their response was sent (kept referenced until done).
+_pending_snapshots: set[asyncio.Task] = set()
+
+# Budget held back from the upstream sections for rules, logging and serialization.
+_RESPONSE_RESERVE_S = 0.15
+
+
+async def _within_budget(
+    section: str, work: Awaitable[_T], fallback: Callable[[str], _T], exhausted: list[str]
+) -> _T:
+    """
+    Await one preflight section, cut off when the request budget (less the response
+    reserve) runs out. A section that runs out returns fallback("deadline_exceeded").
+    """
+    remaining = remaining_s()
+    timeout = None if remaining is None else max(0.0, remaining - _RESPONSE_RESERVE_S)
+    try:
+        return await asyncio.wait_for(work, timeout=timeout)
+    except TimeoutError:  # includes DeadlineExceeded from the upstream layer
+        exhausted.append(section)
+        return fallback("deadline_exceeded")
+
+
+def _airspace_unknown(latitude: float, longitude: float, altitude_ft: int, reason: str) -> dict[str, Any]:
+    return {
+        "airspace_class": "Unknown",
+        "facility": None,
+        "laanc_required": None,
+        "laanc_available": None,
+        "max_altitude_ft": None,
+        "restrictions": [],
+        "coordinates": {"lat": latitude, "lon": longitude},
+        "altitude_ft_agl": altitude_ft,
+        "coverage": {"airspace": reason},
+    }
+
+
+def _tfr_unknown(reason: str) -> dict[str, Any]:
+    return {
+        "state": None,
+        "tfr_count": 0,
+        "status": "UNKNOWN",
+        "advisory": "State-level TFR check only. Verify at tfr.faa.gov before flight.",
+        "coverage": {"tfr": reason},
+    }
+
+
 # NEW UNIFIED PREFLIGHT ENDPOINT
 class PreflightCheckInput(BaseModel):
     latitude: float
@@ -137,6 +458,8 @@ class PreflightCheckInput(BaseModel):
     altitude_ft: int
     flight_datetime: str  # ISO format
     mission_type: str = "recreational"
+    # Total time the caller will wait; sections still pending when it runs out come back UNKNOWN.
+    budget_ms: int | None = Field(None, ge=MIN_BUDGET_MS, le=MAX_BUDGET_MS)
 
 
 @app.post("/api/preflight")
@@ -144,7 +467,17 @@ async def unified_preflight_check(inp: PreflightCheckInput) -> dict[str, Any]:
     """
     Unified preflight check that handles both real-time and forecast modes.
     Determines mode based on flight_datetime.
+
+    Airspace, weather and TFR lookups run concurrently under one deadline budget
+    (budget_ms, or PREFLIGHT_BUDGET_MS); see _within_budget.
     """
+    budget_ms = inp.budget_ms or DEFAULT_BUDGET_MS
+    with deadline_scope(budget_ms / 1000.0):
+        payload = await _unified_preflight_check(inp, budget_ms)
+    return _json_response(payload)
+
+
+async def _unified_preflight_check(inp: PreflightCheckInput, budget_ms: int) -> dict[str, Any]:
     request_id = str(uuid.uuid4())
     
     # Parse flight datetime
@@ -166,7 +499,7 @@ async def unified_preflight_check(inp: PreflightCheckInput) -> dict[str, Any]:
             content={"error": "Cannot check past dates"}
         )
     
-    if hours_until_flight > 168:  # 7 days
+    if hours_until_flight > MAX_FORECAST_HOURS:  # 7 days
         return JSONResponse(
             status_code=400,
             content={"error": "Forecasts only available for next 7 days"}
@@ -175,32 +508,37 @@ async def unified_preflight_check(inp: PreflightCheckInput) -> dict[str, Any]:
     # Determine mode
     mode = "REAL_TIME" if hours_until_flight <= 24 else "FORECAST"
     
+    record_location(inp.latitude, inp.longitude, inp.altitude_ft)
+
     # Calculate recheck deadline (24 hours before flight)
     recheck_deadline = (flight_time - timedelta(hours=24)).isoformat()
     
-    # Check airspace (same for both modes)
-    airspace_res = await analyze_airspace(inp.latitude, inp.longitude, inp.altitude_ft)
-    airspace_data = {
-        "airspace_class": airspace_res.airspace_class,
-        "facility": airspace_res.facility or airspace_res.airspace_name,
-        "laanc_required": airspace_res.laanc_required,
-        "laanc_available": airspace_res.laanc_available,
-        "max_altitude_ft": airspace_res.max_altitude_ft,
-        "restrictions": airspace_res.restrictions,
-        "coordinates": {"lat": inp.latitude, "lon": inp.longitude},
-        "altitude_ft_agl": inp.altitude_ft,
-    }
-    
-    # Fetch weather (forecast vs current based on mode)
-    if mode == "FORECAST":
-        weather_conditions, weather_meta = await fetch_forecast_by_latlon(
-            inp.latitude, inp.longitude, flight_time
-        )
-    else:
-        weather_conditions, weather_meta = await fetch_latest_observation_by_latlon(
-            inp.latitude, inp.longitude
-        )
-    
+    # Airspace, weather (forecast vs current based on mode) and TFRs, concurrently
+    exhausted: list[str] = []
+
+    async def _airspace() -> dict[str, Any]:
+        with span("airspace"):
+            return await _preflight_airspace_data(inp.latitude, inp.longitude, inp.altitude_ft)
+
+    async def _weather() -> tuple[dict[str, Any], dict[str, Any]]:
+        with span("weather"):
+            return await _preflight_weather(inp.latitude, inp.longitude, mode, flight_time)
+
+    async def _tfr() -> dict[str, Any]:
+        with span("tfr"):
+            return await _preflight_tfr_data(inp.latitude, inp.longitude)
+
+    airspace_data, (weather_conditions, weather_meta), tfr_data = await asyncio.gather(
+        _within_budget(
+            "airspace",
+            _airspace(),
+            lambda reason: _airspace_unknown(inp.latitude, inp.longitude, inp.altitude_ft, reason),
+            exhausted,
+        ),
+        _within_budget("weather", _weather(), lambda reason: ({}, {"weather": reason}), exhausted),
+        _within_budget("tfr", _tfr(), _tfr_unknown, exhausted),
+    )
+
     # Part 107 compliance
     compliance = part107_compliance_assessment(
         visibility_sm=weather_conditions.get("visibility_sm"),
@@ -212,32 +550,17 @@ async def unified_preflight_check(inp: PreflightCheckInput) -> dict[str, Any]:
         "current_conditions": weather_conditions,
         "part107_compliance": compliance,
     }
-    
-    # Check TFRs
-    state = await determine_us_state_from_latlon(inp.latitude, inp.longitude)
-    tfr_data = {
-        "state": state,
-        "tfr_count": 0,
-        "status": "CLEAR",
-        "advisory": "State-level TFR check only. Verify at tfr.faa.gov before flight.",
-    }
-    
-    if state:
-        try:
-            full_tfrs = await fetch_tfr_list_json()
-            filtered_tfrs = filter_tfrs_by_state(full_tfrs, state)
-            tfr_data["tfr_count"] = len(filtered_tfrs)
-            tfr_data["status"] = "CLEAR" if len(filtered_tfrs) == 0 else "UNKNOWN"
-        except Exception:
-            pass
+    if weather_meta.get("weather") in ("upstream_unavailable", "deadline_exceeded"):
+        weather_data["coverage"] = weather_meta
     
     # Generate decision
-    decision = decide_preflight(
-        mission_type=inp.mission_type,
-        airspace_data=airspace_data,
-        weather_data=weather_data,
-        tfr_data=tfr_data,
-    )
+    with span("rules"):
+        decision = decide_preflight_cached(
+            mission_type=inp.mission_type,
+            airspace_data=airspace_data,
+            weather_data=weather_data,
+            tfr_data=tfr_data,
+        )
     
     # Log to Supabase
     snapshot_payload = {
@@ -255,19 +578,21 @@ async def unified_preflight_check(inp: PreflightCheckInput) -> dict[str, Any]:
             "airspace": airspace_data,
             "weather": weather_data,
             "tfr": tfr_data,
-            "checklist": {
-                "overall_status": decision.overall_status,
-                "required_actions": decision.required_actions,
-                "checklist_items": decision.checklist_items,
-                "rationale": decision.rationale,
-                "disclaimers": decision.disclaimers,
-            },
+            "checklist": decision.to_dict(),
         },
         "tool_version": VERSION,
         "source": "web",
     }
     
-    await _log_advisory_snapshot(snapshot_payload)
+    # Best effort: a slow insert finishes in the background instead of holding the response.
+    with span("snapshot"):
+        snapshot_task = asyncio.create_task(_log_advisory_snapshot(snapshot_payload))
+        _pending_snapshots.add(snapshot_task)
+        snapshot_task.add_done_callback(_pending_snapshots.discard)
+        remaining = remaining_s()
+        await asyncio.wait(
+            {snapshot_task}, timeout=None if remaining is None else max(0.0, remaining - _RESPONSE_RESERVE_S / 2)
+        )
     
     # Return response
     return {
@@ -279,14 +604,8 @@ async def unified_preflight_check(inp: PreflightCheckInput) -> dict[str, Any]:
         "airspace": airspace_data,
         "weather": weather_data,
         "tfr": tfr_data,
-        "checklist": {
-            "overall_status": decision.overall_status,
-            "required_actions": decision.required_actions,
-            "checklist_items": decision.checklist_items,
-            "rationale": decision.rationale,
-            "disclaimers": decision.disclaimers,
-        },
-        "meta": {
+        "checklist": decision.to_dict(),
+        "meta": _with_timings({
             "request_id": request_id,
             "data_timestamp_utc": utc_now_iso(),
             "sources": [
@@ -294,22 +613,222 @@ async def unified_preflight_check(inp: PreflightCheckInput) -> dict[str, Any]:
                 "NOAA/NWS API",
                 "FAA TFR Feed",
             ],
+            "decision_cache": decision_cache_stats(),
+            "budget": {"budget_ms": budget_ms, "exhausted": exhausted},
+        }),
+    }
+
+
+class LaunchWindowInput(BaseModel):
+    latitude: float
+    longitude: float
+    altitude_ft: int
+    start_datetime: str | None = None  # ISO format; defaults to now
+    hours: int = Field(MAX_FORECAST_HOURS, ge=1, le=MAX_FORECAST_HOURS)
+    mission_type: str = "recreational"
+    max_windows: int = Field(10, ge=1, le=50)
+    # Total time the caller will wait for the airspace, TFR and forecast lookups.
+    budget_ms: int | None = Field(None, ge=MIN_BUDGET_MS, le=MAX_BUDGET_MS)
+
+
+_STATUS_RANK = {"GO": 0, "GO_WITH_CONDITIONS": 1, "NO_GO": 2}
+_HALF_HOUR = timedelta(minutes=30)
+
+
+def _rank_launch_windows(hourly: list[dict[str, Any]], max_windows: int) -> list[dict[str, Any]]:
+    """
+    Group consecutive flyable hours with the same decision into windows and rank them:
+    GO before GO_WITH_CONDITIONS, then lower peak wind, lower peak precipitation
+    chance, longer duration, earlier start.
+    """
+    windows: list[dict[str, Any]] = []
+    current: dict[str, Any] | None = None
+
+    for hour in hourly:
+        if hour["overall_status"] == "NO_GO":
+            current = None
+            continue
+        if current is None or current["overall_status"] != hour["overall_status"] or current["_end"] != hour["time"]:
+            current = {
+                "overall_status": hour["overall_status"],
+                "_start": hour["time"],
+                "_hours": [],
+            }
+            windows.append(current)
+        current["_hours"].append(hour)
+        current["_end"] = hour["time"] + timedelta(hours=1)
+
+    def peak(values: list[Any]) -> float | None:
+        present = [v for v in values if v is not None]
+        return max(present) if present else None
+
+    ranked: list[dict[str, Any]] = []
+    for w in windows:
+        hours = w["_hours"]
+        ranked.append(
+            {
+                "start": w["_start"].isoformat(),
+                "end": w["_end"].isoformat(),
+                "duration_hours": len(hours),
+                "overall_status": w["overall_status"],
+                "max_wind_speed_kt": peak([h["wind_speed_kt"] for h in hours]),
+                "max_precipitation_probability": peak([h["precipitation_probability"] for h in hours]),
+                "forecast_periods": list(dict.fromkeys(h["period_name"] for h in hours)),
+                "required_actions": hours[0]["required_actions"],
+            }
+        )
+
+    def sort_key(w: dict[str, Any]) -> tuple:
+        wind = w["max_wind_speed_kt"]
+        precip = w["max_precipitation_probability"]
+        return (
+            _STATUS_RANK[w["overall_status"]],
+            float("inf") if wind is None else wind,
+            float("inf") if precip is None else precip,
+            -w["duration_hours"],
+            w["start"],
+        )
+
+    ranked.sort(key=sort_key)
+    return ranked[:max_windows]
+
+
+@app.post("/api/launch_windows")
+async def find_launch_windows(inp: LaunchWindowInput) -> dict[str, Any]:
+    """
+    Evaluate every hour in a range (up to the 7-day forecast limit) for one location
+    and return ranked launch windows.
+
+    Airspace, TFRs and the gridpoint forecast are fetched once, concurrently, under
+    one deadline budget (budget_ms, or PREFLIGHT_BUDGET_MS); see _within_budget.
+    Each hour's forecast wind and precipitation are then graded against the launch
+    limits (forecast_hour_assessment) and run through the same rules as
+    /api/preflight. Hours past a limit count as NO_GO and are excluded.
+    """
+    budget_ms = inp.budget_ms or DEFAULT_BUDGET_MS
+    with deadline_scope(budget_ms / 1000.0):
+        payload = await _find_launch_windows(inp, budget_ms)
+    return _json_response(payload)
+
+
+async def _find_launch_windows(inp: LaunchWindowInput, budget_ms: int) -> dict[str, Any]:
+    request_id = str(uuid.uuid4())
+    now = datetime.now(UTC)
+
+    start = now
+    if inp.start_datetime:
+        try:
+            start = datetime.fromisoformat(inp.start_datetime.replace("Z", "+00:00"))
+        except Exception:
+            return JSONResponse(status_code=400, content={"error": "Invalid start_datetime format. Use ISO format."})
+        if start.tzinfo is None:
+            return JSONResponse(status_code=400, content={"error": "start_datetime must include a timezone offset"})
+        if start < now - timedelta(hours=1):
+            return JSONResponse(status_code=400, content={"error": "Cannot check past dates"})
+
+    # Evaluate on whole hours, never past the forecast horizon.
+    start = max(start, now)
+    if start.minute or start.second or start.microsecond:
+        start = start.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    horizon = now + timedelta(hours=MAX_FORECAST_HOURS)
+    if start > horizon:
+        return JSONResponse(status_code=400, content={"error": "Forecasts only available for next 7 days"})
+    end = min(start + timedelta(hours=inp.hours), horizon)
+
+    exhausted: list[str] = []
+
+    async def _airspace() -> dict[str, Any]:
+        with span("airspace"):
+            return await _preflight_airspace_data(inp.latitude, inp.longitude, inp.altitude_ft)
+
+    async def _tfr() -> dict[str, Any]:
+        with span("tfr"):
+            return await _preflight_tfr_data(inp.latitude, inp.longitude)
+
+    async def _forecast() -> tuple[ForecastTimeline | None, dict[str, Any]]:
+        try:
+            with span("weather"):
+                return await fetch_gridpoint_forecast_by_latlon(inp.latitude, inp.longitude)
+        except UpstreamUnavailable as e:
+            return None, {"weather": "upstream_unavailable", "error": str(e)}
+
+    airspace_data, tfr_data, (timeline, forecast_meta) = await asyncio.gather(
+        _within_budget(
+            "airspace",
+            _airspace(),
+            lambda reason: _airspace_unknown(inp.latitude, inp.longitude, inp.altitude_ft, reason),
+            exhausted,
+        ),
+        _within_budget("tfr", _tfr(), _tfr_unknown, exhausted),
+        _within_budget("weather", _forecast(), lambda reason: (None, {"weather": reason}), exhausted),
+    )
+    if timeline is None:
+        reason = forecast_meta.get("error") or forecast_meta["weather"]
+        return JSONResponse(status_code=503, content={"error": f"Forecast temporarily unavailable: {reason}"})
+
+    hourly: list[dict[str, Any]] = []
+    t = start
+    while t < end:
+        # Grade the hour by the period covering its middle: forecast_at() gives a
+        # shared period boundary to the earlier period.
+        conditions = timeline.forecast_at(t + _HALF_HOUR)
+        if conditions is None:
+            break
+        compliance = forecast_hour_assessment(conditions)
+        with span("rules"):
+            decision = decide_preflight_cached(
+                mission_type=inp.mission_type,
+                airspace_data=airspace_data,
+                weather_data={"current_conditions": conditions, "part107_compliance": compliance},
+                tfr_data=tfr_data,
+            )
+        hourly.append(
+            {
+                "time": t,
+                "overall_status": "NO_GO" if compliance["overall_status"] == "POOR" else decision.overall_status,
+                "required_actions": decision.required_actions,
+                "wind_speed_kt": conditions["wind_speed_kt"],
+                "precipitation_probability": conditions["precipitation_probability"],
+                "period_name": conditions["period_name"],
+            }
+        )
+        t += timedelta(hours=1)
+
+    return {
+        "query": {
+            "latitude": inp.latitude,
+            "longitude": inp.longitude,
+            "altitude_ft": inp.altitude_ft,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "mission_type": inp.mission_type,
         },
+        "hours_evaluated": len(hourly),
+        "windows": _rank_launch_windows(hourly, inp.max_windows),
+        "airspace": airspace_data,
+        "tfr": tfr_data,
+        "meta": _with_timings({
+            "request_id": request_id,
+            "data_timestamp_utc": utc_now_iso(),
+            "sources": [
+                "FAA UAS Data Delivery System",
+                "NOAA/NWS API",
+                "FAA TFR Feed",
+            ],
+            "coverage": {"weather": "nws_gridpoint_forecast", "forecast": forecast_meta},
+            "budget": {"budget_ms": budget_ms, "exhausted": exhausted},
+        }),
     }
 
 
 @app.post("/tools/check_airspace", response_model=ToolResponse)
-async def tool_check_airspace(inp: CheckAirspaceInput) -> ToolResponse:
+async def tool_check_airspace(inp: CheckAirspaceInput) -> Response | ToolResponse:
     request_id = str(uuid.uuid4())
-    res = await analyze_airspace(inp.latitude, inp.longitude, inp.altitude_ft_agl)
-    return ToolResponse(
+    with span("airspace"):
+        res = await analyze_airspace(inp.latitude, inp.longitude, inp.altitude_ft_agl)
+    return _tool_response(
         result={
-            "airspace_class": res.airspace_class,
-            "facility": res.facility or res.airspace_name,
-            "laanc_required": res.laanc_required,
-            "laanc_available": res.laanc_available,
-            "max_altitude_ft": res.max_altitude_ft,
-            "restrictions": res.restrictions,
+            **res.summary(),
             "coordinates": {"lat": inp.latitude, "lon": inp.longitude},
             "status": "AUTHORIZATION_REQUIRED" if res.laanc_required else ("CLEAR" if res.laanc_required is False else "UNKNOWN"),
         },
@@ -323,14 +842,20 @@ async def tool_check_airspace(inp: CheckAirspaceInput) -> ToolResponse:
 
 
 @app.post("/tools/analyze_weather_conditions", response_model=ToolResponse)
-async def tool_weather(inp: AnalyzeWeatherInput) -> ToolResponse:
+async def tool_weather(inp: AnalyzeWeatherInput) -> Response | ToolResponse:
     request_id = str(uuid.uuid4())
-    current, meta = await fetch_latest_observation_by_latlon(inp.latitude, inp.longitude)
+    errors: list[str] = []
+    try:
+        with span("weather"):
+            current, meta = await fetch_latest_observation_by_latlon(inp.latitude, inp.longitude)
+    except UpstreamUnavailable as e:
+        current, meta = {}, {"weather": "upstream_unavailable"}
+        errors.append(str(e))
     compliance = part107_compliance_assessment(
         visibility_sm=current.get("visibility_sm"),
         cloud_ceiling_ft=current.get("cloud_ceiling_ft"),
     )
-    return ToolResponse(
+    return _tool_response(
         result={
             "current_conditions": current,
             "part107_compliance": compliance,
@@ -339,21 +864,22 @@ async def tool_weather(inp: AnalyzeWeatherInput) -> ToolResponse:
         meta=_tool_meta(
             sources=["NOAA/NWS API (api.weather.gov)"],
             coverage=meta,
-            errors=[],
+            errors=errors,
             request_id=request_id,
         ),
     )
 
 
 @app.post("/tools/check_tfrs", response_model=ToolResponse)
-async def tool_tfrs(inp: CheckTfrsInput) -> ToolResponse:
+async def tool_tfrs(inp: CheckTfrsInput) -> Response | ToolResponse:
     request_id = str(uuid.uuid4())
     errors: list[str] = []
     coverage: dict[str, str] = {"tfr": "attempted"}
 
     state = None
     try:
-        state = await determine_us_state_from_latlon(inp.latitude, inp.longitude)
+        with span("state_lookup"):
+            state = await determine_us_state_from_latlon(inp.latitude, inp.longitude)
     except Exception as e:
         errors.append(str(e))
 
@@ -363,7 +889,8 @@ async def tool_tfrs(inp: CheckTfrsInput) -> ToolResponse:
 
     if state:
         try:
-            full = await fetch_tfr_list_json()
+            with span("tfr_fetch"):
+                full = await fetch_tfr_list_json()
             tfrs = filter_tfrs_by_state(full, state)
             status = "CLEAR" if len(tfrs) == 0 else "UNKNOWN"
             advisory = (
@@ -377,7 +904,7 @@ async def tool_tfrs(inp: CheckTfrsInput) -> ToolResponse:
         except Exception as e:
             errors.append(str(e))
 
-    return ToolResponse(
+    return _tool_response(
         result={
             "query": {
                 "latitude": inp.latitude,
@@ -402,27 +929,22 @@ async def tool_tfrs(inp: CheckTfrsInput) -> ToolResponse:
 
 
 @app.post("/tools/generate_preflight_checklist", response_model=ToolResponse)
-async def tool_generate_checklist(inp: GenerateChecklistInput) -> ToolResponse:
+async def tool_generate_checklist(inp: GenerateChecklistInput) -> Response | ToolResponse:
     """
-    IMPORTANT: Do NOT splat kwargs into decide_preflight.
+    IMPORTANT: Do NOT splat kwargs into decide_preflight_cached.
     Call explicitly to avoid UnrecognizedKwargsError.
     """
     request_id = str(uuid.uuid4())
 
-    decision = decide_preflight(
-        mission_type=inp.mission_type,
-        airspace_data=inp.airspace_data,
-        weather_data=inp.weather_data,
-        tfr_data=inp.tfr_data,
-    )
+    with span("rules"):
+        decision = decide_preflight_cached(
+            mission_type=inp.mission_type,
+            airspace_data=inp.airspace_data,
+            weather_data=inp.weather_data,
+            tfr_data=inp.tfr_data,
+        )
 
-    result = {
-        "overall_status": decision.overall_status,
-        "required_actions": decision.required_actions,
-        "checklist_items": decision.checklist_items,
-        "rationale": decision.rationale,
-        "disclaimers": decision.disclaimers,
-    }
+    result = decision.to_dict()
 
     # Extract coordinates from airspace_data for logging
     coords = inp.airspace_data.get("coordinates", {})
@@ -452,25 +974,30 @@ async def tool_generate_checklist(inp: GenerateChecklistInput) -> ToolResponse:
             "source": "web",
         }
         
-        snapshot_id = await _log_advisory_snapshot(snapshot_payload)
+        with span("snapshot"):
+            snapshot_id = await _log_advisory_snapshot(snapshot_payload)
     else:
         snapshot_id = None
 
     meta = _tool_meta(
         sources=["Internal rules engine (packages/core/rules.py)"],
-        coverage={"checklist": "generated", "supabase_snapshot": "inserted" if snapshot_id else "skipped_or_failed"},
+        coverage={
+            "checklist": "generated",
+            "supabase_snapshot": "inserted" if snapshot_id else "skipped_or_failed",
+            "decision_cache": decision_cache_stats(),
+        },
         errors=[],
         request_id=request_id,
     )
 
-    return ToolResponse(result=result, meta=meta)
+    return _tool_response(result, meta)
 
 
 @app.post("/tools/generate_laanc_deep_link", response_model=ToolResponse)
-async def tool_generate_laanc(inp: GenerateLaancLinksInput) -> ToolResponse:
+async def tool_generate_laanc(inp: GenerateLaancLinksInput) -> Response | ToolResponse:
     request_id = str(uuid.uuid4())
     # Phase 1: official FAA links only; no provider names.
-    return ToolResponse(
+    return _tool_response(
         result={
             "flight_summary": {
                 "location": f"{inp.latitude}°, {inp.longitude}°",
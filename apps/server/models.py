@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import UTC, datetime
 from typing import Any, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_serializer
 
 def utc_now_iso() -> str:
     return datetime.now(UTC).isoformat().replace("+00:00", "Z")
@@ -12,6 +12,14 @@ class ToolMeta(BaseModel):
     coverage: dict[str, Any] = Field(default_factory=dict)
     errors: list[str] = Field(default_factory=list)
     request_id: str | None = None
+    timings_ms: dict[str, float] | None = None  # only present when request timings are on
+
+    @model_serializer(mode="wrap")
+    def _drop_empty_timings(self, handler):
+        data = handler(self)
+        if data.get("timings_ms") is None:
+            data.pop("timings_ms", None)
+        return data
 
 class ToolResponse(BaseModel):
     result: dict[str, Any]
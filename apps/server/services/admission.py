@@ -0,0 +1,227 @@
+"""
+Admission control for the API routes (/api/*, /tools/*).
+
+Each lane allows a fixed number of requests in flight and has a short FIFO queue
+in front. A request that finds the queue full, or that waits longer than
+ADMISSION_QUEUE_TIMEOUT_MS for a slot, is shed right away with a 503 and
+Retry-After. This is cheaper than letting slow upstreams pile up requests until
+the worker runs out of memory or sockets.
+
+Requests go to the "interactive" lane by default. Requests that send
+X-Request-Priority: batch|background go to the "batch" lane, which has its own,
+smaller limits, so rechecks cannot take the slots pilots are waiting for.
+
+ADMISSION_LIMITS sets the limits, e.g. "interactive=64:64,batch=16:16"
+(max in flight : max queued). Lanes without a limit are not gated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
+from .metrics import Counter, Gauge, Histogram
+from .ratelimit import INTERACTIVE
+from .timing import add_span
+
+INTERACTIVE_LANE = "interactive"
+BATCH_LANE = "batch"
+
+DEFAULT_ADMISSION_LIMITS = "interactive=64:64,batch=16:16"
+ADMISSION_QUEUE_TIMEOUT_MS = int(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "500"))
+ADMISSION_RETRY_AFTER_S = float(os.getenv("ADMISSION_RETRY_AFTER_S", "1"))
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "http_admission_in_flight",
+    "Admitted API requests currently in flight, by lane.",
+    ("lane",),
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "http_admission_queue_depth",
+    "API requests waiting for admission, by lane.",
+    ("lane",),
+)
+ADMISSION_SHED = Counter(
+    "http_admission_shed_total",
+    "API requests rejected with 503 by admission control, by lane and reason.",
+    ("lane", "reason"),
+)
+ADMISSION_WAIT = Histogram(
+    "http_admission_wait_seconds",
+    "Time admitted API requests spent queued for a slot, by lane.",
+    ("lane",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+class Overloaded(Exception):
+    """
+    The request was shed; respond 503 with Retry-After: retry_after_s.
+    """
+
+    def __init__(self, lane: str, reason: str, retry_after_s: float) -> None:
+        super().__init__(f"Server busy ({lane} lane {reason.replace('_', ' ')}). Retry later.")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after_s)))
+
+
+def parse_admission_limits(spec: str) -> dict[str, tuple[int, int]]:
+    """
+    "interactive=64:64,batch=16" -> {"interactive": (64, 64), "batch": (16, 0)}. The queue defaults to 0.
+    """
+    limits: dict[str, tuple[int, int]] = {}
+    for item in spec.split(","):
+        name, sep, value = item.strip().partition("=")
+        if not sep:
+            continue
+        in_flight_s, _, queue_s = value.partition(":")
+        try:
+            max_in_flight = int(in_flight_s)
+            max_queue = int(queue_s) if queue_s else 0
+        except ValueError:
+            continue
+        if max_in_flight > 0:
+            limits[name.strip()] = (max_in_flight, max(0, max_queue))
+    return limits
+
+
+class AdmissionGate:
+    """
+    At most `max_in_flight` holders; up to `max_queue` callers wait FIFO for at most
+    `queue_timeout_s`. release() hands the slot straight to the oldest waiter.
+    """
+
+    def __init__(
+        self,
+        lane: str,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout_s: float = ADMISSION_QUEUE_TIMEOUT_MS / 1000.0,
+        retry_after_s: float = ADMISSION_RETRY_AFTER_S,
+    ) -> None:
+        self.lane = lane
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.retry_after_s = retry_after_s
+        self.in_flight = 0
+        self.shed = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    def queued(self) -> int:
+        return sum(1 for fut in self._waiters if not fut.done())
+
+    def _shed(self, reason: str) -> Overloaded:
+        self.shed += 1
+        ADMISSION_SHED.labels(self.lane, reason).inc()
+        return Overloaded(self.lane, reason, self.retry_after_s)
+
+    async def acquire(self) -> float:
+        """
+        Take a slot; returns the time spent queued (seconds). Raises Overloaded.
+        """
+        if self.in_flight < self.max_in_flight and not self.queued():
+            self.in_flight += 1
+            ADMISSION_IN_FLIGHT.labels(self.lane).inc()
+            return 0.0
+        if self.queued() >= self.max_queue:
+            raise self._shed("queue_full")
+
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        ADMISSION_QUEUE_DEPTH.labels(self.lane).inc()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(fut, timeout=self.queue_timeout_s)
+        except TimeoutError:
+            if not fut.done() or fut.cancelled():
+                raise self._shed("queue_timeout") from None
+        except BaseException:
+            if fut.done() and not fut.cancelled():
+                self.release()  # handed a slot just as we were cancelled
+            raise
+        finally:
+            ADMISSION_QUEUE_DEPTH.labels(self.lane).dec()
+            with suppress(ValueError):
+                self._waiters.remove(fut)
+        return time.perf_counter() - start
+
+    def release(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)  # the slot passes over; in_flight is unchanged
+                return
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.labels(self.lane).dec()
+
+
+_LIMITS = parse_admission_limits(os.getenv("ADMISSION_LIMITS", DEFAULT_ADMISSION_LIMITS))
+_GATES: dict[str, AdmissionGate] = {}
+
+
+def lane_for(priority: int) -> str:
+    return INTERACTIVE_LANE if priority <= INTERACTIVE else BATCH_LANE
+
+
+def gate_for(lane: str) -> AdmissionGate | None:
+    gate = _GATES.get(lane)
+    if gate is None:
+        limit = _LIMITS.get(lane)
+        if limit is None:
+            return None
+        gate = _GATES[lane] = AdmissionGate(lane, *limit)
+    return gate
+
+
+@asynccontextmanager
+async def admission(lane: str) -> AsyncIterator[None]:
+    """
+    Hold a slot in `lane` for the duration of the block, or raise Overloaded.
+    """
+    gate = gate_for(lane)
+    if gate is None:
+        yield
+        return
+    waited = await gate.acquire()
+    ADMISSION_WAIT.labels(lane).observe(waited)
+    if waited:
+        add_span("admission.queue", waited * 1000.0)
+    try:
+        yield
+    finally:
+        gate.release()
+
+
+def admission_stats() -> dict[str, dict[str, int]]:
+    return {
+        lane: {
+            "max_in_flight": g.max_in_flight,
+            "max_queue": g.max_queue,
+            "in_flight": g.in_flight,
+            "queued": g.queued(),
+            "shed": g.shed,
+        }
+        for lane, g in _GATES.items()
+    }
+
+
+def reset_admission(limits: dict[str, tuple[int, int]] | None = None) -> None:
+    """
+    Drop all gates (tests) and use `limits`, or the configured ones when None.
+    """
+    global _LIMITS
+    _GATES.clear()
+    _LIMITS = dict(limits) if limits is not None else parse_admission_limits(
+        os.getenv("ADMISSION_LIMITS", DEFAULT_ADMISSION_LIMITS)
+    )
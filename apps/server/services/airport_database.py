@@ -1,12 +1,22 @@
 """
 Fallback airport database for airspace classification.
 Used when FAA polygon queries return ambiguous results.
+
+AIRPORTS below is the built-in table. A deployment can instead point
+AIRPORT_DATASET_PATH at a memory-mapped dataset (see dataset.py) built with
+`python -m apps.server.services.airport_database out.dods`; lookups then read the
+shared mapping and pick up a rebuilt file without a restart.
 """
 
 from dataclasses import dataclass
 import math
+import os
+
+from .dataset import DatasetError, DatasetHandle, write_dataset
 
-@dataclass
+AIRPORT_DATASET_PATH = os.getenv("AIRPORT_DATASET_PATH")
+
+@dataclass(frozen=True, slots=True)
 class Airport:
     icao: str
     name: str
@@ -203,8 +213,68 @@ def haversine_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return R_nm * c
 
 
+def build_airport_dataset(path: str, airports: list[Airport] = AIRPORTS) -> int:
+    """Write airports as a mapped dataset; returns its build version."""
+    return write_dataset(
+        path,
+        "airports",
+        {
+            "icao": ("str", [a.icao for a in airports]),
+            "name": ("str", [a.name for a in airports]),
+            "lat": ("f8", [a.lat for a in airports]),
+            "lon": ("f8", [a.lon for a in airports]),
+            "airspace_class": ("str", [a.airspace_class for a in airports]),
+            "radius_nm": ("f8", [a.radius_nm for a in airports]),
+            "ceiling_ft": ("i4", [a.ceiling_ft for a in airports]),
+        },
+    )
+
+
+_dataset: DatasetHandle | None = None
+_dataset_loaded = False
+
+
+def _airport_dataset() -> DatasetHandle | None:
+    global _dataset, _dataset_loaded
+    if not _dataset_loaded:
+        _dataset_loaded = True
+        if AIRPORT_DATASET_PATH:
+            try:
+                _dataset = DatasetHandle(AIRPORT_DATASET_PATH)
+            except (OSError, DatasetError):
+                _dataset = None  # fall back to the built-in table
+    return _dataset
+
+
+def _find_nearest_mapped(handle: DatasetHandle, latitude: float, longitude: float, max_distance_nm: float) -> Airport | None:
+    ds = handle.get()
+    lat, lon = ds.column("lat"), ds.column("lon")
+    dlat = max_distance_nm / 60.0
+    dlon = dlat / max(math.cos(math.radians(latitude)), 0.01)
+    best, best_d = None, float('inf')
+    for r in ds.records_in_box(latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon):
+        d = haversine_nm(latitude, longitude, lat[r], lon[r])
+        if d < best_d and d <= max_distance_nm:
+            best, best_d = r, d
+    if best is None:
+        return None
+    return Airport(
+        ds.column("icao")[best],
+        ds.column("name")[best],
+        lat[best],
+        lon[best],
+        ds.column("airspace_class")[best],
+        ds.column("radius_nm")[best],
+        ds.column("ceiling_ft")[best],
+    )
+
+
 def find_nearest_airport(latitude: float, longitude: float, max_distance_nm: float = 15) -> Airport | None:
     """Find the nearest airport within max_distance_nm."""
+    handle = _airport_dataset()
+    if handle is not None:
+        return _find_nearest_mapped(handle, latitude, longitude, max_distance_nm)
+
     nearest = None
     min_distance = float('inf')
     
@@ -251,4 +321,12 @@ def classify_by_airport_proximity(
     
     facility_name = airport.name
     
-    return (airspace_class, laanc_required, ceiling_ft, facility_name, distance_nm)
\ No newline at end of file
+    return (airspace_class, laanc_required, ceiling_ft, facility_name, distance_nm)
+
+
+if __name__ == "__main__":
+    import sys
+
+    out = sys.argv[1] if len(sys.argv) > 1 else "airports.dods"
+    version = build_airport_dataset(out)
+    print(f"Wrote {out} ({len(AIRPORTS)} airports, build {version})")
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from .deadline import detached_context
+from .metrics import CACHE_ENTRIES, CACHE_LOOKUPS, REGISTRY
+from .shared_cache import get_backend, shared_get, shared_set
+
+# Every TTLCache registers itself here so stats can be reported in one place.
+_REGISTRY: dict[str, TTLCache] = {}
+
+_REFRESH_AHEAD_S: ContextVar[float] = ContextVar("cache_refresh_ahead_s", default=0.0)
+
+
+@contextmanager
+def refresh_ahead(seconds: float) -> Iterator[None]:
+    """
+    Treat entries expiring within `seconds` as expired for lookups in this block
+    (and tasks it spawns), so a background refresher reloads them before users miss.
+    """
+    token = _REFRESH_AHEAD_S.set(seconds)
+    try:
+        yield
+    finally:
+        _REFRESH_AHEAD_S.reset(token)
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache with a per-entry expiry (wall-clock epoch seconds).
+
+    Expired entries are not returned by get(), but stay in place until they are
+    overwritten or evicted so callers can still peek() at the previous value.
+
+    With shared=True the cache is an L1 in front of the cross-worker L2 (see
+    shared_cache). The L2 is only touched from async paths, in a worker thread so
+    its I/O never blocks the event loop: get_or_load() and get_shared() read
+    through to it on an L1 miss, and get_or_load() and set_shared() write through
+    with the same expiry. get() and set() are L1 only. Without a configured
+    backend (SHARED_CACHE_URL unset) there is no thread hop at all. Values must
+    be picklable.
+
+    With persistent=True the live entries are included in the on-disk snapshot
+    that warms the cache after a restart (see cache_snapshot).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        default_ttl_s: float | None = None,
+        shared: bool = False,
+        persistent: bool = False,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.default_ttl_s = default_ttl_s
+        self.shared = shared
+        self.persistent = persistent
+        self._data: OrderedDict[Any, tuple[Any, float]] = OrderedDict()
+        self.hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._inflight: dict[Any, asyncio.Task] = {}
+        _REGISTRY[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any) -> Any | None:
+        """
+        L1 lookup (no I/O).
+        """
+        ahead = _REFRESH_AHEAD_S.get()
+        value = self._get_l1(key, ahead)
+        if value is None and not ahead:
+            self.misses += 1
+        return value
+
+    async def get_shared(self, key: Any) -> Any | None:
+        """
+        get(), reading through to the L2 (off the event loop) on an L1 miss.
+        """
+        if not self.shared:
+            return self.get(key)
+        value = self._get_l1(key, _REFRESH_AHEAD_S.get())
+        if value is None:
+            value = await self._get_l2(key)
+        return value
+
+    def _get_l1(self, key: Any, ahead: float) -> Any | None:
+        # Inside refresh_ahead(), entries that expire within the window count as
+        # missing so the caller reloads them early; such lookups stay out of the stats.
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.time() + ahead:
+            return None
+        self._data.move_to_end(key)
+        if not ahead:
+            self.hits += 1
+        return entry[0]
+
+    async def _get_l2(self, key: Any) -> Any | None:
+        # Counts the lookup as an L2 hit or a miss; a hit is copied into the L1.
+        ahead = _REFRESH_AHEAD_S.get()
+        # No backend configured (the default): a plain miss, without a thread hop.
+        found = None if get_backend() is None else await asyncio.to_thread(shared_get, self.name, key)
+        if found is not None and found[1] > time.time() + ahead:
+            if not ahead:
+                self.l2_hits += 1
+            self._store(key, found[0], found[1])
+            return found[0]
+        if not ahead:
+            self.misses += 1
+        return None
+
+    def peek(self, key: Any) -> tuple[Any, float] | None:
+        """
+        Return (value, expires_at) even if expired. Does not touch stats or LRU order.
+        """
+        return self._data.get(key)
+
+    def set(self, key: Any, value: Any, ttl_s: float | None = None, expires_at: float | None = None) -> float:
+        """
+        L1 store (no I/O). Returns the entry's expires_at.
+        """
+        if expires_at is None:
+            ttl = self.default_ttl_s if ttl_s is None else ttl_s
+            if ttl is None:
+                raise ValueError(f"TTLCache {self.name!r} needs a ttl_s or expires_at.")
+            expires_at = time.time() + ttl
+        self._store(key, value, expires_at)
+        return expires_at
+
+    async def set_shared(
+        self, key: Any, value: Any, ttl_s: float | None = None, expires_at: float | None = None
+    ) -> None:
+        """
+        set(), writing through to the L2 (off the event loop).
+        """
+        expires_at = self.set(key, value, ttl_s=ttl_s, expires_at=expires_at)
+        if self.shared and get_backend() is not None:
+            await asyncio.to_thread(shared_set, self.name, key, value, expires_at)
+
+    def _store(self, key: Any, value: Any, expires_at: float) -> None:
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Any, loader: Callable[[], Awaitable[tuple[Any, float]]]) -> Any:
+        """
+        Return the cached value, or run `loader` once for all concurrent callers.
+
+        `loader` returns (value, expires_at). Concurrent misses for the same key share
+        a single in-flight load; a caller being cancelled does not cancel the load.
+        The load is detached from the first caller's deadline budget: each caller is
+        bounded by its own budget, and the load may finish later to fill the cache.
+        For shared caches the load first tries the L2, and writes the loaded value
+        through to it.
+        """
+        ahead = _REFRESH_AHEAD_S.get()
+        value = self._get_l1(key, ahead)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+
+            async def _load() -> Any:
+                try:
+                    if self.shared:
+                        found = await self._get_l2(key)
+                        if found is not None:
+                            return found
+                    elif not ahead:
+                        self.misses += 1
+                    loaded, expires_at = await loader()
+                    await self.set_shared(key, loaded, expires_at=expires_at)
+                    return loaded
+                finally:
+                    self._inflight.pop(key, None)
+
+            task = asyncio.get_running_loop().create_task(_load(), context=detached_context())
+            self._inflight[key] = task
+        elif not ahead:
+            self.misses += 1  # joined a load already in flight
+
+        return await asyncio.shield(task)
+
+    def live_entries(self) -> list[tuple[Any, Any, float]]:
+        """
+        Unexpired (key, value, expires_at), least recently used first.
+        """
+        now = time.time()
+        return [(key, value, expires_at) for key, (value, expires_at) in self._data.items() if expires_at > now]
+
+    def restore(self, entries: list[tuple[Any, Any, float]]) -> int:
+        """
+        Load entries from live_entries() (e.g. of a previous process), keeping their
+        expiry. Expired ones are skipped and current entries win. Returns the count loaded.
+        """
+        now = time.time()
+        loaded = 0
+        for key, value, expires_at in reversed(entries):
+            if expires_at <= now or key in self._data:
+                continue
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key, last=False)  # behind anything already cached
+            loaded += 1
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return loaded
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._inflight.clear()
+        self.hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.l2_hits + self.misses
+        stats = {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.l2_hits) / lookups, 4) if lookups else None,
+        }
+        if self.shared:
+            stats["l2_hits"] = self.l2_hits
+        return stats
+
+
+def registered_caches() -> dict[str, TTLCache]:
+    return dict(_REGISTRY)
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    return {name: cache.stats() for name, cache in _REGISTRY.items()}
+
+
+def _export_cache_metrics() -> None:
+    for name, cache in _REGISTRY.items():
+        CACHE_LOOKUPS.labels(name, "hit").set_total(cache.hits)
+        CACHE_LOOKUPS.labels(name, "miss").set_total(cache.misses)
+        if cache.shared:
+            CACHE_LOOKUPS.labels(name, "l2_hit").set_total(cache.l2_hits)
+        CACHE_ENTRIES.labels(name).set(len(cache))
+
+
+REGISTRY.add_scrape_hook(_export_cache_metrics)
@@ -0,0 +1,105 @@
+"""
+Warm restarts: persist the live entries of persistent TTLCaches to local disk
+(periodically and at shutdown) and load them at startup, before the worker
+serves traffic. Entries keep their absolute expiry, so a restored entry lives
+exactly as long as it would have in the old process.
+
+CACHE_SNAPSHOT_PATH enables it (unset = off). Every worker writes the same file
+by atomic rename; the newest snapshot wins, which is fine for a warm-up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import pickle
+import time
+from typing import Any
+
+from .cache import registered_caches
+
+logger = logging.getLogger(__name__)
+
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH")
+CACHE_SNAPSHOT_INTERVAL_S = float(os.getenv("CACHE_SNAPSHOT_INTERVAL_S", "300"))
+
+SNAPSHOT_FORMAT = 1
+
+
+def collect_snapshot() -> dict[str, Any]:
+    """
+    Copy out the entries to persist. Cheap (no serialization), so it runs on the
+    event loop while the caches cannot change underneath it.
+    """
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "written_at": time.time(),
+        "caches": {name: cache.live_entries() for name, cache in registered_caches().items() if cache.persistent},
+    }
+
+
+def write_snapshot(snapshot: dict[str, Any], path: str) -> None:
+    """
+    Serialize per cache (a value that cannot be pickled drops only its cache), then
+    write to a temporary file and rename it into place.
+    """
+    caches: dict[str, bytes] = {}
+    for name, entries in snapshot["caches"].items():
+        try:
+            caches[name] = pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.error(f"Cache snapshot skipped {name}: {e}")
+    payload = pickle.dumps({**snapshot, "caches": caches}, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "wb") as fh:
+        fh.write(payload)
+    os.replace(tmp, path)
+
+
+def restore_snapshot(path: str) -> dict[str, int]:
+    """
+    Load a snapshot into the registered caches. Returns entries restored per cache.
+    A missing, foreign or partly unreadable snapshot restores what it can.
+    """
+    try:
+        with open(path, "rb") as fh:
+            snapshot = pickle.load(fh)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error(f"Cache snapshot {path} unreadable: {e}")
+        return {}
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        logger.error(f"Cache snapshot {path} has an unknown format; ignored")
+        return {}
+
+    caches = registered_caches()
+    restored: dict[str, int] = {}
+    for name, blob in (snapshot.get("caches") or {}).items():
+        cache = caches.get(name)
+        if cache is None or not cache.persistent:
+            continue
+        try:
+            # A value whose class changed shape between deploys fails here; skip that cache.
+            restored[name] = cache.restore(pickle.loads(blob))
+        except Exception as e:
+            logger.error(f"Cache snapshot for {name} not restored: {e}")
+    return restored
+
+
+async def save_snapshot(path: str) -> None:
+    snapshot = collect_snapshot()
+    await asyncio.to_thread(write_snapshot, snapshot, path)
+
+
+async def run_cache_snapshots(path: str, interval_s: float = CACHE_SNAPSHOT_INTERVAL_S) -> None:
+    """
+    Background loop: snapshot every interval_s. Failures keep the previous file.
+    """
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await save_snapshot(path)
+        except Exception as e:
+            logger.error(f"Cache snapshot failed: {e}")
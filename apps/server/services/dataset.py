@@ -0,0 +1,274 @@
+"""
+Versioned, memory-mapped binary datasets for static reference data.
+
+A dataset file holds one table of records (airports, observation stations, ...)
+as fixed-width column arrays plus a lat/lon grid index. Workers mmap the file
+read-only: columns are memoryviews straight onto the mapping, so opening costs a
+header parse, and the pages are shared by every worker through the OS page cache
+instead of being copied into each heap as Python objects.
+
+Layout (little-endian, sections 8-byte aligned):
+
+    header    magic "DODS", format version, record count, kind, build version,
+              grid cell size (deg), section count
+    sections  (name, type, offset, length) per section
+    data      one section per column, then the grid index:
+                __cell_keys    int64, sorted cell keys (cell_key())
+                __cell_starts  uint32, first record of each cell, plus a final
+                               entry = record count
+
+Records are stored sorted by grid cell, so each cell's records are contiguous.
+
+Column types: "f8" float64, "i4" int32, "i1" int8, "str" (uint32 end offsets in
+"<name>" and UTF-8 bytes in "<name>.utf8").
+
+Files are written to a temporary name and renamed into place. MappedDataset
+readers keep the old mapping until they notice the new file (see DatasetHandle),
+so a new build can land while workers are serving.
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+MAGIC = b"DODS"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI16sQdI")
+_SECTION = struct.Struct("<32s4sQQ")
+_ALIGN = 8
+
+_TYPECODES = {"f8": "d", "i4": "i", "i1": "b"}
+_INDEX_KEYS = "__cell_keys"
+_INDEX_STARTS = "__cell_starts"
+
+# Missing tri-state flags in "i1" columns.
+I1_NONE = -1
+
+
+class DatasetError(ValueError):
+    """
+    The file is not a dataset this code can read (bad magic, version or layout).
+    """
+
+
+def cell_key(lat: float, lon: float, cell_deg: float) -> int:
+    """
+    Grid cell of a point, as one int64 that sorts by (lat row, lon column).
+    """
+    return cell_key_ij(math.floor(lat / cell_deg), math.floor(lon / cell_deg))
+
+
+def cell_key_ij(i: int, j: int) -> int:
+    return (i << 20) + j
+
+
+def _pad(n: int) -> int:
+    return (-n) % _ALIGN
+
+
+def tri_state(value: bool | None) -> int:
+    return I1_NONE if value is None else int(bool(value))
+
+
+def from_tri_state(value: int) -> bool | None:
+    return None if value == I1_NONE else bool(value)
+
+
+def write_dataset(
+    path: str,
+    kind: str,
+    columns: dict[str, tuple[str, Sequence[Any]]],
+    *,
+    lat_column: str = "lat",
+    lon_column: str = "lon",
+    cell_deg: float = 0.5,
+    build_version: int | None = None,
+) -> int:
+    """
+    Write `columns` ({name: (type, values)}, all the same length) as a dataset and
+    atomically rename it to `path`. Returns the build version (default: now, in ms).
+    """
+    lengths = {len(values) for _, values in columns.values()}
+    if len(lengths) > 1:
+        raise DatasetError(f"Columns differ in length: {sorted(lengths)}")
+    n = lengths.pop() if lengths else 0
+    lats, lons = columns[lat_column][1], columns[lon_column][1]
+    keys = [cell_key(lats[r], lons[r], cell_deg) for r in range(n)]
+    order = sorted(range(n), key=lambda r: keys[r])
+
+    sections: list[tuple[str, str, bytes]] = []
+    for name, (typ, values) in columns.items():
+        ordered = [values[r] for r in order]
+        if typ == "str":
+            blobs = [str(v).encode("utf-8") for v in ordered]
+            ends, total = [], 0
+            for b in blobs:
+                total += len(b)
+                ends.append(total)
+            sections.append((name, "str", struct.pack(f"<{n}I", *ends)))
+            sections.append((f"{name}.utf8", "u1", b"".join(blobs)))
+        elif typ in _TYPECODES:
+            sections.append((name, typ, struct.pack(f"<{n}{_TYPECODES[typ]}", *ordered)))
+        else:
+            raise DatasetError(f"Unsupported column type {typ!r} for {name!r}")
+
+    cell_keys: list[int] = []
+    cell_starts: list[int] = []
+    for pos, r in enumerate(order):
+        if not cell_keys or keys[r] != cell_keys[-1]:
+            cell_keys.append(keys[r])
+            cell_starts.append(pos)
+    cell_starts.append(n)
+    sections.append((_INDEX_KEYS, "i8", struct.pack(f"<{len(cell_keys)}q", *cell_keys)))
+    sections.append((_INDEX_STARTS, "u4", struct.pack(f"<{len(cell_starts)}I", *cell_starts)))
+
+    if build_version is None:
+        build_version = int(time.time() * 1000)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, n, kind.encode("utf-8")[:16], build_version, cell_deg, len(sections)
+    )
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    offset += _pad(offset)
+    table, body = [], []
+    for name, typ, data in sections:
+        table.append(_SECTION.pack(name.encode("utf-8"), typ.encode("ascii"), offset, len(data)))
+        body.append(data + b"\0" * _pad(len(data)))
+        offset += len(data) + _pad(len(data))
+
+    head = header + b"".join(table)
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "wb") as fh:
+        fh.write(head + b"\0" * _pad(len(head)))
+        for chunk in body:
+            fh.write(chunk)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    return build_version
+
+
+class StringColumn:
+    """
+    Read-only sequence of str decoded on access from the mapped UTF-8 section.
+    """
+
+    __slots__ = ("_ends", "_blob")
+
+    def __init__(self, ends: memoryview, blob: memoryview) -> None:
+        self._ends = ends
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, i: int) -> str:
+        start = self._ends[i - 1] if i > 0 else 0
+        return bytes(self._blob[start : self._ends[i]]).decode("utf-8")
+
+
+class MappedDataset:
+    """
+    One open (mmapped) dataset file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as fh:
+            st = os.fstat(fh.fileno())
+            self.identity = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if st.st_size < _HEADER.size:  # mmap refuses an empty file with a bare ValueError
+                raise DatasetError(f"{path}: too short for a dataset header")
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+        magic, version, _, n, kind, build, cell_deg, n_sections = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise DatasetError(f"{path}: not a dataset file")
+        if version != FORMAT_VERSION:
+            raise DatasetError(f"{path}: format version {version}, expected {FORMAT_VERSION}")
+        self.kind = kind.rstrip(b"\0").decode("utf-8")
+        self.build_version = build
+        self.cell_deg = cell_deg
+        self._n = n
+
+        if _HEADER.size + n_sections * _SECTION.size > len(view):
+            raise DatasetError(f"{path}: section table extends past end of file")
+        raw: dict[str, tuple[str, memoryview]] = {}
+        for s in range(n_sections):
+            name, typ, offset, length = _SECTION.unpack_from(view, _HEADER.size + s * _SECTION.size)
+            if offset + length > len(view):
+                raise DatasetError(f"{path}: section extends past end of file")
+            raw[name.rstrip(b"\0").decode("utf-8")] = (typ.rstrip(b"\0").decode("ascii"), view[offset : offset + length])
+
+        if _INDEX_KEYS not in raw or _INDEX_STARTS not in raw:
+            raise DatasetError(f"{path}: grid index missing")
+        self.columns: dict[str, Any] = {}
+        for name, (typ, section) in raw.items():
+            if typ in _TYPECODES:
+                self.columns[name] = section.cast(_TYPECODES[typ])
+            elif typ == "str":
+                self.columns[name] = StringColumn(section.cast("I"), raw[f"{name}.utf8"][1])
+        self._cell_keys = raw[_INDEX_KEYS][1].cast("q")
+        self._cell_starts = raw[_INDEX_STARTS][1].cast("I")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def column(self, name: str) -> Any:
+        return self.columns[name]
+
+    def records_in_box(self, lat_lo: float, lon_lo: float, lat_hi: float, lon_hi: float) -> Iterator[int]:
+        """
+        Indexes of records in the grid cells overlapping the box (a superset of the
+        records inside it; callers filter by exact distance).
+        """
+        i_lo, i_hi = math.floor(lat_lo / self.cell_deg), math.floor(lat_hi / self.cell_deg)
+        j_lo, j_hi = math.floor(lon_lo / self.cell_deg), math.floor(lon_hi / self.cell_deg)
+        keys, starts = self._cell_keys, self._cell_starts
+        for i in range(i_lo, i_hi + 1):
+            # Cells of one lat row sort contiguously by lon column.
+            lo = bisect_left(keys, cell_key_ij(i, j_lo))
+            hi = bisect_right(keys, cell_key_ij(i, j_hi))
+            if lo < hi:
+                yield from range(starts[lo], starts[hi])
+
+
+class DatasetHandle:
+    """
+    Path-bound accessor that picks up a replaced file (atomic rename by a new
+    build) at most every `check_interval_s`. The previous mapping stays alive
+    until no caller references it.
+    """
+
+    def __init__(self, path: str, check_interval_s: float = 30.0) -> None:
+        self.path = path
+        self.check_interval_s = check_interval_s
+        self._current = MappedDataset(path)
+        self._checked_at = time.monotonic()
+
+    def get(self) -> MappedDataset:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval_s:
+            self._checked_at = now
+            try:
+                st = os.stat(self.path)
+                if (st.st_ino, st.st_mtime_ns, st.st_size) != self._current.identity:
+                    self._current = MappedDataset(self.path)
+            except (OSError, DatasetError):
+                pass  # keep serving the mapping we have
+        return self._current
+
+
+def is_dataset_file(path: str) -> bool:
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
@@ -0,0 +1,78 @@
+"""
+Request deadline budget.
+
+An endpoint opens a deadline_scope(budget_s). The absolute deadline travels in a
+contextvar, so every upstream call made for that request (see resilient_get) caps
+its timeout at the remaining time instead of its own fixed timeout_s. Sections
+that run out of budget are cut off by the endpoint and reported as UNKNOWN.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+
+# Server default for /api/preflight when the client sends no budget_ms.
+DEFAULT_BUDGET_MS = int(os.getenv("PREFLIGHT_BUDGET_MS", "8000"))
+MIN_BUDGET_MS = 500
+MAX_BUDGET_MS = 30_000
+
+_DEADLINE: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    The request's budget ran out before the call could be made.
+    """
+
+
+@contextmanager
+def deadline_scope(budget_s: float) -> Iterator[float]:
+    """
+    Run the block under a deadline `budget_s` from now (never later than an
+    enclosing deadline). Yields the absolute deadline (time.monotonic()).
+    """
+    deadline = time.monotonic() + budget_s
+    outer = _DEADLINE.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _DEADLINE.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _DEADLINE.reset(token)
+
+
+def detached_context() -> Context:
+    """
+    A copy of the current context without the deadline, for tasks that serve more
+    than one request (e.g. a shared cache load).
+    """
+    ctx = copy_context()
+    ctx.run(_DEADLINE.set, None)
+    return ctx
+
+
+def remaining_s() -> float | None:
+    """
+    Seconds left in the current budget (may be <= 0), or None without a deadline.
+    """
+    deadline = _DEADLINE.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def cap_timeout(timeout_s: float | None) -> float | None:
+    """
+    min(timeout_s, remaining budget). Raises DeadlineExceeded when nothing is left.
+    """
+    remaining = remaining_s()
+    if remaining is None:
+        return timeout_s
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline budget exhausted.")
+    return remaining if timeout_s is None else min(timeout_s, remaining)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import os
+import time
+from array import array
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
@@ -7,13 +11,27 @@ from typing import Any
 import httpx
 
 from .airport_database import classify_by_airport_proximity
+from .cache import TTLCache
+from .dataset import from_tri_state, tri_state
+from .resilience import UpstreamUnavailable, resilient_get
 
 DEFAULT_UA = "drone-ops-compliance/0.1 (contact: replace-before-prod)"
 
-# FAA UAS Data Delivery System (ArcGIS) layers
-UASFM_LAYER_URL = "https://services6.arcgis.com/ssFJjBXIUyZDrSYZ/arcgis/rest/services/FAA_UAS_FacilityMap_Data_V5/FeatureServer/0/query"
-CLASS_AIRSPACE_LAYER_URL = (
-    "https://services6.arcgis.com/ssFJjBXIUyZDrSYZ/arcgis/rest/services/Class_Airspace/FeatureServer/0/query"
+# FAA UAS Data Delivery System (ArcGIS) layers. Overridable to point at a stand-in (load tests).
+UASFM_LAYER_URL = os.getenv(
+    "UASFM_LAYER_URL",
+    "https://services6.arcgis.com/ssFJjBXIUyZDrSYZ/arcgis/rest/services/FAA_UAS_FacilityMap_Data_V5/FeatureServer/0/query",
+)
+CLASS_AIRSPACE_LAYER_URL = os.getenv(
+    "CLASS_AIRSPACE_LAYER_URL",
+    "https://services6.arcgis.com/ssFJjBXIUyZDrSYZ/arcgis/rest/services/Class_Airspace/FeatureServer/0/query",
+)
+
+
+# Raw ArcGIS layer responses per exact query. The layers follow the 56-day charting
+# cycle, so hours-old answers are still current; shared across workers via the L2.
+ARCGIS_QUERY_CACHE = TTLCache(
+    "arcgis_query", maxsize=8192, default_ttl_s=6 * 3600, shared=True, persistent=True
 )
 
 
@@ -21,7 +39,7 @@ def utc_now_iso() -> str:
     return datetime.now(UTC).isoformat().replace("+00:00", "Z")
 
 
-@dataclass
+@dataclass(slots=True)
 class AirspaceResult:
     airspace_class: str
     airspace_name: str | None
@@ -33,6 +51,110 @@ class AirspaceResult:
     raw: dict[str, Any]
     debug: dict[str, Any]
 
+    def summary(self) -> dict[str, Any]:
+        """
+        The fields the API reports (airspace_data / check_airspace result), in order.
+        """
+        return {
+            "airspace_class": self.airspace_class,
+            "facility": self.facility or self.airspace_name,
+            "laanc_required": self.laanc_required,
+            "laanc_available": self.laanc_available,
+            "max_altitude_ft": self.max_altitude_ft,
+            "restrictions": self.restrictions,
+        }
+
+
+_NO_CEILING = -1
+
+
+class _Interned:
+    """
+    Values stored once, referenced by an index. Bulk results repeat a handful of
+    class names, facilities and restriction lists.
+    """
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self) -> None:
+        self.values: list[Any] = []
+        self._index: dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class AirspaceResultBatch:
+    """
+    Compact column storage for many airspace results (batch and corridor checks).
+
+    Each row keeps only what the API reports: the summary() fields plus the point
+    that was checked. Strings and restriction lists are interned and the rest are
+    typed arrays. The raw ArcGIS payloads and debug info are not kept. to_dict(i)
+    and dicts() build the per-point airspace_data dicts on demand.
+    """
+
+    def __init__(self) -> None:
+        self.latitude = array("d")
+        self.longitude = array("d")
+        self.altitude_ft = array("i")
+        self.laanc_required = array("b")
+        self.laanc_available = array("b")
+        self.max_altitude_ft = array("i")
+        self._class = array("I")
+        self._facility = array("I")
+        self._restrictions = array("I")
+        self._strings = _Interned()
+        self._restriction_sets = _Interned()
+
+    def __len__(self) -> int:
+        return len(self.latitude)
+
+    def append(self, result: AirspaceResult, latitude: float, longitude: float, altitude_ft: int) -> None:
+        self.latitude.append(latitude)
+        self.longitude.append(longitude)
+        self.altitude_ft.append(altitude_ft)
+        self.laanc_required.append(tri_state(result.laanc_required))
+        self.laanc_available.append(tri_state(result.laanc_available))
+        self.max_altitude_ft.append(_NO_CEILING if result.max_altitude_ft is None else int(result.max_altitude_ft))
+        self._class.append(self._strings.code(result.airspace_class))
+        self._facility.append(self._strings.code(result.facility or result.airspace_name))
+        self._restrictions.append(self._restriction_sets.code(tuple(result.restrictions)))
+
+    def airspace_class(self, i: int) -> str:
+        return self._strings.values[self._class[i]]
+
+    def airspace_classes(self) -> list[str]:
+        values = self._strings.values
+        return [values[c] for c in self._class]
+
+    def laanc_required_values(self) -> list[bool | None]:
+        return [from_tri_state(v) for v in self.laanc_required]
+
+    def to_dict(self, i: int) -> dict[str, Any]:
+        """
+        Row i in the /api/preflight airspace_data shape.
+        """
+        ceiling = self.max_altitude_ft[i]
+        return {
+            "airspace_class": self._strings.values[self._class[i]],
+            "facility": self._strings.values[self._facility[i]],
+            "laanc_required": from_tri_state(self.laanc_required[i]),
+            "laanc_available": from_tri_state(self.laanc_available[i]),
+            "max_altitude_ft": None if ceiling == _NO_CEILING else ceiling,
+            "restrictions": list(self._restriction_sets.values[self._restrictions[i]]),
+            "coordinates": {"lat": self.latitude[i], "lon": self.longitude[i]},
+            "altitude_ft_agl": self.altitude_ft[i],
+        }
+
+    def dicts(self) -> Iterator[dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.to_dict(i)
+
 
 def _arcgis_point_geometry(latitude: float, longitude: float, wkid: int = 4326) -> str:
     return f'{{"x":{longitude},"y":{latitude},"spatialReference":{{"wkid":{wkid}}}}}'
@@ -49,6 +171,7 @@ async def _arcgis_query(
     distance_m: int | None = None,
     timeout_s: float = 15.0,
     user_agent: str = DEFAULT_UA,
+    layer: str = "unknown",
 ) -> dict[str, Any]:
     headers = {"User-Agent": user_agent}
     params: dict[str, Any] = {
@@ -69,10 +192,29 @@ async def _arcgis_query(
         params["distance"] = str(int(distance_m))
         params["units"] = "esriSRUnit_Meter"
 
-    async with httpx.AsyncClient(timeout=timeout_s, headers=headers, follow_redirects=True) as client:
-        r = await client.get(url, params=params)
-        r.raise_for_status()
-        return r.json()
+    async def _load() -> tuple[dict[str, Any], float]:
+        async with httpx.AsyncClient(timeout=timeout_s, headers=headers, follow_redirects=True) as client:
+            r = await resilient_get(client, url, params=params, upstream="arcgis", operation=layer)
+            r.raise_for_status()
+            body = r.json()
+        # ArcGIS reports query errors as 200 {"error": ...}: hand it back, but do not keep it.
+        now = time.time()
+        return body, now if "error" in body else now + ARCGIS_QUERY_CACHE.default_ttl_s
+
+    return await ARCGIS_QUERY_CACHE.get_or_load((url, tuple(sorted(params.items()))), _load)
+
+
+async def _arcgis_query_or_empty(url: str, debug: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+    """
+    _arcgis_query, except that a short-circuited layer yields no features so the
+    conservative fallbacks below take over.
+    """
+    try:
+        return await _arcgis_query(url, **kwargs)
+    except UpstreamUnavailable as e:
+        debug.setdefault("unavailable_layers", []).append(kwargs.get("layer"))
+        debug["unavailable_reason"] = str(e)
+        return {"features": []}
 
 
 def _pick_best_feature(features: list[dict[str, Any]]) -> dict[str, Any] | None:
@@ -181,13 +323,15 @@ async def analyze_airspace(latitude: float, longitude: float, altitude_ft_agl: f
 
     # 1) Class Airspace query (best-effort)
     class_out_fields = "CLASS,NAME,IDENT,ICAO_ID,LOWER_DESC,LOWER_VAL,LOWER_UOM,LOWER_CODE,UPPER_DESC,UPPER_VAL,UPPER_UOM,UPPER_CODE"
-    class_resp = await _arcgis_query(
+    class_resp = await _arcgis_query_or_empty(
         CLASS_AIRSPACE_LAYER_URL,
+        debug,
         latitude=latitude,
         longitude=longitude,
         out_fields=class_out_fields,
         in_sr=4326,
         out_sr=4326,
+        layer="class_airspace",
     )
     raw["class_airspace"] = class_resp
 
@@ -208,8 +352,9 @@ async def analyze_airspace(latitude: float, longitude: float, altitude_ft_agl: f
         "APT1_NAME,APT1_ICAO,APT1_LAANC,APT2_LAANC,APT3_LAANC,APT4_LAANC,APT5_LAANC,REGION"
     )
 
-    uasfm_resp = await _arcgis_query(
+    uasfm_resp = await _arcgis_query_or_empty(
         UASFM_LAYER_URL,
+        debug,
         latitude=latitude,
         longitude=longitude,
         out_fields=uasfm_out_fields,
@@ -217,14 +362,16 @@ async def analyze_airspace(latitude: float, longitude: float, altitude_ft_agl: f
         out_sr=4326,
         spatial_rel="esriSpatialRelIntersects",
         distance_m=None,
+        layer="uasfm",
     )
     uasfm_features = uasfm_resp.get("features") or []
 
     # If we got nothing, try a nearby search (helps when boundaries are tiny or SR quirks occur)
     if len(uasfm_features) == 0:
         debug["uasfm_query_mode"] = "distance_2000m"
-        uasfm_resp = await _arcgis_query(
+        uasfm_resp = await _arcgis_query_or_empty(
             UASFM_LAYER_URL,
+            debug,
             latitude=latitude,
             longitude=longitude,
             out_fields=uasfm_out_fields,
@@ -232,6 +379,7 @@ async def analyze_airspace(latitude: float, longitude: float, altitude_ft_agl: f
             out_sr=4326,
             spatial_rel="esriSpatialRelIntersects",
             distance_m=2000,
+            layer="uasfm",
         )
         uasfm_features = uasfm_resp.get("features") or []
 
@@ -276,7 +424,11 @@ async def analyze_airspace(latitude: float, longitude: float, altitude_ft_agl: f
             prox_facility,
             prox_distance_nm,
         ) = classify_by_airport_proximity(latitude, longitude, altitude_ft_agl)
-        
+
+        # With a layer short-circuited, "no nearby airport" is not evidence of Class G.
+        if debug.get("unavailable_layers") and prox_laanc_req is False:
+            prox_class = None
+
         if prox_class is not None:
             if class_letter is None:
                 airspace_class = prox_class
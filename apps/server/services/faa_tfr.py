@@ -1,35 +1,27 @@
 from __future__ import annotations
 
 import json
-from datetime import UTC, datetime, timedelta
+import os
+import time
 from typing import Any
 
 import httpx
 
+from .cache import TTLCache
+from .resilience import resilient_get
+
 # FAA TFR list export endpoint
-FAA_TFR_JSON_URL = "https://tfr.faa.gov/tfr3/export/json"
+FAA_TFR_JSON_URL = os.getenv("FAA_TFR_JSON_URL", "https://tfr.faa.gov/tfr3/export/json")
 
 # NWS points endpoint (used to map lat/lon -> US state)
-NWS_POINTS_URL = "https://api.weather.gov/points/{lat:.4f},{lon:.4f}"
+NWS_BASE = os.getenv("NWS_BASE", "https://api.weather.gov")
+NWS_POINTS_URL = NWS_BASE + "/points/{lat:.4f},{lon:.4f}"
 
 DEFAULT_UA = "drone-ops-compliance/0.1 (contact: replace-before-prod)"
 
-# Simple in-memory cache to avoid hammering FAA on repeat calls.
-_CACHE: dict[str, Any] = {
-    "tfr_list": None,
-    "tfr_list_fetched_at": None,
-}
-
-
-def _utc_now() -> datetime:
-    return datetime.now(UTC)
-
-
-def _cache_is_fresh(max_age_seconds: int) -> bool:
-    fetched_at = _CACHE.get("tfr_list_fetched_at")
-    if fetched_at is None:
-        return False
-    return (_utc_now() - fetched_at) <= timedelta(seconds=max_age_seconds)
+# The parsed national TFR list, shared by every caller (and every worker, via the L2)
+# for a short time to avoid hammering FAA on repeat calls.
+TFR_LIST_CACHE = TTLCache("faa_tfr_list", maxsize=1, default_ttl_s=60, shared=True, persistent=True)
 
 
 def _extract_first_json_array(text: str) -> str:
@@ -105,24 +97,21 @@ async def fetch_tfr_list_json(user_agent: str = DEFAULT_UA, timeout_s: float = 2
     Notes:
     - The endpoint sometimes responds with Content-Type text/html but includes JSON.
     - This function parses defensively using bracket balancing.
-    - Cached briefly to reduce load.
+    - Cached briefly to reduce load; concurrent misses share one fetch.
     """
-    if _cache_is_fresh(60) and isinstance(_CACHE.get("tfr_list"), list):
-        return _CACHE["tfr_list"]
-
     headers = {
         "User-Agent": user_agent,
         "Accept": "application/json,text/html;q=0.9,*/*;q=0.8",
     }
 
-    async with httpx.AsyncClient(timeout=timeout_s, headers=headers, follow_redirects=True) as client:
-        r = await client.get(FAA_TFR_JSON_URL)
-        r.raise_for_status()
-        data = _parse_faa_tfr_body_to_list(r.text)
+    async def _load() -> tuple[list[dict[str, Any]], float]:
+        async with httpx.AsyncClient(timeout=timeout_s, headers=headers, follow_redirects=True) as client:
+            r = await resilient_get(client, FAA_TFR_JSON_URL, upstream="faa_tfr", operation="export")
+            r.raise_for_status()
+            data = _parse_faa_tfr_body_to_list(r.text)
+        return data, time.time() + TFR_LIST_CACHE.default_ttl_s
 
-    _CACHE["tfr_list"] = data
-    _CACHE["tfr_list_fetched_at"] = _utc_now()
-    return data
+    return await TFR_LIST_CACHE.get_or_load("tfr_list", _load)
 
 
 async def determine_us_state_from_latlon(
@@ -136,7 +125,7 @@ async def determine_us_state_from_latlon(
     url = NWS_POINTS_URL.format(lat=latitude, lon=longitude)
 
     async with httpx.AsyncClient(timeout=timeout_s, headers=headers) as client:
-        r = await client.get(url)
+        r = await resilient_get(client, url, upstream="nws", operation="points_state")
         r.raise_for_status()
         points = r.json()
 
@@ -0,0 +1,66 @@
+"""
+Response encoding for the hot endpoints (/api/preflight, /tools/*).
+
+By default FastAPI re-validates a returned model against its response_model,
+walks the result through jsonable_encoder and only then calls json.dumps. The
+handlers already build JSON-ready dicts, so FastJSONResponse encodes them in one
+pass with orjson when it is installed (pip install orjson; optional).
+
+The bytes are the same as JSONResponse's: compact separators, UTF-8 and no ASCII
+escaping. There are two cases where orjson would differ:
+- json writes floats below 1e-4 or from 1e16 up with an exponent (1e-05, 1e+16).
+  orjson writes 0.00001 and 1e16 instead. Output containing such a number is
+  encoded again with json.
+- orjson rejects ints wider than 64 bits and non-str keys. Those values fall back to
+  json as well.
+Types that neither encoder knows (models, sets, ...) still go through
+jsonable_encoder. NaN and Infinity, which JSONResponse refuses with a 500, are
+written as null.
+
+FAST_JSON_ENABLED=0 restores FastAPI's default encoding.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+
+# A number token that json would have written with an exponent: orjson's own
+# exponent form, or a fixed-point float below 1e-4. A match inside a string value
+# only costs a re-encode.
+_EXPONENT = re.compile(rb"[:,\[]-?(?:\d+(?:\.\d+)?e[-\d]|0\.0000)")
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    # What JSONResponse.render does with FastAPI's encoded content.
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        try:
+            out = orjson.dumps(content, default=jsonable_encoder)
+        except (TypeError, ValueError):
+            return _stdlib_dumps(content)
+        if _EXPONENT.search(out) is None:
+            return out
+    return _stdlib_dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,238 @@
+"""
+Bulk METAR ingestion: periodically load one observation file for all stations
+(aviationweather.gov cache CSV format) into an in-memory table keyed by station.
+Real-time weather is answered from this table; the per-station NWS API is the fallback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import io
+import logging
+import os
+import time
+from typing import Any
+
+import httpx
+
+from .resilience import resilient_get
+from .station_catalog import Station, StationCatalog
+
+logger = logging.getLogger(__name__)
+
+NWS_BASE = os.getenv("NWS_BASE", "https://api.weather.gov")
+DEFAULT_UA = "drone-ops-compliance/0.1 (contact: replace-before-prod)"
+
+# Source: a URL (e.g. https://aviationweather.gov/data/cache/metars.cache.csv.gz)
+# or a local file drop. The file wins if both are set.
+METAR_BULK_URL = os.getenv("METAR_BULK_URL")
+METAR_BULK_PATH = os.getenv("METAR_BULK_PATH")
+METAR_BULK_REFRESH_S = float(os.getenv("METAR_BULK_REFRESH_S", "300"))
+
+# Do not answer from a table that has missed several refreshes.
+MAX_TABLE_AGE_S = 3 * METAR_BULK_REFRESH_S
+
+_SKY_COVER_TEXT = {
+    "SKC": "Clear",
+    "CLR": "Clear",
+    "CAVOK": "Clear",
+    "FEW": "A Few Clouds",
+    "SCT": "Partly Cloudy",
+    "BKN": "Mostly Cloudy",
+    "OVC": "Overcast",
+    "OVX": "Obscured",
+}
+
+_STATE: dict[str, Any] = {
+    "table": {},
+    "catalog": None,
+    "loaded_at": None,
+    "source": None,
+    "refresh_errors": 0,
+}
+
+
+def bulk_ingestion_enabled() -> bool:
+    return bool(METAR_BULK_PATH or METAR_BULK_URL)
+
+
+def _float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    v = value.strip().rstrip("+")  # visibility "10+"
+    if not v:
+        return None
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+
+def _parse_metar_row(cols: dict[str, Any]) -> dict[str, Any]:
+    """
+    Same output shape as nws_weather._parse_observation for one CSV row.
+    `cols` maps column name -> value, except sky_cover/cloud_base_ft_agl which are lists.
+    """
+    station_id = cols["station_id"].strip().upper()
+
+    wind_speed_kt = _float(cols.get("wind_speed_kt"))
+    wind_gust_kt = _float(cols.get("wind_gust_kt"))
+    wind_dir = _float(cols.get("wind_dir_degrees"))  # "VRB" -> None
+    visibility_sm = _float(cols.get("visibility_statute_mi"))
+    temp_c = _float(cols.get("temp_c"))
+    temp_f = None if temp_c is None else (temp_c * 9.0 / 5.0) + 32.0
+
+    # Like _parse_observation: lowest reported layer base.
+    bases_ft = [b for b in (_float(v) for v in cols.get("cloud_base_ft_agl", [])) if b is not None]
+    ceiling_ft = min(bases_ft) if bases_ft else None
+
+    covers = [c.strip().upper() for c in cols.get("sky_cover", []) if c and c.strip()]
+    conditions = (cols.get("wx_string") or "").strip() or (_SKY_COVER_TEXT.get(covers[-1], "") if covers else "")
+
+    timestamp = (cols.get("observation_time") or "").strip() or None
+    if timestamp and timestamp.endswith("Z"):
+        timestamp = timestamp[:-1] + "+00:00"
+
+    return {
+        "wind_speed_kt": None if wind_speed_kt is None else round(wind_speed_kt, 1),
+        "wind_gust_kt": None if wind_gust_kt is None else round(wind_gust_kt, 1),
+        "wind_direction_deg": None if wind_dir is None else int(wind_dir),
+        "visibility_sm": None if visibility_sm is None else round(visibility_sm, 2),
+        "cloud_ceiling_ft": None if ceiling_ft is None else round(ceiling_ft),
+        "temperature_f": None if temp_f is None else round(temp_f, 1),
+        "conditions": conditions,
+        "timestamp": timestamp,
+        "raw": {
+            "nws_station_id": station_id,
+            "observation_url": f"{NWS_BASE}/stations/{station_id}/observations/latest",
+            "source": "bulk_metar",
+        },
+    }
+
+
+def parse_metar_csv(text: str) -> tuple[dict[str, dict[str, Any]], StationCatalog]:
+    """
+    Parse an aviationweather.gov METAR cache CSV (metadata lines, then a header row
+    starting with raw_text). Keeps the newest row per station.
+
+    Returns: (table keyed by station id, catalog of the reporting stations)
+    """
+    reader = csv.reader(io.StringIO(text))
+    header: list[str] | None = None
+    table: dict[str, dict[str, Any]] = {}
+    stations: dict[str, Station] = {}
+
+    for row in reader:
+        if header is None:
+            if row and row[0] == "raw_text":
+                header = row
+            continue
+        if not row or len(row) < 2:
+            continue
+
+        cols: dict[str, Any] = {"sky_cover": [], "cloud_base_ft_agl": []}
+        for name, value in zip(header, row, strict=False):
+            if name in ("sky_cover", "cloud_base_ft_agl"):
+                cols[name].append(value)
+            else:
+                cols[name] = value
+        if not (cols.get("station_id") or "").strip():
+            continue
+
+        parsed = _parse_metar_row(cols)
+        station_id = parsed["raw"]["nws_station_id"]
+        current = table.get(station_id)
+        if current is not None and (current["timestamp"] or "") >= (parsed["timestamp"] or ""):
+            continue
+        table[station_id] = parsed
+
+        lat, lon = _float(cols.get("latitude")), _float(cols.get("longitude"))
+        if lat is not None and lon is not None:
+            stations[station_id] = Station(
+                station_id=station_id,
+                name=station_id,
+                lat=lat,
+                lon=lon,
+                reports_visibility=True if parsed["visibility_sm"] is not None else None,
+                reports_ceiling=True if parsed["cloud_ceiling_ft"] is not None else None,
+            )
+
+    if header is None:
+        raise RuntimeError("Bulk METAR file did not contain a raw_text header row.")
+    return table, StationCatalog(list(stations.values()))
+
+
+def _decode(body: bytes) -> str:
+    if body[:2] == b"\x1f\x8b":
+        body = gzip.decompress(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def _read_source(user_agent: str, timeout_s: float) -> tuple[bytes, str]:
+    if METAR_BULK_PATH:
+        with open(METAR_BULK_PATH, "rb") as fh:
+            return await asyncio.to_thread(fh.read), METAR_BULK_PATH
+
+    headers = {"User-Agent": user_agent}
+    async with httpx.AsyncClient(timeout=timeout_s, headers=headers, follow_redirects=True) as client:
+        # A large periodic download: retries and breaker, but no hedged duplicate.
+        r = await resilient_get(client, METAR_BULK_URL, upstream="metar_bulk", operation="download", hedge=False)
+        r.raise_for_status()
+        return r.content, str(METAR_BULK_URL)
+
+
+async def refresh_bulk_observations(user_agent: str = DEFAULT_UA, timeout_s: float = 60.0) -> int:
+    """
+    Load the configured bulk file and swap in the new table. Returns station count.
+    """
+    body, source = await _read_source(user_agent, timeout_s)
+    table, catalog = await asyncio.to_thread(parse_metar_csv, _decode(body))
+    _STATE.update(table=table, catalog=catalog, loaded_at=time.time(), source=source)
+    return len(table)
+
+
+def _table_is_fresh() -> bool:
+    loaded_at = _STATE["loaded_at"]
+    return loaded_at is not None and (time.time() - loaded_at) <= MAX_TABLE_AGE_S
+
+
+def get_bulk_observation(station_id: str) -> dict[str, Any] | None:
+    if not _table_is_fresh():
+        return None
+    return _STATE["table"].get(station_id.upper())
+
+
+def bulk_station_catalog() -> StationCatalog | None:
+    """
+    Catalog of stations present in the current bulk file (None if stale/not loaded).
+    """
+    if not _table_is_fresh():
+        return None
+    return _STATE["catalog"]
+
+
+def bulk_stats() -> dict[str, Any]:
+    loaded_at = _STATE["loaded_at"]
+    return {
+        "enabled": bulk_ingestion_enabled(),
+        "stations": len(_STATE["table"]),
+        "age_s": None if loaded_at is None else round(time.time() - loaded_at, 1),
+        "fresh": _table_is_fresh(),
+        "refresh_errors": _STATE["refresh_errors"],
+    }
+
+
+async def run_bulk_ingestion() -> None:
+    """
+    Background loop: refresh every METAR_BULK_REFRESH_S. Failures keep the previous table.
+    """
+    while True:
+        try:
+            count = await refresh_bulk_observations()
+            logger.info(f"Bulk METAR table refreshed: {count} stations")
+        except Exception as e:
+            _STATE["refresh_errors"] += 1
+            logger.error(f"Bulk METAR refresh failed: {e}")
+        await asyncio.sleep(METAR_BULK_REFRESH_S)
@@ -0,0 +1,287 @@
+"""
+Minimal in-process metrics with Prometheus text exposition (format 0.0.4).
+
+Counters, gauges and histograms with labels, plus scrape hooks for values that
+are kept elsewhere (cache stats). Everything lives in one process-wide REGISTRY,
+rendered by GET /metrics.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+from .timing import add_span
+
+DEFAULT_LATENCY_BUCKETS_S = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_INF_LE = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def set_total(self, value: float) -> None:
+        """
+        Mirror a monotonic total kept elsewhere (used from scrape hooks).
+        """
+        self.value = value
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Any] = {}
+        REGISTRY.register(self)
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            values = tuple(kwargs[n] for n in self.labelnames)
+        key = tuple(str(v) for v in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def clear(self) -> None:
+        self._children.clear()
+
+    def _samples(self) -> Iterator[str]:
+        for key, child in sorted(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_S,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _samples(self) -> Iterator[str]:
+        for key, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(child.buckets, child.counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f'{self.name}_bucket{_format_labels(self.labelnames, key, _INF_LE)} {child.count}'
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(child.sum)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {child.count}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._hooks: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered.")
+        self._metrics[metric.name] = metric
+
+    def add_scrape_hook(self, hook: Callable[[], None]) -> None:
+        """
+        `hook` runs before each render, to copy externally kept values into metrics.
+        """
+        self._hooks.append(hook)
+
+    def render(self) -> str:
+        for hook in self._hooks:
+            try:
+                hook()
+            except Exception:
+                pass  # a broken hook must not take the scrape down
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to upstream services.",
+    ("upstream", "operation"),
+)
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests_total",
+    "Upstream calls by outcome: HTTP status code, 'ok' for non-HTTP calls, or 'error' when the call raised.",
+    ("upstream", "operation", "status"),
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total",
+    "Upstream calls that raised, by exception type.",
+    ("upstream", "operation", "error"),
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "upstream_requests_in_flight",
+    "Upstream calls currently in progress.",
+    ("upstream", "operation"),
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache and result (hit, l2_hit for the shared tier, miss).",
+    ("cache", "result"),
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entries currently held by each cache.",
+    ("cache",),
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Server-side latency of API requests.",
+    ("endpoint",),
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "API requests by endpoint and response status.",
+    ("endpoint", "status"),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "API requests currently being handled.",
+    ("endpoint",),
+)
+
+
+class _UpstreamCall:
+    __slots__ = ("status",)
+
+    def __init__(self) -> None:
+        self.status: int | None = None
+
+
+@contextmanager
+def upstream_call(upstream: str, operation: str) -> Iterator[_UpstreamCall]:
+    """
+    Time one upstream call (also recorded as a request span). For HTTP calls, set
+    `.status` to the status code once a response arrives:
+
+        with upstream_call("nws", "points") as call:
+            r = await client.get(url)
+            call.status = r.status_code
+    """
+    call = _UpstreamCall()
+    in_flight = UPSTREAM_IN_FLIGHT.labels(upstream, operation)
+    in_flight.inc()
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield call
+    except BaseException as e:
+        if call.status is None:
+            outcome = "error"
+            UPSTREAM_ERRORS.labels(upstream, operation, type(e).__name__).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        in_flight.dec()
+        UPSTREAM_LATENCY.labels(upstream, operation).observe(elapsed)
+        add_span(f"{upstream}.{operation}", elapsed * 1000.0)
+        UPSTREAM_REQUESTS.labels(upstream, operation, outcome if call.status is None else call.status).inc()
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
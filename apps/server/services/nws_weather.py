@@ -1,16 +1,59 @@
 from __future__ import annotations
 
+import asyncio
+import math
+import os
+import time
+from array import array
+from bisect import bisect_left
 from typing import Any
 from datetime import datetime, timezone
 import re
 
 import httpx
 
-NWS_BASE = "https://api.weather.gov"
+from .cache import TTLCache
+from .metar_bulk import bulk_ingestion_enabled, bulk_station_catalog, bulk_stats, get_bulk_observation
+from .resilience import UpstreamUnavailable, resilient_get
+from .station_catalog import get_station_catalog
+
+NWS_BASE = os.getenv("NWS_BASE", "https://api.weather.gov")
 
 # NWS requires a descriptive User-Agent
 DEFAULT_UA = "drone-ops-compliance/0.1 (contact: replace-before-prod)"
 
+# Station selection: how many nearby stations to consider, how many observation
+# requests may be in flight at once, and the score that ends the search early.
+MAX_STATION_CANDIDATES = 8
+STATION_FETCH_CONCURRENCY = 4
+GOOD_STATION_SCORE = 8
+
+# Parsed latest observations per station. Entries expire when the station's next
+# observation is due: last observation time + learned cadence + publish grace.
+OBSERVATION_CACHE = TTLCache("nws_observation", maxsize=4096, shared=True)
+DEFAULT_OBSERVATION_CADENCE_S = 3600.0  # routine hourly METAR
+MIN_OBSERVATION_CADENCE_S = 300.0  # 5-minute ASOS/AWOS reporting
+OBSERVATION_PUBLISH_GRACE_S = 120.0
+MIN_OBSERVATION_TTL_S = 60.0
+
+# Rolling per-station completeness (EWMA of _score_conditions), learned from every
+# observation we fetch and parse (not from cache or bulk-table hits), so the station
+# most likely to be complete is tried first.
+STATION_QUALITY_ALPHA = 0.3
+MAX_TRACKED_STATIONS = 8192
+_STATION_QUALITY: dict[str, dict[str, Any]] = {}
+
+# /points metadata (grid office/x/y, forecast and stations URLs) rarely changes.
+POINTS_CACHE = TTLCache("nws_points", maxsize=8192, default_ttl_s=24 * 3600, shared=True, persistent=True)
+
+# Parsed forecasts keyed by NWS gridpoint (office, gridX, gridY); every location in
+# the same ~2.5 km cell shares one entry. Refreshed one issuance interval after the
+# forecast's updateTime (or generatedAt), within the bounds below.
+FORECAST_CACHE = TTLCache("nws_forecast", maxsize=4096, shared=True, persistent=True)
+FORECAST_UPDATE_INTERVAL_S = 3600.0
+MIN_FORECAST_TTL_S = 300.0
+MAX_FORECAST_TTL_S = 3600.0
+
 
 def _mps_to_knots(mps: float | None) -> float | None:
     return None if mps is None else mps * 1.9438444924406
@@ -28,6 +71,18 @@ def _meters_to_feet(m: float | None) -> float | None:
     return None if m is None else m * 3.280839895
 
 
+def _iso_epoch(value: Any) -> float | None:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
 def _parse_observation(obs: dict[str, Any], station_id: str) -> dict[str, Any]:
     p = obs.get("properties", {})
 
@@ -64,6 +119,15 @@ def _parse_observation(obs: dict[str, Any], station_id: str) -> dict[str, Any]:
     return parsed
 
 
+# Forecast text patterns, compiled once.
+# windSpeed field, e.g. "10 to 15 mph"
+_WIND_SPEED_RE = re.compile(r"(\d+)(?:\s+to\s+(\d+))?\s+mph")
+# detailedForecast text, e.g. "wind around 5 mph" or "wind 10 to 15 mph"
+_DETAILED_WIND_RE = re.compile(r"wind\s+(?:around\s+)?(\d+)(?:\s+to\s+(\d+))?\s+mph")
+
+MPH_TO_KNOTS = 0.868976
+
+
 def _extract_wind_from_forecast(detailed_forecast: str) -> float | None:
     """
     Extract wind speed from detailed forecast text.
@@ -72,41 +136,47 @@ def _extract_wind_from_forecast(detailed_forecast: str) -> float | None:
     """
     if not detailed_forecast:
         return None
-    
-    # Pattern: "wind around X mph" or "wind X to Y mph"
-    pattern = r'wind\s+(?:around\s+)?(\d+)(?:\s+to\s+(\d+))?\s+mph'
-    match = re.search(pattern, detailed_forecast.lower())
-    
+
+    match = _DETAILED_WIND_RE.search(detailed_forecast.lower())
+
     if match:
         # If range (X to Y), take the higher value
         if match.group(2):
             return float(match.group(2))
         return float(match.group(1))
-    
+
     return None
 
 
-def _parse_forecast_period(period: dict[str, Any], target_datetime: datetime) -> dict[str, Any]:
-    """
-    Parse a forecast period from NOAA API into our standard format.
-    """
+def _period_wind_kt(period: dict[str, Any]) -> float | None:
     wind_speed_kt = None
     wind_text = period.get("windSpeed", "")
-    detailed = period.get("detailedForecast", "")
-    
+
     # Try to extract wind from windSpeed field (e.g., "10 to 15 mph")
     if wind_text:
-        match = re.search(r'(\d+)(?:\s+to\s+(\d+))?\s+mph', wind_text)
+        match = _WIND_SPEED_RE.search(wind_text)
         if match:
             mph = float(match.group(2) if match.group(2) else match.group(1))
-            wind_speed_kt = mph * 0.868976  # mph to knots
-    
+            wind_speed_kt = mph * MPH_TO_KNOTS
+
     # If not found, try detailed forecast
     if wind_speed_kt is None:
-        mph = _extract_wind_from_forecast(detailed)
+        mph = _extract_wind_from_forecast(period.get("detailedForecast", ""))
         if mph:
-            wind_speed_kt = mph * 0.868976
-    
+            wind_speed_kt = mph * MPH_TO_KNOTS
+
+    return wind_speed_kt
+
+
+def _forecast_result(
+    wind_speed_kt: float | None,
+    temperature_f: Any,
+    short_forecast: str,
+    detailed: str,
+    precipitation_probability: Any,
+    period_name: str | None,
+    target_datetime: datetime,
+) -> dict[str, Any]:
     return {
         "mode": "FORECAST",
         "wind_speed_kt": round(wind_speed_kt, 1) if wind_speed_kt else None,
@@ -114,35 +184,138 @@ def _parse_forecast_period(period: dict[str, Any], target_datetime: datetime) ->
         "wind_direction_deg": None,
         "visibility_sm": None,  # Not in forecast
         "cloud_ceiling_ft": None,  # Not in forecast
-        "temperature_f": period.get("temperature"),
-        "conditions": period.get("shortForecast", ""),
+        "temperature_f": temperature_f,
+        "conditions": short_forecast,
         "detailed_forecast": detailed,
-        "precipitation_probability": period.get("probabilityOfPrecipitation", {}).get("value"),
+        "precipitation_probability": precipitation_probability,
         "timestamp": target_datetime.isoformat(),
         "forecast_generated": datetime.now(timezone.utc).isoformat(),
-        "period_name": period.get("name"),
+        "period_name": period_name,
         "raw": {
-            "nws_forecast_period": period.get("name"),
+            "nws_forecast_period": period_name,
         },
     }
 
 
+def _parse_forecast_period(period: dict[str, Any], target_datetime: datetime) -> dict[str, Any]:
+    """
+    Parse a forecast period from NOAA API into our standard format.
+    """
+    return _forecast_result(
+        _period_wind_kt(period),
+        period.get("temperature"),
+        period.get("shortForecast", ""),
+        period.get("detailedForecast", ""),
+        (period.get("probabilityOfPrecipitation") or {}).get("value"),
+        period.get("name"),
+        target_datetime,
+    )
+
+
+class ForecastTimeline:
+    """
+    A forecast parsed once into columns, for cheap lookups at many target times.
+
+    Periods are sorted by start time with start/end held as epoch seconds; wind,
+    temperature, precipitation and text fields are pre-extracted. Lookups bisect
+    the end times, so evaluating N flight times costs O(N log P) with no re-parsing.
+    Periods whose start/end cannot be parsed are skipped.
+    """
+
+    __slots__ = (
+        "periods",
+        "starts",
+        "ends",
+        "wind_kt",
+        "temperature_f",
+        "precip_pct",
+        "names",
+        "short_forecasts",
+        "detailed_forecasts",
+        "update_time",
+        "generated_at",
+    )
+
+    def __init__(
+        self,
+        periods: list[dict[str, Any]],
+        update_time: str | None = None,
+        generated_at: str | None = None,
+    ) -> None:
+        timed: list[tuple[float, float, dict[str, Any]]] = []
+        for period in periods:
+            start, end = _iso_epoch(period.get("startTime")), _iso_epoch(period.get("endTime"))
+            if start is not None and end is not None:
+                timed.append((start, end, period))
+        timed.sort(key=lambda t: t[0])
+
+        self.periods = [p for _, _, p in timed]
+        self.starts = array("d", [t[0] for t in timed])
+        self.ends = array("d", [t[1] for t in timed])
+        self.wind_kt = [_period_wind_kt(p) for p in self.periods]
+        self.temperature_f = [p.get("temperature") for p in self.periods]
+        self.precip_pct = [(p.get("probabilityOfPrecipitation") or {}).get("value") for p in self.periods]
+        self.names = [p.get("name") for p in self.periods]
+        self.short_forecasts = [p.get("shortForecast", "") for p in self.periods]
+        self.detailed_forecasts = [p.get("detailedForecast", "") for p in self.periods]
+        self.update_time = update_time
+        self.generated_at = generated_at
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
+    def index_at(self, target_datetime: datetime) -> int | None:
+        """
+        Index of the period containing target_datetime (the earlier one on a shared
+        boundary), else the closest future period, else None.
+        """
+        i = bisect_left(self.ends, target_datetime.timestamp())
+        return i if i < len(self.ends) else None
+
+    def period_at(self, target_datetime: datetime) -> dict[str, Any] | None:
+        i = self.index_at(target_datetime)
+        return None if i is None else self.periods[i]
+
+    def forecast_at(self, target_datetime: datetime) -> dict[str, Any] | None:
+        """
+        Same shape as _parse_forecast_period() for the period at target_datetime.
+        """
+        i = self.index_at(target_datetime)
+        if i is None:
+            return None
+        return _forecast_result(
+            self.wind_kt[i],
+            self.temperature_f[i],
+            self.short_forecasts[i],
+            self.detailed_forecasts[i],
+            self.precip_pct[i],
+            self.names[i],
+            target_datetime,
+        )
+
+
 def _find_matching_period(periods: list[dict], target_datetime: datetime) -> dict[str, Any] | None:
     """
-    Find the forecast period that best matches the target datetime.
+    The period containing target_datetime (the earlier one on a shared boundary),
+    else the closest future period, else None. This is also the case when the
+    target is past the last period; the original scan returned periods[0] there.
+
+    Same answer as ForecastTimeline.period_at(), for a one-off lookup: only the
+    start/end times are parsed. Callers evaluating several times should build a
+    ForecastTimeline instead.
     """
+    target = target_datetime.timestamp()
+    best: dict[str, Any] | None = None
+    best_bounds = (math.inf, math.inf)
     for period in periods:
-        start_time = datetime.fromisoformat(period.get("startTime", "").replace("Z", "+00:00"))
-        end_time = datetime.fromisoformat(period.get("endTime", "").replace("Z", "+00:00"))
-        
-        if start_time <= target_datetime <= end_time:
-            return period
-    
-    # If no exact match, return the closest future period
-    if periods:
-        return periods[0]
-    
-    return None
+        start, end = _iso_epoch(period.get("startTime")), _iso_epoch(period.get("endTime"))
+        if start is None or end is None or end < target:
+            continue
+        if start <= target:
+            return period  # NWS lists periods in order, so this is the first that contains it
+        if (end, start) < best_bounds:
+            best, best_bounds = period, (end, start)
+    return best
 
 
 def _score_conditions(parsed: dict[str, Any]) -> int:
@@ -169,6 +342,284 @@ def _score_conditions(parsed: dict[str, Any]) -> int:
     return score
 
 
+def _nws_headers(user_agent: str = DEFAULT_UA) -> dict[str, str]:
+    return {"User-Agent": user_agent, "Accept": "application/geo+json"}
+
+
+async def _get_points(
+    latitude: float, longitude: float, user_agent: str = DEFAULT_UA, timeout_s: float = 10.0
+) -> tuple[dict[str, Any], str]:
+    """
+    Returns: (points_json, points_url), served from POINTS_CACHE when possible.
+
+    The load owns its client: it is shared by every caller of the same URL and may
+    outlive the one that started it (see TTLCache.get_or_load).
+    """
+    points_url = f"{NWS_BASE}/points/{latitude:.4f},{longitude:.4f}"
+
+    async def _load() -> tuple[dict[str, Any], float]:
+        async with httpx.AsyncClient(timeout=timeout_s, headers=_nws_headers(user_agent)) as client:
+            r_points = await resilient_get(client, points_url, upstream="nws", operation="points")
+            r_points.raise_for_status()
+            points = r_points.json()
+        return points, time.time() + POINTS_CACHE.default_ttl_s
+
+    points = await POINTS_CACHE.get_or_load(points_url, _load)
+    return points, points_url
+
+
+def _gridpoint_key(points: dict[str, Any]) -> tuple[str, int, int] | str:
+    props = points.get("properties") or {}
+    grid_id, grid_x, grid_y = props.get("gridId"), props.get("gridX"), props.get("gridY")
+    if grid_id is not None and grid_x is not None and grid_y is not None:
+        return (str(grid_id), int(grid_x), int(grid_y))
+    # Fall back to the forecast URL, which encodes the same gridpoint.
+    return props["forecast"]
+
+
+def _forecast_expires_at(props: dict[str, Any], now: float) -> float:
+    issued = _iso_epoch(props.get("updateTime")) or _iso_epoch(props.get("generatedAt"))
+    expires_at = now + MIN_FORECAST_TTL_S if issued is None else issued + FORECAST_UPDATE_INTERVAL_S
+    return min(max(expires_at, now + MIN_FORECAST_TTL_S), now + MAX_FORECAST_TTL_S)
+
+
+async def _get_gridpoint_forecast(
+    points: dict[str, Any], user_agent: str = DEFAULT_UA, timeout_s: float = 10.0
+) -> tuple[ForecastTimeline, str]:
+    """
+    Returns: (timeline, forecast_url) for the gridpoint of `points`.
+
+    The timeline is shared read-only by every caller in the same gridpoint until it
+    expires. Like _get_points, the load opens its own client.
+    """
+    forecast_url = points["properties"]["forecast"]
+
+    async def _load() -> tuple[dict[str, Any], float]:
+        async with httpx.AsyncClient(timeout=timeout_s, headers=_nws_headers(user_agent)) as client:
+            r_forecast = await resilient_get(client, forecast_url, upstream="nws", operation="forecast")
+            r_forecast.raise_for_status()
+            props = r_forecast.json().get("properties", {})
+        timeline = ForecastTimeline(
+            props.get("periods", []),
+            update_time=props.get("updateTime"),
+            generated_at=props.get("generatedAt"),
+        )
+        return timeline, _forecast_expires_at(props, time.time())
+
+    entry = await FORECAST_CACHE.get_or_load(_gridpoint_key(points), _load)
+    return entry, forecast_url
+
+
+def _observation_epoch(parsed: dict[str, Any]) -> float | None:
+    return _iso_epoch(parsed.get("timestamp"))
+
+
+async def _cache_observation(station_id: str, parsed: dict[str, Any]) -> None:
+    """
+    Cache a parsed observation until the station's next report is due.
+
+    The cadence is learned from the gap between consecutive observation timestamps
+    (clamped to 5-60 minutes); stations seen once assume the hourly routine cadence.
+    """
+    obs_epoch = _observation_epoch(parsed)
+    cadence = DEFAULT_OBSERVATION_CADENCE_S
+
+    previous = OBSERVATION_CACHE.peek(station_id)
+    if previous is not None:
+        _, prev_epoch, prev_cadence = previous[0]
+        cadence = prev_cadence
+        if obs_epoch is not None and prev_epoch is not None and obs_epoch > prev_epoch:
+            cadence = min(max(obs_epoch - prev_epoch, MIN_OBSERVATION_CADENCE_S), DEFAULT_OBSERVATION_CADENCE_S)
+
+    now = time.time()
+    expires_at = now + MIN_OBSERVATION_TTL_S
+    if obs_epoch is not None:
+        expires_at = max(expires_at, obs_epoch + cadence + OBSERVATION_PUBLISH_GRACE_S)
+    # Never trust a (possibly future-dated) timestamp for longer than one cadence.
+    expires_at = min(expires_at, now + cadence + OBSERVATION_PUBLISH_GRACE_S)
+    await OBSERVATION_CACHE.set_shared(station_id, (parsed, obs_epoch, cadence), expires_at=expires_at)
+
+
+async def _fetch_station_observation(client: httpx.AsyncClient, station_id: str) -> tuple[dict[str, Any], bool]:
+    """
+    Returns: (parsed, fetched). fetched is False when the bulk METAR table or the
+    observation cache answered, i.e. the observation was already seen.
+    """
+    # Bulk METAR table (if ingestion is enabled) answers without any request.
+    bulk = get_bulk_observation(station_id)
+    if bulk is not None:
+        return bulk, False
+
+    cached = await OBSERVATION_CACHE.get_shared(station_id)
+    if cached is not None:
+        return cached[0], False
+
+    latest_url = f"{NWS_BASE}/stations/{station_id}/observations/latest"
+    r_obs = await resilient_get(client, latest_url, upstream="nws", operation="observation")
+    r_obs.raise_for_status()
+    parsed = _parse_observation(r_obs.json(), station_id)
+    await _cache_observation(station_id, parsed)
+    return parsed, True
+
+
+def _record_station_quality(station_id: str, score: int | None) -> None:
+    """
+    Fold one observation outcome into the station's rolling completeness stats.
+    A failed fetch (score None) counts as zero completeness.
+    """
+    stats = _STATION_QUALITY.pop(station_id, None)
+    value = 0.0 if score is None else float(score)
+    if stats is None:
+        stats = {"ewma": value, "samples": 0, "failures": 0}
+    else:
+        stats["ewma"] += STATION_QUALITY_ALPHA * (value - stats["ewma"])
+    stats["samples"] += 1
+    if score is None:
+        stats["failures"] += 1
+    _STATION_QUALITY[station_id] = stats  # re-insert as most recently seen
+    while len(_STATION_QUALITY) > MAX_TRACKED_STATIONS:
+        _STATION_QUALITY.pop(next(iter(_STATION_QUALITY)))
+
+
+def _is_known_complete(station_id: str) -> bool:
+    stats = _STATION_QUALITY.get(station_id)
+    return stats is not None and stats["ewma"] >= GOOD_STATION_SCORE
+
+
+def _order_by_quality(station_ids: list[str]) -> list[str]:
+    """
+    Reorder distance-ranked candidates using learned completeness:
+    known-complete stations first (nearest first), then stations never seen
+    (nearest first), then known-incomplete stations by completeness.
+    """
+
+    def key(item: tuple[int, str]) -> tuple[int, float, int]:
+        rank, station_id = item
+        stats = _STATION_QUALITY.get(station_id)
+        if stats is None:
+            return (1, 0.0, rank)
+        if stats["ewma"] >= GOOD_STATION_SCORE:
+            return (0, 0.0, rank)
+        return (2, -stats["ewma"], rank)
+
+    return [station_id for _, station_id in sorted(enumerate(station_ids), key=key)]
+
+
+def station_quality_rankings(limit: int | None = None) -> list[dict[str, Any]]:
+    """
+    Learned per-station completeness, most complete first.
+    """
+    ranked = sorted(_STATION_QUALITY.items(), key=lambda kv: -kv[1]["ewma"])
+    return [
+        {
+            "station_id": station_id,
+            "completeness": round(stats["ewma"], 2),
+            "samples": stats["samples"],
+            "failures": stats["failures"],
+        }
+        for station_id, stats in ranked[:limit]
+    ]
+
+
+async def _select_best_station(
+    client: httpx.AsyncClient,
+    station_ids: list[str],
+    concurrency: int = STATION_FETCH_CONCURRENCY,
+    first_wave: int | None = None,
+) -> tuple[dict[str, Any] | None, str | None, int, list[str], list[str]]:
+    """
+    Fetch candidate stations concurrently in waves of `concurrency` requests
+    (the first wave may be smaller, e.g. 1 when the top candidate is known-good).
+
+    Results are folded strictly in candidate order, so the selected station is the
+    same one a sequential scan would pick: the first station reaching
+    GOOD_STATION_SCORE, otherwise the earliest station with the highest score.
+    Once the outcome is decided, requests still in flight are cancelled.
+
+    Returns: (best_parsed, best_station_id, best_score, attempted, errors)
+    Raises UpstreamUnavailable if nothing was usable and NWS was short-circuited.
+    """
+    best_parsed: dict[str, Any] | None = None
+    best_station_id: str | None = None
+    best_score = -1
+    attempted: list[str] = []
+    errors: list[str] = []
+    unavailable: UpstreamUnavailable | None = None
+
+    outcomes: dict[int, asyncio.Task] = {}
+    next_idx = 0
+    decided = False
+
+    concurrency = max(1, concurrency)
+    wave_bounds: list[tuple[int, int]] = []
+    wave_start = 0
+    wave_size = max(1, first_wave or concurrency)
+    while wave_start < len(station_ids):
+        wave_bounds.append((wave_start, wave_start + wave_size))
+        wave_start += wave_size
+        wave_size = concurrency
+
+    for wave_start, wave_end in wave_bounds:
+        wave = station_ids[wave_start:wave_end]
+        tasks = {
+            asyncio.create_task(_fetch_station_observation(client, station_id)): wave_start + offset
+            for offset, station_id in enumerate(wave)
+        }
+        pending = set(tasks)
+        try:
+            while pending and not decided:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    outcomes[tasks[task]] = task
+
+                # Fold the completed prefix in order, exactly like the sequential loop.
+                while next_idx in outcomes:
+                    task = outcomes.pop(next_idx)
+                    station_id = station_ids[next_idx]
+                    next_idx += 1
+                    attempted.append(station_id)
+
+                    exc = task.exception()
+                    if exc is not None:
+                        errors.append(f"{station_id}: {exc}")
+                        if isinstance(exc, UpstreamUnavailable):
+                            unavailable = exc  # not the station's fault; leave its quality alone
+                        else:
+                            _record_station_quality(station_id, None)
+                        continue
+
+                    parsed, fetched = task.result()
+                    score = _score_conditions(parsed)
+                    if fetched:  # count each observation once, not on every cache hit
+                        _record_station_quality(station_id, score)
+                    if score > best_score:
+                        best_score = score
+                        best_parsed = parsed
+                        best_station_id = station_id
+
+                    # Early exit: if we have good coverage, don't waste calls
+                    if best_score >= GOOD_STATION_SCORE:
+                        decided = True
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if decided:
+            break
+
+    # Results that finished after the decision are discarded; retrieve their
+    # exceptions so asyncio does not warn about them.
+    for task in outcomes.values():
+        task.exception()
+
+    if best_parsed is None and unavailable is not None:
+        raise unavailable
+    return best_parsed, best_station_id, best_score, attempted, errors
+
+
 async def fetch_latest_observation_by_latlon(
     latitude: float,
     longitude: float,
@@ -180,56 +631,45 @@ async def fetch_latest_observation_by_latlon(
 
     Returns: (parsed_conditions, debug_meta)
     """
-    headers = {"User-Agent": user_agent, "Accept": "application/geo+json"}
-
-    async with httpx.AsyncClient(timeout=timeout_s, headers=headers) as client:
-        # Step 1: Convert lat/lon to an NWS grid point
-        points_url = f"{NWS_BASE}/points/{latitude:.4f},{longitude:.4f}"
-        r_points = await client.get(points_url)
-        r_points.raise_for_status()
-        points = r_points.json()
-
-        stations_url = points["properties"]["observationStations"]
-
-        # Step 2: Get nearby observation stations
-        r_stations = await client.get(stations_url)
-        r_stations.raise_for_status()
-        stations = r_stations.json()
-
-        features = stations.get("features", [])
-        if not features:
-            raise RuntimeError("No observation stations returned by NWS for this location.")
-
-        # Try the first N stations and choose the one with the best/most complete observation.
-        max_candidates = min(8, len(features))
-        best_parsed: dict[str, Any] | None = None
-        best_station_id: str | None = None
-        best_score = -1
-        attempted: list[str] = []
-        errors: list[str] = []
-
-        for i in range(max_candidates):
-            station_id = features[i]["properties"]["stationIdentifier"]
-            attempted.append(station_id)
-            latest_url = f"{NWS_BASE}/stations/{station_id}/observations/latest"
-            try:
-                r_obs = await client.get(latest_url)
-                r_obs.raise_for_status()
-                obs = r_obs.json()
-                parsed = _parse_observation(obs, station_id)
-                score = _score_conditions(parsed)
-
-                if score > best_score:
-                    best_score = score
-                    best_parsed = parsed
-                    best_station_id = station_id
-
-                # Early exit: if we have good coverage, don't waste calls
-                if best_score >= 8:
+    async with httpx.AsyncClient(timeout=timeout_s, headers=_nws_headers(user_agent)) as client:
+        points_url: str | None = None
+        stations_url: str | None = None
+        station_ids: list[str] = []
+
+        # Preferred: rank nearby stations from the local catalog (no NWS hops),
+        # else from the stations present in the bulk METAR file.
+        station_source = "nws_points"
+        for source, catalog in (("catalog", get_station_catalog()), ("bulk_metar", bulk_station_catalog())):
+            if catalog is not None:
+                station_ids = catalog.rank_candidates(latitude, longitude, k=MAX_STATION_CANDIDATES)
+                if station_ids:
+                    station_source = source
                     break
 
-            except Exception as e:
-                errors.append(f"{station_id}: {e}")
+        if not station_ids:
+            # Step 1: Convert lat/lon to an NWS grid point
+            points, points_url = await _get_points(latitude, longitude, user_agent, timeout_s)
+
+            stations_url = points["properties"]["observationStations"]
+
+            # Step 2: Get nearby observation stations
+            r_stations = await resilient_get(client, stations_url, upstream="nws", operation="stations")
+            r_stations.raise_for_status()
+            stations = r_stations.json()
+
+            features = stations.get("features", [])
+            if not features:
+                raise RuntimeError("No observation stations returned by NWS for this location.")
+
+            # Try the first N stations and choose the one with the best/most complete observation.
+            station_ids = [f["properties"]["stationIdentifier"] for f in features[:MAX_STATION_CANDIDATES]]
+
+        # Known-complete stations go first; if the top one is known-complete, try it alone.
+        station_ids = _order_by_quality(station_ids)
+        first_wave = 1 if _is_known_complete(station_ids[0]) else STATION_FETCH_CONCURRENCY
+        best_parsed, best_station_id, best_score, attempted, errors = await _select_best_station(
+            client, station_ids, first_wave=first_wave
+        )
 
         if best_parsed is None or best_station_id is None:
             raise RuntimeError("Unable to retrieve a usable observation from nearby NWS stations.")
@@ -237,14 +677,54 @@ async def fetch_latest_observation_by_latlon(
         debug = {
             "points_url": points_url,
             "stations_url": stations_url,
+            "station_source": station_source,
             "stations_attempted": attempted,
             "stations_errors": errors,
             "selected_station_id": best_station_id,
             "selected_score": best_score,
+            "station_quality": {
+                sid: round(_STATION_QUALITY[sid]["ewma"], 2) for sid in station_ids if sid in _STATION_QUALITY
+            },
+            "observation_cache": OBSERVATION_CACHE.stats(),
         }
+        if bulk_ingestion_enabled():
+            debug["bulk_metar"] = bulk_stats()
         return best_parsed, debug
 
 
+async def fetch_gridpoint_forecast_by_latlon(
+    latitude: float,
+    longitude: float,
+    user_agent: str = DEFAULT_UA,
+    timeout_s: float = 10.0,
+) -> tuple[ForecastTimeline, dict[str, Any]]:
+    """
+    Fetch the (shared, cached) gridpoint forecast covering a location.
+
+    Multi-time callers should fetch once here and evaluate each target time with
+    ForecastTimeline.forecast_at() rather than calling fetch_forecast_by_latlon per time.
+
+    Returns: (timeline, debug_meta)
+    """
+    # Step 1: Convert lat/lon to an NWS grid point
+    points, points_url = await _get_points(latitude, longitude, user_agent, timeout_s)
+
+    # Step 2: Get forecast (shared per gridpoint)
+    forecast, forecast_url = await _get_gridpoint_forecast(points, user_agent, timeout_s)
+
+    if len(forecast) == 0:
+        raise RuntimeError("No forecast periods returned by NWS for this location.")
+
+    debug = {
+        "points_url": points_url,
+        "forecast_url": forecast_url,
+        "total_periods": len(forecast),
+        "forecast_update_time": forecast.update_time,
+        "forecast_cache": FORECAST_CACHE.stats(),
+    }
+    return forecast, debug
+
+
 async def fetch_forecast_by_latlon(
     latitude: float,
     longitude: float,
@@ -257,41 +737,18 @@ async def fetch_forecast_by_latlon(
 
     Returns: (parsed_forecast, debug_meta)
     """
-    headers = {"User-Agent": user_agent, "Accept": "application/geo+json"}
-
-    async with httpx.AsyncClient(timeout=timeout_s, headers=headers) as client:
-        # Step 1: Convert lat/lon to an NWS grid point
-        points_url = f"{NWS_BASE}/points/{latitude:.4f},{longitude:.4f}"
-        r_points = await client.get(points_url)
-        r_points.raise_for_status()
-        points = r_points.json()
-
-        forecast_url = points["properties"]["forecast"]
+    forecast, debug = await fetch_gridpoint_forecast_by_latlon(
+        latitude, longitude, user_agent=user_agent, timeout_s=timeout_s
+    )
 
-        # Step 2: Get forecast
-        r_forecast = await client.get(forecast_url)
-        r_forecast.raise_for_status()
-        forecast = r_forecast.json()
+    # Find matching period
+    parsed = forecast.forecast_at(target_datetime)
+    if parsed is None:
+        raise RuntimeError("Could not find matching forecast period for target datetime.")
 
-        periods = forecast.get("properties", {}).get("periods", [])
-        if not periods:
-            raise RuntimeError("No forecast periods returned by NWS for this location.")
+    debug["selected_period"] = parsed["period_name"]
 
-        # Find matching period
-        matching_period = _find_matching_period(periods, target_datetime)
-        if not matching_period:
-            raise RuntimeError("Could not find matching forecast period for target datetime.")
-
-        parsed = _parse_forecast_period(matching_period, target_datetime)
-
-        debug = {
-            "points_url": points_url,
-            "forecast_url": forecast_url,
-            "total_periods": len(periods),
-            "selected_period": matching_period.get("name"),
-        }
-        
-        return parsed, debug
+    return parsed, debug
 
 
 def part107_compliance_assessment(
@@ -330,4 +787,52 @@ def part107_compliance_assessment(
         "cloud_clearance_ok": cloud_ok,
         "overall_status": overall,
         "notes": notes,
-    }
\ No newline at end of file
+    }
+
+# Per-hour limits for launch windows. Part 107 sets no wind or precipitation limit;
+# these are conservative small-UAS defaults. MAX: the hour is not flyable.
+# MARGINAL: flyable with conditions.
+LAUNCH_WIND_MARGINAL_KT = float(os.getenv("LAUNCH_WIND_MARGINAL_KT", "10"))
+LAUNCH_WIND_MAX_KT = float(os.getenv("LAUNCH_WIND_MAX_KT", "15"))
+LAUNCH_PRECIP_MARGINAL_PCT = float(os.getenv("LAUNCH_PRECIP_MARGINAL_PCT", "30"))
+LAUNCH_PRECIP_MAX_PCT = float(os.getenv("LAUNCH_PRECIP_MAX_PCT", "50"))
+
+
+def forecast_hour_assessment(conditions: dict[str, Any]) -> dict[str, Any]:
+    """
+    Grade one forecast hour against the launch limits: POOR if any known value is
+    past its MAX limit (or visibility/ceiling fail the Part 107 heuristics),
+    MARGINAL if any is past its MARGINAL limit, GOOD if the wind is known (NWS
+    often leaves a 0% precipitation chance null), else UNKNOWN.
+    """
+    base = part107_compliance_assessment(
+        visibility_sm=conditions.get("visibility_sm"),
+        cloud_ceiling_ft=conditions.get("cloud_ceiling_ft"),
+    )
+    wind = conditions.get("wind_speed_kt")
+    precip = conditions.get("precipitation_probability")
+    wind_ok = None if wind is None else wind <= LAUNCH_WIND_MAX_KT
+    precip_ok = None if precip is None else precip <= LAUNCH_PRECIP_MAX_PCT
+
+    if base["visibility_ok"] is False or base["cloud_clearance_ok"] is False or wind_ok is False or precip_ok is False:
+        overall = "POOR"
+    elif (wind is not None and wind > LAUNCH_WIND_MARGINAL_KT) or (
+        precip is not None and precip > LAUNCH_PRECIP_MARGINAL_PCT
+    ):
+        overall = "MARGINAL"
+    elif wind_ok:
+        overall = "GOOD"
+    else:
+        overall = "UNKNOWN"
+
+    return {
+        "visibility_ok": base["visibility_ok"],
+        "cloud_clearance_ok": base["cloud_clearance_ok"],
+        "wind_ok": wind_ok,
+        "precipitation_ok": precip_ok,
+        "overall_status": overall,
+        "notes": [
+            "Forecast-based assessment - not definitive",
+            "Verify actual conditions within 24 hours of flight",
+        ],
+    }
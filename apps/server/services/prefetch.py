@@ -0,0 +1,227 @@
+"""
+Popularity-driven prefetching for the handful of launch sites most traffic hits.
+
+Every preflight location is counted in a PopularityTracker. Locations are quantized
+to ~100 m buckets, and each bucket's count decays with a half-life. The tracker
+can also be seeded from stored advisory snapshots. A background loop takes the
+top-K buckets and re-runs the airspace, NWS points/forecast and observation
+lookups for each bucket's most recent exact coordinate. It runs:
+
+- inside refresh_ahead(), so only entries close to expiry are refetched;
+- at BACKGROUND priority, so the outbound rate limiters serve user requests
+  first;
+- with bounded concurrency, pausing while interactive calls are queued.
+
+PREFETCH_ENABLED=1 turns it on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .cache import refresh_ahead
+from .faa_airspace import analyze_airspace
+from .faa_tfr import fetch_tfr_list_json
+from .metrics import Counter, Gauge
+from .nws_weather import fetch_gridpoint_forecast_by_latlon, fetch_latest_observation_by_latlon
+from .ratelimit import BACKGROUND, bucket_for, request_priority
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+PREFETCH_TOP_K = int(os.getenv("PREFETCH_TOP_K", "200"))
+PREFETCH_INTERVAL_S = float(os.getenv("PREFETCH_INTERVAL_S", "60"))
+# Refetch entries expiring within this window; must exceed PREFETCH_INTERVAL_S.
+PREFETCH_LEAD_S = float(os.getenv("PREFETCH_LEAD_S", "180"))
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "4"))
+PREFETCH_HALF_LIFE_S = float(os.getenv("PREFETCH_HALF_LIFE_S", str(24 * 3600)))
+PREFETCH_SEED_LIMIT = int(os.getenv("PREFETCH_SEED_LIMIT", "20000"))
+
+QUANTUM_DEG = 0.001
+MAX_TRACKED = 50_000
+# Upstreams a refresh touches; prefetching pauses while user calls queue for them.
+_UPSTREAMS = ("arcgis", "nws")
+
+PREFETCH_REFRESHES = Counter(
+    "prefetch_refreshes_total",
+    "Prefetch lookups by kind and result (ok/error).",
+    ("kind", "result"),
+)
+PREFETCH_TRACKED = Gauge(
+    "prefetch_tracked_locations",
+    "Quantized locations in the popularity table.",
+)
+
+
+@dataclass(slots=True)
+class _Site:
+    score: float
+    updated_at: float
+    latitude: float
+    longitude: float
+    altitude_ft: int
+
+
+class PopularityTracker:
+    """
+    Exponentially decaying hit counts per quantized location. Each bucket remembers
+    the latest exact coordinate seen, which is what gets prefetched (cache keys are
+    exact, and pilots tend to reuse saved launch sites).
+    """
+
+    def __init__(self, half_life_s: float = PREFETCH_HALF_LIFE_S, max_tracked: int = MAX_TRACKED) -> None:
+        self.half_life_s = half_life_s
+        self.max_tracked = max_tracked
+        self._sites: dict[tuple[int, int], _Site] = {}
+
+    def __len__(self) -> int:
+        return len(self._sites)
+
+    @staticmethod
+    def bucket(latitude: float, longitude: float) -> tuple[int, int]:
+        return (round(latitude / QUANTUM_DEG), round(longitude / QUANTUM_DEG))
+
+    def _decayed(self, site: _Site, now: float) -> float:
+        return site.score * math.exp2(-(now - site.updated_at) / self.half_life_s)
+
+    def record(
+        self, latitude: float, longitude: float, altitude_ft: int = 400, at: float | None = None, weight: float = 1.0
+    ) -> None:
+        now = time.time()
+        at = now if at is None else min(at, now)
+        key = self.bucket(latitude, longitude)
+        site = self._sites.get(key)
+        if site is None:
+            self._sites[key] = _Site(weight * math.exp2(-(now - at) / self.half_life_s), now, latitude, longitude, altitude_ft)
+            if len(self._sites) > self.max_tracked:
+                self._prune(now)
+            return
+        site.score = self._decayed(site, now) + weight * math.exp2(-(now - at) / self.half_life_s)
+        site.updated_at = now
+        if at >= now:  # only live traffic moves the representative coordinate
+            site.latitude, site.longitude, site.altitude_ft = latitude, longitude, altitude_ft
+
+    def _prune(self, now: float) -> None:
+        keep = heapq.nlargest(self.max_tracked * 3 // 4, self._sites.items(), key=lambda kv: self._decayed(kv[1], now))
+        self._sites = dict(keep)
+
+    def top(self, k: int) -> list[tuple[float, float, int, float]]:
+        """
+        Up to k (latitude, longitude, altitude_ft, score), most popular first.
+        """
+        now = time.time()
+        best = heapq.nlargest(k, self._sites.values(), key=lambda s: self._decayed(s, now))
+        return [(s.latitude, s.longitude, s.altitude_ft, round(self._decayed(s, now), 3)) for s in best]
+
+    def seed(self, rows: Iterable[dict[str, Any]]) -> int:
+        """
+        Count stored snapshot rows (location_lat, location_lon, altitude_ft,
+        timestamp_utc), each weighted by how long ago it was recorded.
+        """
+        seeded = 0
+        for row in rows:
+            try:
+                lat, lon = float(row["location_lat"]), float(row["location_lon"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            at = _epoch(row.get("timestamp_utc"))
+            self.record(lat, lon, int(row.get("altitude_ft") or 400), at=at if at is not None else time.time())
+            seeded += 1
+        return seeded
+
+
+def _epoch(value: Any) -> float | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+TRACKER = PopularityTracker()
+
+
+def record_location(latitude: float, longitude: float, altitude_ft: int) -> None:
+    """
+    Count one user request for a location (no-op unless prefetching is enabled).
+    """
+    if PREFETCH_ENABLED:
+        TRACKER.record(latitude, longitude, altitude_ft)
+
+
+async def _refresh(kind: str, work: Awaitable[Any]) -> None:
+    try:
+        await work
+        PREFETCH_REFRESHES.labels(kind, "ok").inc()
+    except Exception:
+        PREFETCH_REFRESHES.labels(kind, "error").inc()
+
+
+def _users_waiting() -> bool:
+    for upstream in _UPSTREAMS:
+        bucket = bucket_for(upstream)
+        if bucket is not None and bucket.queued():
+            return True
+    return False
+
+
+async def _yield_to_users() -> None:
+    while _users_waiting():
+        await asyncio.sleep(0.5)
+
+
+async def prefetch_once(
+    tracker: PopularityTracker = TRACKER,
+    top_k: int = PREFETCH_TOP_K,
+    lead_s: float = PREFETCH_LEAD_S,
+    concurrency: int = PREFETCH_CONCURRENCY,
+) -> int:
+    """
+    One refresh pass over the top-k locations. Returns the number of locations visited.
+    """
+    sites = tracker.top(top_k)
+    PREFETCH_TRACKED.labels().set(len(tracker))
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _site(lat: float, lon: float, alt: int) -> None:
+        async with sem:
+            await _yield_to_users()
+            await _refresh("airspace", analyze_airspace(lat, lon, alt))
+            await _refresh("forecast", fetch_gridpoint_forecast_by_latlon(lat, lon))
+            await _refresh("observation", fetch_latest_observation_by_latlon(lat, lon))
+
+    with request_priority(BACKGROUND), refresh_ahead(lead_s):
+        if sites:
+            await _refresh("tfr_list", fetch_tfr_list_json())
+        await asyncio.gather(*(_site(lat, lon, alt) for lat, lon, alt, _ in sites))
+    return len(sites)
+
+
+async def run_prefetcher(
+    seed: Callable[[], Iterable[dict[str, Any]]] | None = None, interval_s: float = PREFETCH_INTERVAL_S
+) -> None:
+    """
+    Background loop: seed once from stored snapshots, then prefetch every interval_s.
+    """
+    if seed is not None:
+        try:
+            rows = await asyncio.to_thread(lambda: list(seed()))
+            logger.info(f"Prefetch popularity seeded from {TRACKER.seed(rows)} snapshots")
+        except Exception as e:
+            logger.error(f"Prefetch seeding failed: {e}")
+    while True:
+        try:
+            await prefetch_once()
+        except Exception as e:
+            logger.error(f"Prefetch pass failed: {e}")
+        await asyncio.sleep(interval_s)
@@ -0,0 +1,224 @@
+"""
+Outbound rate limiting per upstream: a token bucket with a priority queue.
+
+Every upstream GET waits here for a token before it is sent (see resilient_get).
+When the bucket is empty, waiters are served strictly by priority, then FIFO:
+interactive requests (/api/preflight, /tools/*) before batch work (rechecks,
+clients that send X-Request-Priority: batch) before background refreshes and
+prefetching. The priority travels with the request in a contextvar.
+
+Limits come from UPSTREAM_RATE_LIMITS, e.g. "nws=10:20,arcgis=20:40" (requests
+per second : burst). Upstreams without a limit are not queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .deadline import DeadlineExceeded, remaining_s
+from .metrics import Gauge, Histogram
+from .timing import add_span
+
+INTERACTIVE = 0
+BATCH = 1
+BACKGROUND = 2
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch", BACKGROUND: "background"}
+PRIORITY_BY_NAME = {name: level for level, name in PRIORITY_NAMES.items()}
+
+# api.weather.gov documents no fixed quota but throttles bursts; keep well under it.
+DEFAULT_RATE_LIMITS = "nws=10:20,arcgis=20:40,faa_tfr=5:10"
+
+QUEUE_WAIT = Histogram(
+    "upstream_queue_wait_seconds",
+    "Time upstream calls waited for a rate-limit token, by priority.",
+    ("upstream", "priority"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+QUEUE_DEPTH = Gauge(
+    "upstream_queue_depth",
+    "Upstream calls currently queued for a rate-limit token.",
+    ("upstream",),
+)
+
+_PRIORITY: ContextVar[int] = ContextVar("upstream_priority", default=INTERACTIVE)
+
+
+def current_priority() -> int:
+    return _PRIORITY.get()
+
+
+@contextmanager
+def request_priority(level: int) -> Iterator[None]:
+    """
+    Run upstream calls made inside the block (and tasks spawned from it) at `level`.
+    """
+    token = _PRIORITY.set(level)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def parse_rate_limits(spec: str) -> dict[str, tuple[float, float]]:
+    """
+    "nws=10:20,arcgis=20" -> {"nws": (10.0, 20.0), "arcgis": (20.0, 20.0)}. Burst defaults to the rate.
+    """
+    limits: dict[str, tuple[float, float]] = {}
+    for item in spec.split(","):
+        name, sep, value = item.strip().partition("=")
+        if not sep:
+            continue
+        rate_s, _, burst_s = value.partition(":")
+        try:
+            rate = float(rate_s)
+            burst = float(burst_s) if burst_s else rate
+        except ValueError:
+            continue
+        if rate > 0:
+            limits[name.strip()] = (rate, max(1.0, burst))
+    return limits
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second up to `burst`. acquire() takes one token, queueing by
+    (priority, arrival) when none is available. Callers never jump a queue that
+    already exists, so a burst of interactive calls cannot be starved by the
+    bucket refilling between background waiters.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_loop: asyncio.AbstractEventLoop | None = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token only if one is free right now and nobody is queued.
+        """
+        self._refill()
+        if self._waiters or self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+    async def acquire(self, priority: int = INTERACTIVE) -> float:
+        """
+        Wait for a token; returns the time spent waiting (seconds).
+        """
+        if self.try_acquire():
+            return 0.0
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        QUEUE_DEPTH.labels(self.name).inc()
+        start = time.perf_counter()
+        self._schedule(loop)
+        try:
+            await fut
+        finally:
+            QUEUE_DEPTH.labels(self.name).dec()
+            if not fut.done():
+                fut.cancel()  # cancelled while queued; _drain skips it
+        return time.perf_counter() - start
+
+    def pause(self, seconds: float) -> None:
+        """
+        Upstream asked us to back off (429 Retry-After): hand out nothing for `seconds`.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None and self._timer_loop is loop and not self._timer.cancelled():
+            return
+        delay = max(0.0, (1.0 - self.tokens) / self.rate)
+        self._timer_loop = loop
+        self._timer = loop.call_later(delay, self._drain)
+
+    def _drain(self) -> None:
+        self._timer = None
+        self._refill()
+        while self._waiters and self.tokens >= 1.0:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            self.tokens -= 1.0
+            fut.set_result(None)
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if self._waiters and self._timer_loop is not None and not self._timer_loop.is_closed():
+            self._schedule(self._timer_loop)
+
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+
+_LIMITS = parse_rate_limits(os.getenv("UPSTREAM_RATE_LIMITS", DEFAULT_RATE_LIMITS))
+_BUCKETS: dict[str, TokenBucket] = {}
+
+
+def bucket_for(upstream: str) -> TokenBucket | None:
+    bucket = _BUCKETS.get(upstream)
+    if bucket is None:
+        limit = _LIMITS.get(upstream)
+        if limit is None:
+            return None
+        bucket = _BUCKETS[upstream] = TokenBucket(upstream, *limit)
+    return bucket
+
+
+async def wait_for_slot(upstream: str) -> None:
+    """
+    Block until `upstream`'s limiter lets one call through at the current priority,
+    or raise DeadlineExceeded if the request's budget runs out first.
+    """
+    bucket = bucket_for(upstream)
+    if bucket is None:
+        return
+    priority = current_priority()
+    remaining = remaining_s()
+    try:
+        waited = await asyncio.wait_for(bucket.acquire(priority), timeout=remaining)
+    except TimeoutError:
+        raise DeadlineExceeded(f"Request deadline budget exhausted while queued for {upstream}.") from None
+    QUEUE_WAIT.labels(upstream, PRIORITY_NAMES.get(priority, str(priority))).observe(waited)
+    if waited:
+        add_span(f"{upstream}.queue", waited * 1000.0)
+
+
+def rate_limit_stats() -> dict[str, dict[str, float]]:
+    return {
+        name: {"rate": b.rate, "burst": b.burst, "tokens": round(b.tokens, 2), "queued": b.queued()}
+        for name, b in _BUCKETS.items()
+    }
+
+
+def reset_rate_limits(limits: dict[str, tuple[float, float]] | None = None) -> None:
+    """
+    Drop all buckets (tests) and use `limits`, or the configured ones when None.
+    """
+    global _LIMITS
+    _BUCKETS.clear()
+    _LIMITS = dict(limits) if limits is not None else parse_rate_limits(
+        os.getenv("UPSTREAM_RATE_LIMITS", DEFAULT_RATE_LIMITS)
+    )
@@ -0,0 +1,409 @@
+"""
+Per-host resilience for upstream GETs: circuit breaker, jittered retries limited
+by a retry budget, hedged duplicates for slow idempotent requests, and timeouts
+that adapt to observed latency.
+
+Every service module sends its upstream GETs through resilient_get(). When a
+host's breaker is open the call fails fast with UpstreamUnavailable, which
+callers map to their conservative UNKNOWN results.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from .deadline import cap_timeout, remaining_s
+from .metrics import Counter, Gauge, upstream_call
+from .ratelimit import bucket_for, wait_for_slot
+
+# Response statuses that count as upstream failures (retryable, trip the breaker).
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+RESILIENCE_ENABLED = os.getenv("UPSTREAM_RESILIENCE_ENABLED", "1").strip().lower() not in ("0", "false", "no", "")
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    max_attempts: int = 2
+    retry_base_delay_s: float = 0.2
+    # Retries may add at most this fraction on top of first attempts, plus a burst reserve.
+    retry_budget_ratio: float = 0.1
+    retry_budget_reserve: float = 10.0
+    # Breaker: open after this many consecutive failures, probe again after the cooldown.
+    breaker_failure_threshold: int = 5
+    breaker_cooldown_s: float = 30.0
+    # Hedge: send a duplicate when the first attempt is slower than this latency percentile.
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20
+    # Adaptive timeout: multiplier x p99 latency, never below the floor or above the caller's timeout.
+    timeout_p99_multiplier: float = 3.0
+    timeout_floor_s: float = 2.0
+    latency_window: int = 256
+
+
+DEFAULT_POLICY = ResiliencePolicy()
+
+BREAKER_STATE = Gauge(
+    "upstream_circuit_state",
+    "Circuit breaker state per upstream host (0 closed, 1 half-open, 2 open).",
+    ("host",),
+)
+SHORT_CIRCUITS = Counter(
+    "upstream_short_circuits_total",
+    "Upstream calls rejected without a request because the host's breaker was open.",
+    ("host",),
+)
+RETRIES = Counter(
+    "upstream_retries_total",
+    "Retries sent after a failed upstream attempt.",
+    ("host",),
+)
+HEDGES = Counter(
+    "upstream_hedges_total",
+    "Hedged duplicate requests, by which request answered first (primary/hedge).",
+    ("host", "winner"),
+)
+
+
+class UpstreamUnavailable(RuntimeError):
+    """
+    The upstream host is short-circuited (breaker open); no request was sent.
+    """
+
+    def __init__(self, host: str) -> None:
+        super().__init__(f"Upstream {host} is temporarily unavailable (circuit open).")
+        self.host = host
+
+
+class LatencyTracker:
+    """
+    Recent successful latencies (seconds) in a fixed-size window.
+    """
+
+    def __init__(self, window: int) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[idx]
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `threshold` consecutive failures; open -> half-open after
+    `cooldown_s`, when a single probe is let through; the probe's outcome closes or
+    re-opens the breaker.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    _GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, host: str, threshold: int, cooldown_s: float) -> None:
+        self.host = host
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        BREAKER_STATE.labels(self.host).set(self._GAUGE[state])
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown_s:
+                return False
+            self._set_state(self.HALF_OPEN)
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def abandon(self) -> None:
+        """
+        The attempt ended without a verdict (cancelled); free the half-open probe slot.
+        """
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+
+class RetryBudget:
+    """
+    Token bucket refilled by first attempts: each request deposits `ratio` tokens,
+    each retry or hedge spends one. Caps extra load during an outage at ~ratio.
+    """
+
+    def __init__(self, ratio: float, reserve: float) -> None:
+        self.ratio = ratio
+        self.cap = reserve
+        self.tokens = reserve
+
+    def deposit(self) -> None:
+        self.tokens = min(self.cap, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def refund(self) -> None:
+        """
+        Return a withdrawn token whose retry or hedge was not sent after all.
+        """
+        self.tokens = min(self.cap, self.tokens + 1.0)
+
+
+class HostState:
+    def __init__(self, host: str, policy: ResiliencePolicy) -> None:
+        self.host = host
+        self.policy = policy
+        self.breaker = CircuitBreaker(host, policy.breaker_failure_threshold, policy.breaker_cooldown_s)
+        self.budget = RetryBudget(policy.retry_budget_ratio, policy.retry_budget_reserve)
+        self.latency = LatencyTracker(policy.latency_window)
+
+    def timeout_s(self, configured_s: float | None) -> float | None:
+        """
+        Observed p99 x multiplier, clamped to [floor, configured]. Until enough
+        samples exist, the configured timeout is used as is.
+        """
+        if configured_s is None or len(self.latency) < self.policy.hedge_min_samples:
+            return configured_s
+        p99 = self.latency.percentile(99.0) or 0.0
+        return min(configured_s, max(self.policy.timeout_floor_s, p99 * self.policy.timeout_p99_multiplier))
+
+    def hedge_delay_s(self) -> float | None:
+        if len(self.latency) < self.policy.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.policy.hedge_percentile)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "breaker": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "retry_tokens": round(self.budget.tokens, 2),
+            "latency_samples": len(self.latency),
+            "p95_ms": None if not len(self.latency) else round(self.latency.percentile(95.0) * 1000.0, 1),
+        }
+
+
+_HOSTS: dict[str, HostState] = {}
+
+
+def host_state(url: str, policy: ResiliencePolicy = DEFAULT_POLICY) -> HostState:
+    host = httpx.URL(url).host or url
+    state = _HOSTS.get(host)
+    if state is None:
+        state = _HOSTS[host] = HostState(host, policy)
+    return state
+
+
+def resilience_stats() -> dict[str, dict[str, Any]]:
+    return {host: state.stats() for host, state in _HOSTS.items()}
+
+
+def reset_resilience() -> None:
+    _HOSTS.clear()
+
+
+def _client_timeout_s(client: Any) -> float | None:
+    timeout = getattr(client, "timeout", None)
+    if isinstance(timeout, httpx.Timeout):
+        return timeout.read
+    return None
+
+
+def _is_failure(response: httpx.Response | None) -> bool:
+    return response is None or response.status_code in RETRYABLE_STATUSES
+
+
+def _honour_retry_after(upstream: str, response: httpx.Response) -> None:
+    bucket = bucket_for(upstream)
+    if bucket is None:
+        return
+    try:
+        seconds = float(response.headers.get("Retry-After", ""))
+    except (AttributeError, ValueError):
+        return  # absent, or an HTTP-date (not worth parsing here)
+    bucket.pause(min(seconds, 60.0))
+
+
+async def _attempt(
+    client: Any, url: str, params: dict[str, Any] | None, timeout_s: float | None, upstream: str, operation: str
+) -> httpx.Response:
+    kwargs: dict[str, Any] = {}
+    if params is not None:
+        kwargs["params"] = params
+    if timeout_s is not None:
+        kwargs["timeout"] = timeout_s
+    with upstream_call(upstream, operation) as call:
+        r = await client.get(url, **kwargs)
+        call.status = r.status_code
+    return r
+
+
+async def _hedged_attempt(
+    state: HostState,
+    client: Any,
+    url: str,
+    params: dict[str, Any] | None,
+    timeout_s: float | None,
+    upstream: str,
+    operation: str,
+    hedge: bool,
+) -> httpx.Response:
+    """
+    One logical attempt. If it is slower than the host's hedge percentile (and the
+    retry budget allows), a duplicate is sent and the first good answer wins.
+    """
+    primary = asyncio.ensure_future(_attempt(client, url, params, timeout_s, upstream, operation))
+    delay = state.hedge_delay_s() if hedge else None
+    if delay is None:
+        return await primary
+
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+    except asyncio.CancelledError:
+        primary.cancel()
+        raise
+    if done or not state.budget.withdraw():
+        return await primary
+    # A hedge is optional load: skip it when throttled rather than queue behind real
+    # work. Checked after the budget so a refused hedge never spends a rate-limit token.
+    bucket = bucket_for(upstream)
+    if bucket is not None and not bucket.try_acquire():
+        state.budget.refund()
+        return await primary
+
+    hedge_task = asyncio.ensure_future(_attempt(client, url, params, timeout_s, upstream, operation))
+    pending = {primary, hedge_task}
+    first_error: BaseException | None = None
+    fallback: httpx.Response | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    first_error = first_error or task.exception()
+                    continue
+                response = task.result()
+                if _is_failure(response):
+                    fallback = fallback or response
+                    continue
+                HEDGES.labels(state.host, "primary" if task is primary else "hedge").inc()
+                return response
+    finally:
+        for task in pending:
+            task.cancel()
+    if fallback is not None:
+        return fallback
+    assert first_error is not None
+    raise first_error
+
+
+async def resilient_get(
+    client: Any,
+    url: str,
+    *,
+    upstream: str,
+    operation: str,
+    params: dict[str, Any] | None = None,
+    hedge: bool = True,
+) -> httpx.Response:
+    """
+    GET through the host's breaker, adaptive timeout, hedging and retry budget.
+
+    Returns the final response (callers still raise_for_status()); raises the last
+    transport error, UpstreamUnavailable when the breaker is open, or
+    DeadlineExceeded when the request's deadline budget is spent.
+
+    Under a request deadline every attempt's timeout is capped at the remaining
+    budget. A timeout caused by that cap is not held against the host's breaker.
+    """
+    if not RESILIENCE_ENABLED:
+        await wait_for_slot(upstream)
+        return await _attempt(client, url, params, cap_timeout(_client_timeout_s(client)), upstream, operation)
+
+    state = host_state(url)
+    policy = state.policy
+    state.budget.deposit()
+    host_timeout_s = state.timeout_s(_client_timeout_s(client))
+
+    attempt = 0
+    while True:
+        cap_timeout(host_timeout_s)  # fail before taking a probe slot or a token
+        if not state.breaker.allow():
+            SHORT_CIRCUITS.labels(state.host).inc()
+            raise UpstreamUnavailable(state.host)
+
+        response: httpx.Response | None = None
+        error: Exception | None = None
+        timeout_s = host_timeout_s
+        try:
+            await wait_for_slot(upstream)
+            timeout_s = cap_timeout(host_timeout_s)
+            start = time.perf_counter()
+            response = await _hedged_attempt(state, client, url, params, timeout_s, upstream, operation, hedge)
+        except httpx.HTTPError as e:  # transport errors and timeouts
+            error = e
+        except BaseException:
+            state.breaker.abandon()
+            raise
+
+        if not _is_failure(response):
+            state.breaker.record_success()
+            state.latency.record(time.perf_counter() - start)
+            return response
+
+        if isinstance(error, httpx.TimeoutException) and timeout_s != host_timeout_s:
+            state.breaker.abandon()  # our budget ran out, not the host's patience
+            raise error
+
+        state.breaker.record_failure()
+        if response is not None and response.status_code == 429:
+            _honour_retry_after(upstream, response)
+        attempt += 1
+        # Full jitter: uniform(0, base * 2^attempt)
+        delay = random.uniform(0.0, policy.retry_base_delay_s * (2 ** attempt))
+        remaining = remaining_s()
+        out_of_time = remaining is not None and delay >= remaining
+        if attempt >= policy.max_attempts or out_of_time or not state.budget.withdraw():
+            if response is not None:
+                return response
+            raise error
+
+        RETRIES.labels(state.host).inc()
+        await asyncio.sleep(delay)
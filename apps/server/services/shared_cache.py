@@ -0,0 +1,221 @@
+"""
+Cross-worker L2 for TTLCache.
+
+With several uvicorn workers, each process keeps its own TTLCaches. Caches
+created with shared=True also read through to, and write to, one backend that all
+workers on the host see, so the TFR feed or a gridpoint forecast is fetched and
+parsed once per host rather than once per worker.
+
+SHARED_CACHE_URL selects the backend (unset = no L2):
+    sqlite:///var/tmp/drone-ops-cache.db   shared SQLite file (stdlib, WAL mode)
+    redis://127.0.0.1:6379/0               Redis-compatible server (needs `redis`)
+
+TTLCache calls the backend from worker threads (asyncio.to_thread), never on
+the event loop.
+
+Values are the parsed objects, pickled. The backend must only be reachable by
+this service's own workers. Backend errors are logged once and treated as misses;
+the L1 keeps working.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL", "").strip()
+
+# SQLite: give up quickly on a locked database rather than hold up the request.
+_SQLITE_BUSY_TIMEOUT_MS = 50
+_SQLITE_PURGE_EVERY = 500  # writes between sweeps of expired rows
+
+
+class SharedBackend(Protocol):
+    def get(self, namespace: str, key: str) -> tuple[bytes, float] | None: ...
+
+    def set(self, namespace: str, key: str, payload: bytes, expires_at: float) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class SQLiteBackend:
+    """
+    One table in a local SQLite file; every worker, and every thread in it, opens
+    its own connection.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, payload BLOB NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only this thread uses it; close() may run on another one.
+            conn = sqlite3.connect(
+                self.path, timeout=_SQLITE_BUSY_TIMEOUT_MS / 1000.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def get(self, namespace: str, key: str) -> tuple[bytes, float] | None:
+        row = self._conn().execute(
+            "SELECT payload, expires_at FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def set(self, namespace: str, key: str, payload: bytes, expires_at: float) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, payload, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, payload, expires_at),
+        )
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % _SQLITE_PURGE_EVERY == 0
+        if purge:
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+
+# Redis values are the expiry (epoch seconds, big-endian double) followed by the payload.
+_EXPIRY = struct.Struct("!d")
+
+
+class RedisBackend:
+    """
+    Any Redis-compatible server. Entries carry a PX expiry matching expires_at.
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis  # optional dependency, only needed for redis:// URLs
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.2)
+
+    @staticmethod
+    def _key(namespace: str, key: str) -> str:
+        return f"droneops:cache:{namespace}:{key}"
+
+    def get(self, namespace: str, key: str) -> tuple[bytes, float] | None:
+        raw = self._client.get(self._key(namespace, key))
+        if raw is None:
+            return None
+        (expires_at,) = _EXPIRY.unpack_from(raw)
+        return raw[_EXPIRY.size :], expires_at
+
+    def set(self, namespace: str, key: str, payload: bytes, expires_at: float) -> None:
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        self._client.set(self._key(namespace, key), _EXPIRY.pack(expires_at) + payload, px=ttl_ms)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def create_backend(url: str) -> SharedBackend | None:
+    if not url:
+        return None
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite://") :])  # sqlite:///abs/path.db -> /abs/path.db
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported SHARED_CACHE_URL scheme: {url!r}")
+
+
+_BACKEND: SharedBackend | None = None
+_BACKEND_READY = False
+_FAILED = False
+
+
+def get_backend() -> SharedBackend | None:
+    """
+    The configured backend, created on first use (None when disabled or broken).
+    """
+    global _BACKEND, _BACKEND_READY, _FAILED
+    if not _BACKEND_READY:
+        _BACKEND_READY = True
+        try:
+            _BACKEND = create_backend(SHARED_CACHE_URL)
+        except Exception as e:
+            _FAILED = True
+            logger.error(f"Shared cache disabled: {e}")
+    return _BACKEND
+
+
+def set_backend(backend: SharedBackend | None) -> None:
+    """
+    Replace the backend (tests, or an app that builds its own).
+    """
+    global _BACKEND, _BACKEND_READY, _FAILED
+    if _BACKEND is not None and _BACKEND is not backend:
+        _BACKEND.close()
+    _BACKEND, _BACKEND_READY, _FAILED = backend, True, False
+
+
+def _report(e: Exception) -> None:
+    global _FAILED
+    if not _FAILED:
+        _FAILED = True
+        logger.error(f"Shared cache error (treated as miss): {e}")
+
+
+def encode_key(key: Any) -> str:
+    # Cache keys are strings or tuples of str/int/float; repr() is stable for those.
+    return key if isinstance(key, str) else repr(key)
+
+
+def shared_get(namespace: str, key: Any) -> tuple[Any, float] | None:
+    """
+    (value, expires_at) from the L2, or None on a miss or any backend error.
+    """
+    backend = get_backend()
+    if backend is None:
+        return None
+    try:
+        found = backend.get(namespace, encode_key(key))
+        if found is None:
+            return None
+        payload, expires_at = found
+        return pickle.loads(payload), expires_at
+    except Exception as e:
+        _report(e)
+        return None
+
+
+def shared_set(namespace: str, key: Any, value: Any, expires_at: float) -> None:
+    backend = get_backend()
+    if backend is None or expires_at <= time.time():
+        return
+    try:
+        backend.set(namespace, encode_key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at)
+    except Exception as e:
+        _report(e)
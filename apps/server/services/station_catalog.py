@@ -0,0 +1,285 @@
+"""
+Local catalog of NWS observation stations with a grid spatial index.
+Lets real-time weather checks rank nearby stations without the NWS
+/points and observationStations round trips.
+
+The catalog file is either JSON (loaded into Python objects) or a memory-mapped
+dataset (see dataset.py) that every worker shares through the page cache.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import httpx
+
+from .airport_database import haversine_nm
+from .dataset import DatasetHandle, from_tri_state, is_dataset_file, tri_state, write_dataset
+
+NWS_BASE = os.getenv("NWS_BASE", "https://api.weather.gov")
+DEFAULT_UA = "drone-ops-compliance/0.1 (contact: replace-before-prod)"
+
+# Path to a catalog file (compact JSON list, an NWS /stations GeoJSON dump, or a dataset).
+STATION_CATALOG_PATH = os.getenv("NWS_STATION_CATALOG_PATH")
+
+CELL_DEG = 0.5
+DEFAULT_MAX_DISTANCE_NM = 75.0
+
+
+@dataclass
+class Station:
+    station_id: str
+    name: str
+    lat: float
+    lon: float
+    reports_visibility: bool | None  # None = unknown
+    reports_ceiling: bool | None
+
+
+def _infer_aviation_sensors(station_id: str) -> bool | None:
+    """
+    ASOS/AWOS sites use 4-letter ICAO identifiers (K***, P***, T***) and report
+    visibility and sky condition. Other networks in the NWS list usually do not.
+    """
+    sid = station_id.strip().upper()
+    if len(sid) == 4 and sid.isalnum() and sid[0] in "KPT":
+        return True
+    return None
+
+
+def _station_from_record(rec: dict[str, Any]) -> Station | None:
+    # NWS /stations GeoJSON feature
+    if "properties" in rec:
+        props = rec.get("properties") or {}
+        coords = (rec.get("geometry") or {}).get("coordinates") or []
+        station_id = props.get("stationIdentifier")
+        if not station_id or len(coords) < 2:
+            return None
+        inferred = _infer_aviation_sensors(station_id)
+        return Station(
+            station_id=str(station_id),
+            name=str(props.get("name") or station_id),
+            lat=float(coords[1]),
+            lon=float(coords[0]),
+            reports_visibility=inferred,
+            reports_ceiling=inferred,
+        )
+
+    # Compact record (as written by save_station_catalog)
+    station_id = rec.get("station_id")
+    if not station_id or rec.get("lat") is None or rec.get("lon") is None:
+        return None
+    return Station(
+        station_id=str(station_id),
+        name=str(rec.get("name") or station_id),
+        lat=float(rec["lat"]),
+        lon=float(rec["lon"]),
+        reports_visibility=rec.get("reports_visibility"),
+        reports_ceiling=rec.get("reports_ceiling"),
+    )
+
+
+class StationCatalog:
+    """
+    Stations bucketed into CELL_DEG x CELL_DEG lat/lon cells. A nearest query only
+    measures stations in the cells overlapping the search radius.
+    """
+
+    def __init__(self, stations: list[Station]) -> None:
+        self.stations = stations
+        self._cells: dict[tuple[int, int], list[Station]] = {}
+        for st in stations:
+            self._cells.setdefault(self._cell(st.lat, st.lon), []).append(st)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    @staticmethod
+    def _cell(lat: float, lon: float) -> tuple[int, int]:
+        return (math.floor(lat / CELL_DEG), math.floor(lon / CELL_DEG))
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 8,
+        max_distance_nm: float = DEFAULT_MAX_DISTANCE_NM,
+    ) -> list[tuple[Station, float]]:
+        """
+        Returns up to k (station, distance_nm) pairs within max_distance_nm, nearest first.
+        """
+        dlat = max_distance_nm / 60.0
+        dlon = dlat / max(math.cos(math.radians(latitude)), 0.01)
+        lat_lo, lon_lo = self._cell(latitude - dlat, longitude - dlon)
+        lat_hi, lon_hi = self._cell(latitude + dlat, longitude + dlon)
+
+        found: list[tuple[Station, float]] = []
+        for ci in range(lat_lo, lat_hi + 1):
+            for cj in range(lon_lo, lon_hi + 1):
+                for st in self._cells.get((ci, cj), ()):
+                    d = haversine_nm(latitude, longitude, st.lat, st.lon)
+                    if d <= max_distance_nm:
+                        found.append((st, d))
+
+        found.sort(key=lambda pair: pair[1])
+        return found[:k]
+
+    def rank_candidates(self, latitude: float, longitude: float, k: int = 8) -> list[str]:
+        """
+        Station ids to try for a location: nearest first, but stations known not to
+        report visibility or ceiling go after those that do (or might).
+        """
+        near = self.nearest(latitude, longitude, k=k)
+        near.sort(key=lambda pair: (pair[0].reports_visibility is False or pair[0].reports_ceiling is False))
+        return [st.station_id for st, _ in near]
+
+
+class MappedStationCatalog(StationCatalog):
+    """
+    StationCatalog over a mapped dataset: Station objects are built only for the
+    stations a query returns.
+    """
+
+    def __init__(self, handle: DatasetHandle) -> None:
+        self._handle = handle
+
+    def __len__(self) -> int:
+        return len(self._handle.get())
+
+    @property
+    def stations(self) -> list[Station]:  # type: ignore[override]
+        ds = self._handle.get()
+        return [self._station(ds, r) for r in range(len(ds))]
+
+    @staticmethod
+    def _station(ds: Any, r: int) -> Station:
+        return Station(
+            station_id=ds.column("station_id")[r],
+            name=ds.column("name")[r],
+            lat=ds.column("lat")[r],
+            lon=ds.column("lon")[r],
+            reports_visibility=from_tri_state(ds.column("reports_visibility")[r]),
+            reports_ceiling=from_tri_state(ds.column("reports_ceiling")[r]),
+        )
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 8,
+        max_distance_nm: float = DEFAULT_MAX_DISTANCE_NM,
+    ) -> list[tuple[Station, float]]:
+        ds = self._handle.get()
+        lat, lon = ds.column("lat"), ds.column("lon")
+        dlat = max_distance_nm / 60.0
+        dlon = dlat / max(math.cos(math.radians(latitude)), 0.01)
+
+        found: list[tuple[int, float]] = []
+        for r in ds.records_in_box(latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon):
+            d = haversine_nm(latitude, longitude, lat[r], lon[r])
+            if d <= max_distance_nm:
+                found.append((r, d))
+
+        found.sort(key=lambda pair: pair[1])
+        return [(self._station(ds, r), d) for r, d in found[:k]]
+
+
+def build_station_dataset(catalog: StationCatalog, path: str) -> int:
+    """
+    Write the catalog as a mapped dataset (atomic rename); returns its build version.
+    """
+    stations = catalog.stations
+    return write_dataset(
+        path,
+        "nws_stations",
+        {
+            "station_id": ("str", [st.station_id for st in stations]),
+            "name": ("str", [st.name for st in stations]),
+            "lat": ("f8", [st.lat for st in stations]),
+            "lon": ("f8", [st.lon for st in stations]),
+            "reports_visibility": ("i1", [tri_state(st.reports_visibility) for st in stations]),
+            "reports_ceiling": ("i1", [tri_state(st.reports_ceiling) for st in stations]),
+        },
+        cell_deg=CELL_DEG,
+    )
+
+
+def load_station_catalog(path: str) -> StationCatalog:
+    if is_dataset_file(path):
+        return MappedStationCatalog(DatasetHandle(path))
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    records = data.get("features", []) if isinstance(data, dict) else data
+    stations = [st for st in (_station_from_record(r) for r in records) if st is not None]
+    return StationCatalog(stations)
+
+
+def save_station_catalog(catalog: StationCatalog, path: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump([asdict(st) for st in catalog.stations], fh)
+    os.replace(tmp, path)
+
+
+async def fetch_station_catalog_from_nws(
+    user_agent: str = DEFAULT_UA, timeout_s: float = 30.0, page_limit: int = 500
+) -> StationCatalog:
+    """
+    Bulk-download station metadata from NWS /stations (paginated).
+    Intended for an offline build step, not the request path.
+    """
+    headers = {"User-Agent": user_agent, "Accept": "application/geo+json"}
+    stations: list[Station] = []
+    url: str | None = f"{NWS_BASE}/stations?limit={page_limit}"
+
+    async with httpx.AsyncClient(timeout=timeout_s, headers=headers) as client:
+        while url:
+            r = await client.get(url)
+            r.raise_for_status()
+            page = r.json()
+            features = page.get("features") or []
+            stations.extend(st for st in (_station_from_record(f) for f in features) if st is not None)
+            next_url = (page.get("pagination") or {}).get("next")
+            url = next_url if features and next_url != url else None
+
+    return StationCatalog(stations)
+
+
+_catalog: StationCatalog | None = None
+_catalog_loaded = False
+
+
+def get_station_catalog() -> StationCatalog | None:
+    """
+    Lazily load the catalog configured by NWS_STATION_CATALOG_PATH.
+    Returns None (callers use the NWS API ranking) if unset or unreadable.
+    """
+    global _catalog, _catalog_loaded
+    if _catalog_loaded:
+        return _catalog
+    _catalog_loaded = True
+    if not STATION_CATALOG_PATH:
+        return None
+    try:
+        _catalog = load_station_catalog(STATION_CATALOG_PATH)
+    except Exception:
+        _catalog = None
+    return _catalog
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+
+    # A .dods output is written as a mapped dataset, anything else as compact JSON.
+    out = sys.argv[1] if len(sys.argv) > 1 else "stations.json"
+    catalog = asyncio.run(fetch_station_catalog_from_nws())
+    if out.endswith(".dods"):
+        build_station_dataset(catalog, out)
+    else:
+        save_station_catalog(catalog, out)
+    print(f"Wrote {out}")
@@ -0,0 +1,105 @@
+"""
+Per-request span timings.
+
+A request that opted in (see start_request_timings) carries a dict of
+span name -> elapsed ms in a contextvar. span() adds to it; child tasks share the
+same dict, and a span that runs more than once (e.g. one observation fetch per
+station) is summed. With no timings active, span() returns a shared no-op.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextvars import ContextVar, Token
+
+REQUEST_TIMINGS_ENABLED = os.getenv("REQUEST_TIMINGS_ENABLED", "1").strip().lower() not in ("0", "false", "no", "")
+
+_SPANS: ContextVar[dict[str, float] | None] = ContextVar("request_spans", default=None)
+
+
+class _Span:
+    __slots__ = ("_spans", "_name", "_start")
+
+    def __init__(self, spans: dict[str, float], name: str) -> None:
+        self._spans = spans
+        self._name = name
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        elapsed_ms = (time.perf_counter() - self._start) * 1000.0
+        self._spans[self._name] = self._spans.get(self._name, 0.0) + elapsed_ms
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str) -> _Span | _NoopSpan:
+    """
+    with span("airspace"):
+        ...
+    """
+    spans = _SPANS.get()
+    if spans is None:
+        return _NOOP
+    return _Span(spans, name)
+
+
+def add_span(name: str, elapsed_ms: float) -> None:
+    """
+    Record an already-measured duration (no-op when not collecting).
+    """
+    spans = _SPANS.get()
+    if spans is not None:
+        spans[name] = spans.get(name, 0.0) + elapsed_ms
+
+
+def start_request_timings() -> Token | None:
+    """
+    Begin collecting spans for the current request. Returns a token for
+    end_request_timings(), or None when the feature is disabled.
+    """
+    if not REQUEST_TIMINGS_ENABLED:
+        return None
+    return _SPANS.set({})
+
+
+def end_request_timings(token: Token | None) -> dict[str, float] | None:
+    if token is None:
+        return None
+    spans = _SPANS.get()
+    _SPANS.reset(token)
+    return spans
+
+
+def current_timings() -> dict[str, float] | None:
+    """
+    Snapshot of the spans recorded so far (ms, rounded), or None if not collecting.
+    """
+    spans = _SPANS.get()
+    if spans is None:
+        return None
+    return {name: round(ms, 1) for name, ms in spans.items()}
+
+
+def server_timing_header(spans: dict[str, float], total_ms: float | None = None) -> str:
+    """
+    Format spans as a Server-Timing header value, e.g. "airspace;dur=120.4, tfr;dur=35.0".
+    """
+    parts = [f"{name};dur={ms:.1f}" for name, ms in spans.items()]
+    if total_ms is not None:
+        parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
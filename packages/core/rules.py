@@ -1,19 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import product
 from typing import Any, Literal
 
 
 Status = Literal["GO", "GO_WITH_CONDITIONS", "NO_GO"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Decision:
+    # Lists from decide_preflight; tuples when shared via decide_preflight_cached.
     overall_status: Status
-    required_actions: list[str]
-    checklist_items: list[dict[str, Any]]
-    rationale: list[str]
-    disclaimers: list[str]
+    required_actions: list[str] | tuple[str, ...]
+    checklist_items: list[dict[str, Any]] | tuple[dict[str, Any], ...]
+    rationale: list[str] | tuple[str, ...]
+    disclaimers: list[str] | tuple[str, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        The API "checklist" shape. Values are shared, not copied.
+        """
+        return {
+            "overall_status": self.overall_status,
+            "required_actions": self.required_actions,
+            "checklist_items": self.checklist_items,
+            "rationale": self.rationale,
+            "disclaimers": self.disclaimers,
+        }
 
 
 def _get(d: dict[str, Any], path: list[str]) -> Any | None:
@@ -25,11 +41,298 @@ def _get(d: dict[str, Any], path: list[str]) -> Any | None:
     return cur
 
 
+class ChecklistItem(dict):
+    """
+    Immutable checklist entry. A dict subclass so it serializes and compares
+    exactly like the plain dicts it replaces, but safe to share between decisions.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("ChecklistItem is immutable; copy it with dict(item) to modify.")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly  # type: ignore[assignment]
+    __ior__ = _readonly  # type: ignore[assignment]
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(tuple(self.items()))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (ChecklistItem, (dict(self),))
+
+
+def _item(category: str, item: str, status: str, required: bool = True) -> ChecklistItem:
+    return ChecklistItem(category=category, item=item, required=required, status=status)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Outcome of one assessment dimension for one input category.
+
+    blocks: the overall decision is NO_GO.
+    needs_conditions: the overall decision is at best GO_WITH_CONDITIONS
+    (ACTION_NEEDED items have the same effect).
+    """
+
+    item: ChecklistItem
+    rationale: str | None = None
+    action: str | None = None
+    blocks: bool = False
+    needs_conditions: bool = False
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """
+    Declarative rule table. Each dimension maps an input category to a Rule;
+    categories are listed in `*_CATEGORIES` below. Rationale and required actions
+    are emitted in dimension order: TFR, airspace class, LAANC, weather.
+    """
+
+    version: str
+    tfr: dict[str, Rule]
+    airspace_class: dict[str, Rule]  # item text is filled in per class at evaluation
+    laanc: dict[str, Rule]
+    weather: dict[str, Rule]
+    disclaimers: tuple[str, ...] = field(default=())
+
+
+TFR_CATEGORIES = ("CLEAR", "DO_NOT_FLY", "UNKNOWN", "OTHER")
+CLASS_CATEGORIES = ("KNOWN", "UNKNOWN")
+LAANC_CATEGORIES = ("REQUIRED", "NOT_REQUIRED", "MISSING", "OTHER")
+WEATHER_CATEGORIES = ("GOOD", "MARGINAL", "UNKNOWN", "OTHER")
+
+_TFR_UNKNOWN_ITEM = _item("Airspace", "TFR status unknown (verification required)", "UNKNOWN")
+_LAANC_UNKNOWN_RULE = Rule(
+    item=_item("Regulatory", "LAANC requirement unknown", "ACTION_NEEDED"),
+    action="LAANC requirement unclear; verify airspace status in an FAA-approved provider before flight.",
+    rationale="Airspace authorization requirement could not be determined from available data.",
+)
+_WEATHER_UNKNOWN_ITEM = _item("Weather", "Weather status unknown (verification required)", "UNKNOWN")
+_WEATHER_UNKNOWN_RATIONALE = "Weather data was incomplete or could not be evaluated."
+
+RULESET_V1 = RuleSet(
+    version="1",
+    tfr={
+        "CLEAR": Rule(item=_item("Airspace", "TFRs checked (no matches found by this checker)", "OK")),
+        "DO_NOT_FLY": Rule(
+            item=_item("Airspace", "TFR indicates restriction in effect", "ACTION_NEEDED"),
+            rationale="TFR restriction indicated. Do not fly until verified and resolved.",
+            action="Verify TFR boundaries/timing via official FAA sources before any operation.",
+            blocks=True,
+        ),
+        "UNKNOWN": Rule(
+            item=_TFR_UNKNOWN_ITEM,
+            rationale="TFR status could not be determined reliably.",
+            needs_conditions=True,
+        ),
+        # Unrecognized status strings: reported as unknown, without forcing conditions.
+        "OTHER": Rule(item=_TFR_UNKNOWN_ITEM, rationale="TFR status could not be determined reliably."),
+    },
+    airspace_class={
+        "KNOWN": Rule(item=_item("Airspace", "Airspace class", "OK")),
+        "UNKNOWN": Rule(item=_item("Airspace", "Airspace class", "UNKNOWN"), needs_conditions=True),
+    },
+    laanc={
+        "REQUIRED": Rule(
+            item=_item("Regulatory", "LAANC authorization required for controlled airspace", "ACTION_NEEDED"),
+            action="Obtain LAANC authorization via an FAA-approved LAANC provider before flight.",
+            rationale="Controlled airspace indicates authorization is required prior to flight.",
+        ),
+        "NOT_REQUIRED": Rule(item=_item("Regulatory", "No LAANC authorization indicated by this checker", "OK")),
+        "MISSING": Rule(
+            item=_LAANC_UNKNOWN_RULE.item,
+            action=_LAANC_UNKNOWN_RULE.action,
+            rationale=_LAANC_UNKNOWN_RULE.rationale,
+            needs_conditions=True,
+        ),
+        "OTHER": _LAANC_UNKNOWN_RULE,
+    },
+    weather={
+        "GOOD": Rule(item=_item("Weather", "Weather advisory check completed", "OK")),
+        "MARGINAL": Rule(
+            item=_item("Weather", "Weather appears marginal (verification required)", "ACTION_NEEDED"),
+            rationale="Weather advisory indicates marginal conditions.",
+            action="Verify weather at flight time using authoritative sources.",
+        ),
+        "UNKNOWN": Rule(item=_WEATHER_UNKNOWN_ITEM, rationale=_WEATHER_UNKNOWN_RATIONALE, needs_conditions=True),
+        # e.g. POOR or VERIFY_24HR_BEFORE: reported as unknown, without forcing conditions.
+        "OTHER": Rule(item=_WEATHER_UNKNOWN_ITEM, rationale=_WEATHER_UNKNOWN_RATIONALE),
+    },
+    disclaimers=(
+        "Advisory only - not legal advice and not authorization to fly.",
+        "Verify requirements and obtain any needed authorizations (e.g., LAANC) via an FAA-approved provider.",
+        "If any data is missing or uncertain, do not fly until you verify with authoritative sources.",
+    ),
+)
+
+DEFAULT_RULESET_VERSION = RULESET_V1.version
+
+
+# -------------------------
+# Input categorization
+# -------------------------
+_TFR_INDEX = {"CLEAR": 0, "DO_NOT_FLY": 1, "UNKNOWN": 2}
+_WX_INDEX = {"GOOD": 0, "MARGINAL": 1, "UNKNOWN": 2}
+
+
+def _tfr_category(status: Any) -> int:
+    return _TFR_INDEX.get((status or "UNKNOWN").upper(), 3)
+
+
+def _laanc_category(value: Any) -> int:
+    if value is True:
+        return 0
+    if value is False:
+        return 1
+    return 2 if value is None else 3
+
+
+def _class_text(value: Any) -> str:
+    return str(value or "Unknown")
+
+
+def _class_category(airspace_class: str) -> int:
+    return 1 if airspace_class.lower() == "unknown" else 0
+
+
+def _wx_category(status: Any) -> int:
+    return _WX_INDEX.get(str(status or "UNKNOWN").upper(), 3)
+
+
+RuleKey = tuple[int, int, int, int]  # (tfr, class, laanc, weather) category indexes
+ChecklistCodes = tuple[str, str, str, str]
+
+_TFR_CODES = ("TFR_CLEAR", "TFR_RESTRICTED", "TFR_UNKNOWN", "TFR_UNKNOWN")
+_CLASS_CODES = ("AIRSPACE_CLASS_KNOWN", "AIRSPACE_CLASS_UNKNOWN")
+_LAANC_CODES = ("LAANC_REQUIRED", "LAANC_NOT_REQUIRED", "LAANC_UNKNOWN", "LAANC_UNKNOWN")
+_WX_CODES = ("WX_GOOD", "WX_MARGINAL", "WX_UNKNOWN", "WX_UNKNOWN")
+
+# Index of the "Airspace class: ..." item, the only text that depends on raw input.
+_CLASS_ITEM_INDEX = 1
+
+
+# -------------------------
+# Compilation
+# -------------------------
+@dataclass(frozen=True)
+class _Compiled:
+    overall_status: Status
+    checklist_codes: ChecklistCodes
+    class_status: str
+    # Checklist with the airspace class slot left as None.
+    checklist_items: tuple[ChecklistItem | None, ...]
+    required_actions: tuple[str, ...]
+    rationale: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    version: str
+    disclaimers: tuple[str, ...]
+    outcomes: dict[RuleKey, _Compiled]
+
+
+def compile_ruleset(ruleset: RuleSet) -> CompiledRuleSet:
+    """
+    Evaluate every category combination once into an immutable outcome table.
+    """
+    outcomes: dict[RuleKey, _Compiled] = {}
+    dims = (TFR_CATEGORIES, CLASS_CATEGORIES, LAANC_CATEGORIES, WEATHER_CATEGORIES)
+
+    for key in product(*(range(len(d)) for d in dims)):
+        t, c, la, w = key
+        rules = (
+            ruleset.tfr[TFR_CATEGORIES[t]],
+            ruleset.airspace_class[CLASS_CATEGORIES[c]],
+            ruleset.laanc[LAANC_CATEGORIES[la]],
+            ruleset.weather[WEATHER_CATEGORIES[w]],
+        )
+
+        if any(r.blocks for r in rules):
+            overall: Status = "NO_GO"
+        elif any(r.needs_conditions or r.item["status"] == "ACTION_NEEDED" for r in rules):
+            overall = "GO_WITH_CONDITIONS"
+        else:
+            overall = "GO"
+
+        items: list[ChecklistItem | None] = [r.item for r in rules]
+        items[_CLASS_ITEM_INDEX] = None
+        outcomes[key] = _Compiled(
+            overall_status=overall,
+            checklist_codes=(_TFR_CODES[t], _CLASS_CODES[c], _LAANC_CODES[la], _WX_CODES[w]),
+            class_status=rules[_CLASS_ITEM_INDEX].item["status"],
+            checklist_items=tuple(items),
+            required_actions=tuple(r.action for r in rules if r.action),
+            rationale=tuple(r.rationale for r in rules if r.rationale),
+        )
+
+    return CompiledRuleSet(version=ruleset.version, disclaimers=ruleset.disclaimers, outcomes=outcomes)
+
+
+RULESETS: dict[str, CompiledRuleSet] = {RULESET_V1.version: compile_ruleset(RULESET_V1)}
+
+
+@lru_cache(maxsize=1024)
+def _class_item(airspace_class: str, status: str) -> ChecklistItem:
+    return _item("Airspace", f"Airspace class: {airspace_class}", status)
+
+
+def _materialize(
+    compiled: _Compiled, airspace_class: str, disclaimers: tuple[str, ...], shared: bool = False
+) -> Decision:
+    """
+    The Decision for one compiled outcome. shared=True keeps the compiled tuples
+    (immutable, safe to hand out from a cache); otherwise every field is a fresh list.
+    """
+    items = list(compiled.checklist_items)
+    items[_CLASS_ITEM_INDEX] = _class_item(airspace_class, compiled.class_status)
+    if shared:
+        return Decision(
+            compiled.overall_status, compiled.required_actions, tuple(items), compiled.rationale, disclaimers  # type: ignore[arg-type]
+        )
+    return Decision(
+        compiled.overall_status,
+        list(compiled.required_actions),
+        items,  # type: ignore[arg-type]
+        list(compiled.rationale),
+        list(disclaimers),
+    )
+
+
+def _rule_key(tfr_status: Any, laanc_required: Any, airspace_class: str, weather_status: Any) -> RuleKey:
+    return (
+        _tfr_category(tfr_status),
+        _class_category(airspace_class),
+        _laanc_category(laanc_required),
+        _wx_category(weather_status),
+    )
+
+
+def _categorize(
+    airspace_data: dict[str, Any], weather_data: dict[str, Any], tfr_data: dict[str, Any]
+) -> tuple[RuleKey, str]:
+    """
+    (rule key, airspace class text): everything the rules read from the inputs.
+    """
+    airspace_class = _class_text(airspace_data.get("airspace_class"))
+    key = _rule_key(
+        tfr_data.get("status"),
+        airspace_data.get("laanc_required"),
+        airspace_class,
+        (weather_data.get("part107_compliance") or {}).get("overall_status"),
+    )
+    return key, airspace_class
+
+
 def decide_preflight(
     mission_type: str,
     airspace_data: dict[str, Any],
     weather_data: dict[str, Any],
     tfr_data: dict[str, Any],
+    ruleset_version: str | None = None,
 ) -> Decision:
     """
     Phase 1: conservative advisory decision support.
@@ -37,150 +340,125 @@ def decide_preflight(
     IMPORTANT:
     - Advisory only; never claims authorization.
     - If anything critical is missing/unknown, downgrade to GO_WITH_CONDITIONS or NO_GO.
+
+    Evaluated against a compiled RuleSet (RULESETS, default DEFAULT_RULESET_VERSION).
+    Checklist items are shared immutable ChecklistItem objects.
     """
+    ruleset = RULESETS[ruleset_version or DEFAULT_RULESET_VERSION]
+    key, airspace_class = _categorize(airspace_data, weather_data, tfr_data)
+    return _materialize(ruleset.outcomes[key], airspace_class, ruleset.disclaimers)
 
-    required_actions: list[str] = []
-    checklist: list[dict[str, Any]] = []
-    rationale: list[str] = []
 
-    disclaimers = [
-        "Advisory only - not legal advice and not authorization to fly.",
-        "Verify requirements and obtain any needed authorizations (e.g., LAANC) via an FAA-approved provider.",
-        "If any data is missing or uncertain, do not fly until you verify with authoritative sources.",
-    ]
-
-    # -------------------------
-    # TFR assessment (coarse)
-    # -------------------------
-    tfr_status = (tfr_data.get("status") or "UNKNOWN").upper()
-    if tfr_status == "CLEAR":
-        checklist.append(
-            {
-                "category": "Airspace",
-                "item": "TFRs checked (no matches found by this checker)",
-                "required": True,
-                "status": "OK",
-            }
-        )
-    elif tfr_status == "DO_NOT_FLY":
-        checklist.append(
-            {
-                "category": "Airspace",
-                "item": "TFR indicates restriction in effect",
-                "required": True,
-                "status": "ACTION_NEEDED",
-            }
-        )
-        rationale.append("TFR restriction indicated. Do not fly until verified and resolved.")
-        required_actions.append("Verify TFR boundaries/timing via official FAA sources before any operation.")
-    else:
-        checklist.append(
-            {
-                "category": "Airspace",
-                "item": "TFR status unknown (verification required)",
-                "required": True,
-                "status": "UNKNOWN",
-            }
-        )
-        rationale.append("TFR status could not be determined reliably.")
-
-    # -------------------------
-    # Airspace / LAANC assessment
-    # -------------------------
-    airspace_class = str(airspace_data.get("airspace_class") or "Unknown")
-    laanc_required = airspace_data.get("laanc_required")
-
-    checklist.append(
-        {
-            "category": "Airspace",
-            "item": f"Airspace class: {airspace_class}",
-            "required": True,
-            "status": "OK" if airspace_class.lower() != "unknown" else "UNKNOWN",
-        }
-    )
+# -------------------------
+# Memoized evaluation
+# -------------------------
+DECISION_CACHE_SIZE = 4096
 
-    if laanc_required is True:
-        checklist.append(
-            {
-                "category": "Regulatory",
-                "item": "LAANC authorization required for controlled airspace",
-                "required": True,
-                "status": "ACTION_NEEDED",
-            }
-        )
-        required_actions.append("Obtain LAANC authorization via an FAA-approved LAANC provider before flight.")
-        rationale.append("Controlled airspace indicates authorization is required prior to flight.")
-    elif laanc_required is False:
-        checklist.append(
-            {
-                "category": "Regulatory",
-                "item": "No LAANC authorization indicated by this checker",
-                "required": True,
-                "status": "OK",
-            }
-        )
-    else:
-        checklist.append(
-            {
-                "category": "Regulatory",
-                "item": "LAANC requirement unknown",
-                "required": True,
-                "status": "ACTION_NEEDED",
-            }
-        )
-        required_actions.append(
-            "LAANC requirement unclear; verify airspace status in an FAA-approved provider before flight."
-        )
-        rationale.append("Airspace authorization requirement could not be determined from available data.")
 
-    # -------------------------
-    # Weather assessment (advisory)
-    # -------------------------
-    overall_wx = (weather_data.get("part107_compliance") or {}).get("overall_status") or "UNKNOWN"
-    overall_wx = str(overall_wx).upper()
+@lru_cache(maxsize=DECISION_CACHE_SIZE)
+def _decide_by_key(version: str, key: RuleKey, airspace_class: str) -> Decision:
+    ruleset = RULESETS[version]
+    return _materialize(ruleset.outcomes[key], airspace_class, ruleset.disclaimers, shared=True)
 
-    if overall_wx == "GOOD":
-        checklist.append(
-            {"category": "Weather", "item": "Weather advisory check completed", "required": True, "status": "OK"}
-        )
-    elif overall_wx == "MARGINAL":
-        checklist.append(
-            {
-                "category": "Weather",
-                "item": "Weather appears marginal (verification required)",
-                "required": True,
-                "status": "ACTION_NEEDED",
-            }
-        )
-        rationale.append("Weather advisory indicates marginal conditions.")
-        required_actions.append("Verify weather at flight time using authoritative sources.")
-    else:
-        checklist.append(
-            {
-                "category": "Weather",
-                "item": "Weather status unknown (verification required)",
-                "required": True,
-                "status": "UNKNOWN",
-            }
+
+def decide_preflight_cached(
+    mission_type: str,
+    airspace_data: dict[str, Any],
+    weather_data: dict[str, Any],
+    tfr_data: dict[str, Any],
+    ruleset_version: str | None = None,
+) -> Decision:
+    """
+    decide_preflight behind a bounded LRU keyed only on what the rules read:
+    the ruleset version, the four input categories and the airspace class text.
+
+    Returns a shared, fully immutable Decision (tuples instead of lists) with the
+    same values as decide_preflight. Hit rates: decision_cache_stats().
+    """
+    key, airspace_class = _categorize(airspace_data, weather_data, tfr_data)
+    return _decide_by_key(ruleset_version or DEFAULT_RULESET_VERSION, key, airspace_class)
+
+
+def decision_cache_stats() -> dict[str, Any]:
+    info = _decide_by_key.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else None,
+    }
+
+
+# -------------------------
+# Batch (columnar) evaluation
+# -------------------------
+@dataclass
+class DecisionBatch:
+    """
+    Columnar results of decide_preflight_batch. Per-item Decision objects are only
+    built on request via decision()/decisions().
+    """
+
+    overall_status: list[Status]
+    checklist_codes: list[ChecklistCodes]
+    _keys: list[RuleKey]
+    _airspace_class: list[str]
+    _ruleset: CompiledRuleSet
+
+    def __len__(self) -> int:
+        return len(self.overall_status)
+
+    def decision(self, i: int) -> Decision:
+        return _materialize(
+            self._ruleset.outcomes[self._keys[i]], self._airspace_class[i], self._ruleset.disclaimers
         )
-        rationale.append("Weather data was incomplete or could not be evaluated.")
-
-    # -------------------------
-    # Decide overall status (conservative)
-    # -------------------------
-    if tfr_status == "DO_NOT_FLY":
-        overall = "NO_GO"
-    elif "unknown" in [airspace_class.lower()] or laanc_required is None or overall_wx == "UNKNOWN" or tfr_status == "UNKNOWN":
-        overall = "GO_WITH_CONDITIONS"
-    else:
-        # Still conservative: if any ACTION_NEEDED exists, downgrade.
-        any_action_needed = any(item.get("status") == "ACTION_NEEDED" for item in checklist)
-        overall = "GO_WITH_CONDITIONS" if any_action_needed else "GO"
 
-    return Decision(
-        overall_status=overall,
-        required_actions=required_actions,
-        checklist_items=checklist,
-        rationale=rationale,
-        disclaimers=disclaimers,
+    def decisions(self, indices: Sequence[int] | None = None) -> list[Decision]:
+        return [self.decision(i) for i in (range(len(self)) if indices is None else indices)]
+
+    def to_dict(self, i: int) -> dict[str, Any]:
+        """
+        Row i in the API "checklist" shape, built straight from the compiled
+        outcome. Rows with the same outcome share their tuples.
+        """
+        return _materialize(
+            self._ruleset.outcomes[self._keys[i]], self._airspace_class[i], self._ruleset.disclaimers, shared=True
+        ).to_dict()
+
+    def dicts(self) -> Iterator[dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.to_dict(i)
+
+
+def decide_preflight_batch(
+    tfr_status: Sequence[Any],
+    laanc_required: Sequence[Any],
+    airspace_class: Sequence[Any],
+    weather_status: Sequence[Any],
+    ruleset_version: str | None = None,
+) -> DecisionBatch:
+    """
+    Evaluate many sites at once from columnar inputs.
+
+    Each column holds the raw value decide_preflight would read for that site:
+    tfr_data["status"], airspace_data["laanc_required"], airspace_data["airspace_class"]
+    and weather_data["part107_compliance"]["overall_status"]. overall_status and
+    checklist codes match decide_preflight exactly for every row.
+    """
+    n = len(tfr_status)
+    if not (len(laanc_required) == len(airspace_class) == len(weather_status) == n):
+        raise ValueError("decide_preflight_batch: all input columns must have the same length.")
+
+    ruleset = RULESETS[ruleset_version or DEFAULT_RULESET_VERSION]
+    classes = [_class_text(v) for v in airspace_class]
+    keys = list(map(_rule_key, tfr_status, laanc_required, classes, weather_status))
+    outcomes = [ruleset.outcomes[k] for k in keys]
+    return DecisionBatch(
+        overall_status=[o.overall_status for o in outcomes],
+        checklist_codes=[o.checklist_codes for o in outcomes],
+        _keys=keys,
+        _airspace_class=classes,
+        _ruleset=ruleset,
     )
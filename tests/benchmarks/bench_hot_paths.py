@@ -0,0 +1,253 @@
+"""
+Microbenchmarks for the hot pure functions, run over recorded upstream payloads
+in tests/fixtures. Reports ops/sec and bytes allocated per call, and compares
+them against tests/benchmarks/baseline.json.
+
+Run from the repo root:
+    python -m tests.benchmarks.bench_hot_paths                    # compare, exit 1 on regression
+    python -m tests.benchmarks.bench_hot_paths --update-baseline  # re-record the baseline
+    python -m tests.benchmarks.bench_hot_paths --only tfr_parse_body
+
+Raw ops/sec depends on the machine, so it is only printed for information. The
+gate uses relative_ops instead: each case's throughput divided by that of a fixed
+pure-Python calibration loop timed right before it, on the same machine. That
+ratio carries over between machines far better than raw ops/sec. Allocation
+counts are stable for a given Python version and are gated as well.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from apps.server.services.airport_database import find_nearest_airport
+from apps.server.services.faa_airspace import _pick_best_feature
+from apps.server.services.faa_tfr import (
+    _extract_first_json_array,
+    _parse_faa_tfr_body_to_list,
+    filter_tfrs_by_state,
+)
+from apps.server.services.nws_weather import (
+    ForecastTimeline,
+    _parse_forecast_period,
+    _parse_observation,
+)
+from packages.core.rules import decide_preflight
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Allowed slowdown (relative_ops) and growth (bytes/call) before a case counts as a regression.
+DEFAULT_OPS_TOLERANCE = 0.25
+DEFAULT_BYTES_TOLERANCE = 0.10
+
+# Each timing repeat runs for at least this long; the best repeat is reported.
+MIN_REPEAT_S = 0.2
+REPEATS = 3
+
+
+def _text(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _json(name: str) -> Any:
+    return json.loads(_text(name))
+
+
+def _cases() -> dict[str, Callable[[], Any]]:
+    """
+    Zero-argument callables keyed by case name. Fixture loading happens here,
+    outside the measured calls.
+    """
+    tfr_html = _text("faa_tfr_export.html")
+    tfr_list = _parse_faa_tfr_body_to_list(tfr_html)
+    observation = _json("nws_observation_latest.json")
+    periods = _json("nws_forecast.json")["properties"]["periods"]
+    # Late in the forecast. The timeline is built once, as the callers that
+    # evaluate many hours do.
+    target = datetime.fromisoformat(periods[-3]["startTime"])
+    period = periods[-3]
+    timeline = ForecastTimeline(periods)
+    class_features = _json("arcgis_class_airspace.json")["features"]
+    uasfm_features = _json("arcgis_uasfm.json")["features"]
+    airspace_data = {
+        "airspace_class": "Class B",
+        "laanc_required": True,
+        "laanc_available": True,
+        "max_altitude_ft": 100,
+    }
+    weather_data = {"part107_compliance": {"overall_status": "MARGINAL"}}
+    tfr_data = {"status": "CLEAR", "tfr_count": 0}
+
+    return {
+        "tfr_extract_json_array": lambda: _extract_first_json_array(tfr_html),
+        "tfr_parse_body": lambda: _parse_faa_tfr_body_to_list(tfr_html),
+        "tfr_filter_by_state": lambda: filter_tfrs_by_state(tfr_list, "CA"),
+        "nws_parse_observation": lambda: _parse_observation(observation, "KSFO"),
+        "nws_timeline_forecast_at": lambda: timeline.forecast_at(target),
+        "nws_parse_forecast_period": lambda: _parse_forecast_period(period, target),
+        # Inside the SFO radius, then a point with no airport in range (full scan).
+        "airport_find_nearest_hit": lambda: find_nearest_airport(37.6, -122.4),
+        "airport_find_nearest_miss": lambda: find_nearest_airport(39.5, -111.5),
+        "arcgis_pick_best_feature_class": lambda: _pick_best_feature(class_features),
+        "arcgis_pick_best_feature_uasfm": lambda: _pick_best_feature(uasfm_features),
+        "rules_decide_preflight": lambda: decide_preflight(
+            mission_type="part107",
+            airspace_data=airspace_data,
+            weather_data=weather_data,
+            tfr_data=tfr_data,
+        ),
+    }
+
+
+def _ops_per_sec(fn: Callable[[], Any]) -> float:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_REPEAT_S:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def _calibration_loop() -> None:
+    # Fixed interpreter work of the same kind as the cases: dict building, string
+    # formatting and joining, sorting with a key function.
+    values = {f"k{i}": i * 1.5 for i in range(64)}
+    ",".join(f"{k}={v:.1f}" for k, v in values.items())
+    sorted(values.items(), key=lambda kv: -kv[1])
+
+
+def _bytes_per_call(fn: Callable[[], Any], n: int = 200) -> float:
+    """
+    Bytes allocated per call, measured while keeping every result alive.
+    """
+    fn()  # warm lazily built module state (compiled regexes, lru caches)
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        results = [fn() for _ in range(n)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return (after - before) / n
+
+
+def run(only: list[str] | None = None) -> dict[str, dict[str, float]]:
+    report: dict[str, dict[str, float]] = {}
+    for name, fn in _cases().items():
+        if only and name not in only:
+            continue
+        calibration = _ops_per_sec(_calibration_loop)
+        ops = _ops_per_sec(fn)
+        # tracemalloc slows calls down a lot; keep the slow cases to ~50ms of untraced work.
+        n = max(5, min(200, int(ops * 0.05)))
+        report[name] = {
+            "ops_per_sec": round(ops, 1),
+            "relative_ops": round(ops / calibration, 4),
+            "bytes_per_call": round(_bytes_per_call(fn, n), 1),
+        }
+    return report
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_baseline(report: dict[str, dict[str, float]], path: Path = BASELINE_PATH) -> None:
+    data = {"python": platform.python_version(), "cases": report}
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def compare(
+    report: dict[str, dict[str, float]],
+    baseline: dict[str, Any],
+    ops_tolerance: float = DEFAULT_OPS_TOLERANCE,
+    bytes_tolerance: float = DEFAULT_BYTES_TOLERANCE,
+) -> list[str]:
+    """
+    Returns one message per regression (empty list = pass). Throughput is gated
+    on relative_ops only; raw ops_per_sec is never compared. Cases missing from
+    the baseline are not compared.
+    """
+    regressions: list[str] = []
+    for name, stats in report.items():
+        base = (baseline.get("cases") or {}).get(name)
+        if not base:
+            continue
+        if "relative_ops" in base:
+            floor = base["relative_ops"] * (1.0 - ops_tolerance)
+            if stats["relative_ops"] < floor:
+                regressions.append(
+                    f"{name}: {stats['relative_ops']:.4g}x calibration < {floor:.4g}x "
+                    f"(baseline {base['relative_ops']:.4g}x, tolerance {ops_tolerance:.0%})"
+                )
+        # Small absolute slack so near-zero allocations do not flap.
+        ceiling = base["bytes_per_call"] * (1.0 + bytes_tolerance) + 64
+        if stats["bytes_per_call"] > ceiling:
+            regressions.append(
+                f"{name}: {stats['bytes_per_call']:,.0f} B/call > {ceiling:,.0f} "
+                f"(baseline {base['bytes_per_call']:,.0f}, tolerance {bytes_tolerance:.0%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--only", action="append", help="case name (repeatable)")
+    parser.add_argument("--ops-tolerance", type=float, default=DEFAULT_OPS_TOLERANCE)
+    parser.add_argument("--bytes-tolerance", type=float, default=DEFAULT_BYTES_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run(args.only)
+    baseline = load_baseline() if BASELINE_PATH.exists() else {}
+    base_cases = baseline.get("cases") or {}
+    for name, stats in report.items():
+        base = base_cases.get(name)
+        delta = f"  ({stats['relative_ops'] / base['relative_ops'] - 1.0:+.1%} vs baseline)" if base and "relative_ops" in base else ""
+        print(
+            f"{name:>32}: {stats['ops_per_sec']:>12,.0f} ops/s  {stats['relative_ops']:>10.4g}x calibration"
+            f"  {stats['bytes_per_call']:>10,.0f} B/call{delta}"
+        )
+
+    if args.update_baseline:
+        if args.only:
+            report = {**base_cases, **report}
+        save_baseline(report)
+        print(f"Wrote {BASELINE_PATH}")
+        return 0
+
+    if baseline and baseline.get("python") != platform.python_version():
+        print(f"note: baseline recorded on Python {baseline.get('python')}, running {platform.python_version()}")
+
+    regressions = compare(report, baseline, args.ops_tolerance, args.bytes_tolerance)
+    for msg in regressions:
+        print(f"REGRESSION {msg}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
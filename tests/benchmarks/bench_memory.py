@@ -0,0 +1,168 @@
+"""
+Memory held by bulk results: dict-backed dataclasses (the previous definitions)
+vs the slotted classes vs the column containers.
+
+Run from the repo root:
+    python -m tests.benchmarks.bench_memory [n]
+"""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import cycle, islice, product
+from typing import Any
+
+from apps.server.services.airport_database import AIRPORTS, Airport
+from apps.server.services.faa_airspace import AirspaceResult, AirspaceResultBatch
+from packages.core.rules import decide_preflight, decide_preflight_batch
+
+
+# Previous (dict-backed) definitions, for comparison.
+@dataclass
+class DictAirport:
+    icao: str
+    name: str
+    lat: float
+    lon: float
+    airspace_class: str
+    radius_nm: float
+    ceiling_ft: int
+
+
+@dataclass
+class DictAirspaceResult:
+    airspace_class: str
+    airspace_name: str | None
+    laanc_required: bool | None
+    laanc_available: bool | None
+    max_altitude_ft: int | None
+    facility: str | None
+    restrictions: list[str]
+    raw: dict[str, Any]
+    debug: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class DictDecision:
+    overall_status: str
+    required_actions: list[str]
+    checklist_items: list[dict[str, Any]]
+    rationale: list[str]
+    disclaimers: list[str]
+
+
+_CLASSES = ("Class B", "Class C", "Class D", "Class G")
+
+
+def _airspace_fields(i: int) -> dict[str, Any]:
+    # What analyze_airspace returns for a point along a corridor: a few distinct
+    # classes and facilities, a fresh restrictions list, small raw/debug dicts.
+    controlled = i % 4 != 3
+    return {
+        "airspace_class": _CLASSES[i % 4],
+        "airspace_name": None,
+        "laanc_required": controlled,
+        "laanc_available": controlled or None,
+        "max_altitude_ft": (i % 5) * 100 if controlled else None,
+        "facility": f"K{i % 40:03d}" if controlled else None,
+        "restrictions": [
+            "Controlled airspace indicated: authorization required prior to flight (often via LAANC).",
+            f"UAS Facility Map (UASFM) ceiling guideline: {(i % 5) * 100} ft AGL.",
+        ]
+        if controlled
+        else ["No controlled airspace indicated by this checker; still verify local restrictions and TFRs."],
+        "raw": {"class_airspace": {"features": []}, "uasfm": {"features": []}},
+        "debug": {"fallback_used": None},
+    }
+
+
+def _points(n: int) -> list[tuple[float, float, int]]:
+    return [(37.0 + i * 1e-4, -122.0 - i * 1e-4, 200 + i % 3 * 50) for i in range(n)]
+
+
+def _decision_inputs(n: int) -> list[tuple[str, Any, str, str]]:
+    combos = list(product(["CLEAR", "UNKNOWN"], [True, False, None], _CLASSES, ["GOOD", "MARGINAL"]))
+    return list(islice(cycle(combos), n))
+
+
+def _decide(tfr: str, laanc: Any, airspace_class: str, wx: str) -> Any:
+    return decide_preflight(
+        "part107_commercial",
+        {"airspace_class": airspace_class, "laanc_required": laanc},
+        {"part107_compliance": {"overall_status": wx}},
+        {"status": tfr},
+    )
+
+
+def _cases(n: int) -> dict[str, Callable[[], Any]]:
+    airports = list(islice(cycle(AIRPORTS), n))
+    airport_fields = [(a.icao, a.name, a.lat, a.lon, a.airspace_class, a.radius_nm, a.ceiling_ft) for a in airports]
+    points = _points(n)
+    inputs = _decision_inputs(n)
+
+    def airspace_batch() -> AirspaceResultBatch:
+        batch = AirspaceResultBatch()
+        for i, (lat, lon, alt) in enumerate(points):
+            batch.append(AirspaceResult(**_airspace_fields(i)), lat, lon, alt)
+        return batch
+
+    def decisions_dict() -> list[DictDecision]:
+        out = []
+        for args in inputs:
+            d = _decide(*args)
+            out.append(
+                DictDecision(
+                    d.overall_status, d.required_actions, d.checklist_items, d.rationale, d.disclaimers
+                )
+            )
+        return out
+
+    return {
+        "airport_dict": lambda: [DictAirport(*f) for f in airport_fields],
+        "airport_slots": lambda: [Airport(*f) for f in airport_fields],
+        "airspace_dict": lambda: [DictAirspaceResult(**_airspace_fields(i)) for i in range(n)],
+        "airspace_slots": lambda: [AirspaceResult(**_airspace_fields(i)) for i in range(n)],
+        "airspace_batch": airspace_batch,
+        "decision_dict": decisions_dict,
+        "decision_slots": lambda: [_decide(*args) for args in inputs],
+        "decision_batch": lambda: decide_preflight_batch(*map(list, zip(*inputs, strict=True))),
+    }
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    """
+    Bytes still allocated once `build` returns, i.e. held by its result.
+    """
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def run(n: int = 100_000) -> dict[str, dict[str, float]]:
+    report: dict[str, dict[str, float]] = {}
+    for name, build in _cases(n).items():
+        total = retained_bytes(build)
+        report[name] = {"bytes_total": total, "bytes_per_result": total / n}
+    return report
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    report = run(n)
+    print(f"{n:,} results each")
+    for name, stats in report.items():
+        kind = name.rsplit("_", 1)[0]
+        base = report[f"{kind}_dict"]["bytes_total"]
+        print(
+            f"{name:>15}: {stats['bytes_total'] / 2**20:>8.1f} MiB  {stats['bytes_per_result']:>7,.0f} B/result"
+            f"  x{stats['bytes_total'] / base:.2f}"
+        )
@@ -0,0 +1,80 @@
+"""
+Rules engine microbenchmark: compiled decide_preflight vs the reference implementation.
+
+Run from the repo root:
+    python -m tests.benchmarks.bench_rules
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections.abc import Callable
+from itertools import cycle, islice, product
+from typing import Any
+
+from packages.core.rules import decide_preflight
+from tests.benchmarks.reference_rules import reference_decide_preflight
+
+
+def _inputs() -> list[dict[str, Any]]:
+    return [
+        {
+            "mission_type": "recreational",
+            "airspace_data": {"airspace_class": airspace_class, "laanc_required": laanc},
+            "weather_data": {"part107_compliance": {"overall_status": wx}},
+            "tfr_data": {"status": tfr},
+        }
+        for tfr, laanc, airspace_class, wx in product(
+            ["CLEAR", "DO_NOT_FLY", "UNKNOWN"],
+            [True, False, None],
+            ["Class B", "Class G", "Unknown"],
+            ["GOOD", "MARGINAL", "UNKNOWN"],
+        )
+    ]
+
+
+def _ops_per_sec(fn: Callable[..., Any], inputs: list[dict[str, Any]], n: int) -> float:
+    batch = list(islice(cycle(inputs), n))
+    start = time.perf_counter()
+    for kwargs in batch:
+        fn(**kwargs)
+    return n / (time.perf_counter() - start)
+
+
+def _bytes_per_call(fn: Callable[..., Any], inputs: list[dict[str, Any]], n: int) -> float:
+    """
+    Bytes allocated per call, measured while keeping every result alive.
+    """
+    batch = list(islice(cycle(inputs), n))
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        results = [fn(**kwargs) for kwargs in batch]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return (after - before) / n
+
+
+def run(n: int = 50_000) -> dict[str, dict[str, float]]:
+    inputs = _inputs()
+    report: dict[str, dict[str, float]] = {}
+    for name, fn in (("reference", reference_decide_preflight), ("compiled", decide_preflight)):
+        report[name] = {
+            "ops_per_sec": _ops_per_sec(fn, inputs, n),
+            "bytes_per_call": _bytes_per_call(fn, inputs, n // 10),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    report = run()
+    for name, stats in report.items():
+        print(f"{name:>10}: {stats['ops_per_sec']:>12,.0f} ops/s  {stats['bytes_per_call']:>8,.0f} B/call")
+    ref, new = report["reference"], report["compiled"]
+    print(
+        f"speedup x{new['ops_per_sec'] / ref['ops_per_sec']:.2f}, "
+        f"allocation x{new['bytes_per_call'] / ref['bytes_per_call']:.2f}"
+    )
@@ -0,0 +1,100 @@
+"""
+Re-record the upstream payloads in tests/fixtures from the live services.
+
+Run from the repo root (needs network access):
+    python -m tests.benchmarks.record_fixtures [lat lon]
+
+After re-recording, refresh the benchmark baseline:
+    python -m tests.benchmarks.bench_hot_paths --update-baseline
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from apps.server.services.faa_airspace import (
+    CLASS_AIRSPACE_LAYER_URL,
+    DEFAULT_UA,
+    UASFM_LAYER_URL,
+    _arcgis_point_geometry,
+)
+from apps.server.services.faa_tfr import FAA_TFR_JSON_URL
+from apps.server.services.nws_weather import NWS_BASE
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+# San Francisco: inside Class B, with UAS facility map grids and several ASOS stations nearby.
+DEFAULT_LAT = 37.7749
+DEFAULT_LON = -122.4194
+
+
+def _arcgis_params(lat: float, lon: float) -> dict[str, Any]:
+    return {
+        "f": "json",
+        "where": "1=1",
+        "geometryType": "esriGeometryPoint",
+        "geometry": _arcgis_point_geometry(lat, lon),
+        "inSR": "4326",
+        "outSR": "4326",
+        "spatialRel": "esriSpatialRelIntersects",
+        "outFields": "*",
+        "returnGeometry": "false",
+        "resultRecordCount": "10",
+    }
+
+
+def _write_json(name: str, data: Any) -> None:
+    with open(FIXTURES / name, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=1)
+    print(f"Wrote {name}")
+
+
+async def record(lat: float, lon: float) -> None:
+    headers = {"User-Agent": DEFAULT_UA, "Accept": "application/geo+json"}
+    async with httpx.AsyncClient(timeout=30.0, headers=headers, follow_redirects=True) as client:
+        r = await client.get(FAA_TFR_JSON_URL)
+        r.raise_for_status()
+        (FIXTURES / "faa_tfr_export.html").write_text(r.text, encoding="utf-8")
+        print("Wrote faa_tfr_export.html")
+
+        for name, url in (
+            ("arcgis_class_airspace.json", CLASS_AIRSPACE_LAYER_URL),
+            ("arcgis_uasfm.json", UASFM_LAYER_URL),
+        ):
+            r = await client.get(url, params=_arcgis_params(lat, lon))
+            r.raise_for_status()
+            _write_json(name, r.json())
+
+        r = await client.get(f"{NWS_BASE}/points/{lat:.4f},{lon:.4f}")
+        r.raise_for_status()
+        points = r.json()
+        _write_json("nws_points.json", points)
+        props = points["properties"]
+
+        r = await client.get(props["observationStations"])
+        r.raise_for_status()
+        stations = r.json()
+        _write_json("nws_stations.json", stations)
+
+        station_id = stations["features"][0]["properties"]["stationIdentifier"]
+        r = await client.get(f"{NWS_BASE}/stations/{station_id}/observations/latest")
+        r.raise_for_status()
+        _write_json("nws_observation_latest.json", r.json())
+
+        r = await client.get(props["forecast"])
+        r.raise_for_status()
+        _write_json("nws_forecast.json", r.json())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        lat, lon = float(sys.argv[1]), float(sys.argv[2])
+    else:
+        lat, lon = DEFAULT_LAT, DEFAULT_LON
+    asyncio.run(record(lat, lon))
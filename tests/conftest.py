@@ -4,3 +4,22 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_upstream_resilience():
+    # Breakers, retry budgets, rate limiters, admission gates and latency history are
+    # process-wide; isolate tests.
+    from apps.server.services.admission import reset_admission
+    from apps.server.services.ratelimit import reset_rate_limits
+    from apps.server.services.resilience import reset_resilience
+
+    reset_resilience()
+    reset_rate_limits()
+    reset_admission()
+    yield
+    reset_resilience()
+    reset_rate_limits()
+    reset_admission()
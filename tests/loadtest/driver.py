@@ -0,0 +1,189 @@
+"""
+Load driver: keeps a target number of requests in flight against a running app
+and reports throughput and p50/p95/p99 latency per endpoint.
+
+Run from the repo root, with the app pointed at tests.loadtest.stub_upstreams:
+    python -m tests.loadtest.driver --base-url http://127.0.0.1:8000 --concurrency 32 --duration 30
+    python -m tests.loadtest.driver --endpoint preflight_realtime --endpoint check_tfrs --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import httpx
+
+# Recorded fixtures are around San Francisco; requests are scattered around it.
+CENTER_LAT = 37.7749
+CENTER_LON = -122.4194
+
+
+def _iso_in(hours: float) -> str:
+    return (datetime.now(UTC) + timedelta(hours=hours)).isoformat()
+
+
+# name -> (path, payload builder taking (lat, lon))
+ENDPOINTS: dict[str, tuple[str, Callable[[float, float], dict[str, Any]]]] = {
+    "preflight_realtime": (
+        "/api/preflight",
+        lambda lat, lon: {"latitude": lat, "longitude": lon, "altitude_ft": 200, "flight_datetime": _iso_in(1)},
+    ),
+    "preflight_forecast": (
+        "/api/preflight",
+        lambda lat, lon: {"latitude": lat, "longitude": lon, "altitude_ft": 200, "flight_datetime": _iso_in(48)},
+    ),
+    "launch_windows": (
+        "/api/launch_windows",
+        lambda lat, lon: {"latitude": lat, "longitude": lon, "altitude_ft": 200, "hours": 24},
+    ),
+    "check_airspace": (
+        "/tools/check_airspace",
+        lambda lat, lon: {"latitude": lat, "longitude": lon, "altitude_ft_agl": 200, "flight_datetime": _iso_in(1)},
+    ),
+    "analyze_weather": (
+        "/tools/analyze_weather_conditions",
+        lambda lat, lon: {"latitude": lat, "longitude": lon, "flight_datetime": _iso_in(1)},
+    ),
+    "check_tfrs": (
+        "/tools/check_tfrs",
+        lambda lat, lon: {"latitude": lat, "longitude": lon, "flight_datetime": _iso_in(1)},
+    ),
+}
+
+DEFAULT_ENDPOINTS = ("preflight_realtime", "preflight_forecast")
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[str, int] = field(default_factory=dict)
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """
+    Nearest-rank percentile of an unsorted list (None if empty).
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(stats: dict[str, EndpointStats], elapsed_s: float) -> dict[str, dict[str, Any]]:
+    summary: dict[str, dict[str, Any]] = {}
+    for name, st in stats.items():
+        lat = st.latencies_ms
+        summary[name] = {
+            "requests": len(lat),
+            "errors": st.errors,
+            "throughput_rps": round(len(lat) / elapsed_s, 2) if elapsed_s > 0 else None,
+            "p50_ms": percentile(lat, 50),
+            "p95_ms": percentile(lat, 95),
+            "p99_ms": percentile(lat, 99),
+            "max_ms": max(lat) if lat else None,
+            "statuses": dict(sorted(st.statuses.items())),
+        }
+    return summary
+
+
+async def run_load(
+    base_url: str,
+    endpoints: list[str],
+    concurrency: int,
+    duration_s: float,
+    spread_deg: float = 0.05,
+    timeout_s: float = 60.0,
+    seed: int | None = None,
+) -> tuple[dict[str, dict[str, Any]], float]:
+    """
+    Runs `concurrency` workers for duration_s, each cycling through `endpoints`.
+    Returns (per-endpoint summary, elapsed seconds).
+    """
+    rng = random.Random(seed)
+    stats = {name: EndpointStats() for name in endpoints}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout_s, limits=limits) as client:
+        start = time.perf_counter()
+        deadline = start + duration_s
+
+        async def _worker(offset: int) -> None:
+            i = offset
+            while time.perf_counter() < deadline:
+                name = endpoints[i % len(endpoints)]
+                i += 1
+                path, build = ENDPOINTS[name]
+                lat = CENTER_LAT + rng.uniform(-spread_deg, spread_deg)
+                lon = CENTER_LON + rng.uniform(-spread_deg, spread_deg)
+                st = stats[name]
+                t0 = time.perf_counter()
+                try:
+                    r = await client.post(path, json=build(round(lat, 4), round(lon, 4)))
+                    status = str(r.status_code)
+                    if r.status_code >= 400:
+                        st.errors += 1
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                    st.errors += 1
+                st.latencies_ms.append((time.perf_counter() - t0) * 1000.0)
+                st.statuses[status] = st.statuses.get(status, 0) + 1
+
+        await asyncio.gather(*(_worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return summarize(stats, elapsed), elapsed
+
+
+def _fmt(ms: float | None) -> str:
+    return "-" if ms is None else f"{ms:,.1f}"
+
+
+def print_report(summary: dict[str, dict[str, Any]], elapsed_s: float, concurrency: int) -> None:
+    print(f"concurrency={concurrency} elapsed={elapsed_s:.1f}s")
+    print(f"{'endpoint':>20} {'reqs':>7} {'err':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, s in summary.items():
+        print(
+            f"{name:>20} {s['requests']:>7} {s['errors']:>5} {s['throughput_rps'] or 0:>8.1f} "
+            f"{_fmt(s['p50_ms']):>9} {_fmt(s['p95_ms']):>9} {_fmt(s['p99_ms']):>9} {_fmt(s['max_ms']):>9}"
+        )
+        if s["errors"]:
+            print(f"{'':>20} statuses: {s['statuses']}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", action="append", choices=sorted(ENDPOINTS), help="repeatable")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--spread-deg", type=float, default=0.05, help="random offset around the fixture location")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    endpoints = args.endpoint or list(DEFAULT_ENDPOINTS)
+    summary, elapsed = asyncio.run(
+        run_load(args.base_url, endpoints, args.concurrency, args.duration, args.spread_deg, args.timeout, args.seed)
+    )
+    if args.json:
+        print(json.dumps({"concurrency": args.concurrency, "elapsed_s": round(elapsed, 2), "endpoints": summary}))
+    else:
+        print_report(summary, elapsed, args.concurrency)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Local stand-in for the FAA ArcGIS FeatureServer layers, api.weather.gov and
+tfr.faa.gov. Replays the recorded payloads in tests/fixtures with configurable
+latency, jitter and error rate, so /api/preflight can be load-tested without
+touching the real services.
+
+Run from the repo root:
+    python -m tests.loadtest.stub_upstreams --port 9100 --latency-ms 80 --jitter-ms 40 --error-rate 0.01
+
+then start the app pointed at it (the stub prints the exact variables):
+    UASFM_LAYER_URL=http://127.0.0.1:9100/arcgis/uasfm/query \\
+    CLASS_AIRSPACE_LAYER_URL=http://127.0.0.1:9100/arcgis/class_airspace/query \\
+    NWS_BASE=http://127.0.0.1:9100/nws \\
+    FAA_TFR_JSON_URL=http://127.0.0.1:9100/tfr/export/json \\
+    python -m uvicorn apps.server.main:app --port 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+# Upstream groups; latency/error settings can be overridden per group.
+UPSTREAMS = ("arcgis", "nws", "tfr")
+
+RECORDED_NWS_BASE = "https://api.weather.gov"
+
+
+@dataclass
+class UpstreamProfile:
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+    # Fraction of requests that hang for hang_ms (exercises client timeouts).
+    hang_rate: float = 0.0
+    hang_ms: float = 30_000.0
+
+
+@dataclass
+class StubConfig:
+    profiles: dict[str, UpstreamProfile] = field(default_factory=lambda: {u: UpstreamProfile() for u in UPSTREAMS})
+    seed: int | None = None
+
+
+def _load_json(name: str) -> Any:
+    with open(FIXTURES / name, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _rebase(data: Any, base: str) -> Any:
+    """
+    Rewrite recorded api.weather.gov URLs so follow-up requests come back to the stub.
+    """
+    return json.loads(json.dumps(data).replace(RECORDED_NWS_BASE, base))
+
+
+def _shift_forecast(forecast: dict[str, Any], now: datetime) -> dict[str, Any]:
+    """
+    Move the recorded periods so the first one starts at the current hour
+    (keeping the recorded UTC offset), and stamp the update time as now.
+    """
+    out = copy.deepcopy(forecast)
+    periods = out["properties"]["periods"]
+    if not periods:
+        return out
+    first = datetime.fromisoformat(periods[0]["startTime"])
+    delta = now.replace(minute=0, second=0, microsecond=0) - first.astimezone(UTC)
+    for period in periods:
+        for key in ("startTime", "endTime"):
+            period[key] = (datetime.fromisoformat(period[key]) + delta).isoformat()
+    out["properties"]["updateTime"] = now.isoformat()
+    out["properties"]["generatedAt"] = now.isoformat()
+    return out
+
+
+def create_stub_app(config: StubConfig | None = None) -> FastAPI:
+    config = config or StubConfig()
+    rng = random.Random(config.seed)
+
+    uasfm = _load_json("arcgis_uasfm.json")
+    class_airspace = _load_json("arcgis_class_airspace.json")
+    points = _load_json("nws_points.json")
+    stations = _load_json("nws_stations.json")
+    observation = _load_json("nws_observation_latest.json")
+    forecast = _load_json("nws_forecast.json")
+    tfr_body = (FIXTURES / "faa_tfr_export.html").read_text(encoding="utf-8")
+
+    app = FastAPI(title="drone-ops-compliance upstream stub")
+    app.state.config = config
+    app.state.requests = {u: 0 for u in UPSTREAMS}
+    app.state.errors = {u: 0 for u in UPSTREAMS}
+
+    @app.middleware("http")
+    async def _inject_latency_and_errors(request: Request, call_next):
+        upstream = request.url.path.strip("/").split("/", 1)[0]
+        profile = config.profiles.get(upstream)
+        if profile is None:
+            return await call_next(request)
+
+        app.state.requests[upstream] += 1
+        delay_ms = max(0.0, profile.latency_ms + rng.uniform(-profile.jitter_ms, profile.jitter_ms))
+        if profile.hang_rate and rng.random() < profile.hang_rate:
+            delay_ms = profile.hang_ms
+        await asyncio.sleep(delay_ms / 1000.0)
+
+        if profile.error_rate and rng.random() < profile.error_rate:
+            app.state.errors[upstream] += 1
+            return JSONResponse(status_code=503, content={"error": "injected upstream failure"})
+        return await call_next(request)
+
+    def _nws_base(request: Request) -> str:
+        return str(request.base_url).rstrip("/") + "/nws"
+
+    @app.get("/arcgis/uasfm/query")
+    async def arcgis_uasfm() -> dict[str, Any]:
+        return uasfm
+
+    @app.get("/arcgis/class_airspace/query")
+    async def arcgis_class_airspace() -> dict[str, Any]:
+        return class_airspace
+
+    @app.get("/tfr/export/json")
+    async def tfr_export() -> HTMLResponse:
+        # The real endpoint serves JSON wrapped in HTML with a text/html content type.
+        return HTMLResponse(tfr_body)
+
+    @app.get("/nws/points/{coords}")
+    async def nws_points(coords: str, request: Request) -> JSONResponse:
+        body = _rebase(points, _nws_base(request))
+        body["id"] = body["properties"]["@id"] = f"{_nws_base(request)}/points/{coords}"
+        return JSONResponse(body, media_type="application/geo+json")
+
+    @app.get("/nws/gridpoints/{office}/{grid}/stations")
+    async def nws_stations(office: str, grid: str, request: Request) -> JSONResponse:
+        return JSONResponse(_rebase(stations, _nws_base(request)), media_type="application/geo+json")
+
+    @app.get("/nws/gridpoints/{office}/{grid}/forecast")
+    async def nws_forecast(office: str, grid: str) -> JSONResponse:
+        return JSONResponse(_shift_forecast(forecast, datetime.now(UTC)), media_type="application/geo+json")
+
+    @app.get("/nws/stations/{station_id}/observations/latest")
+    async def nws_observation(station_id: str, request: Request) -> JSONResponse:
+        body = _rebase(observation, _nws_base(request))
+        now = datetime.now(UTC).replace(microsecond=0) - timedelta(minutes=5)
+        body["properties"]["timestamp"] = now.isoformat()
+        body["properties"]["station"] = f"{_nws_base(request)}/stations/{station_id}"
+        return JSONResponse(body, media_type="application/geo+json")
+
+    @app.get("/stats")
+    async def stats() -> dict[str, Any]:
+        return {"requests": app.state.requests, "errors": app.state.errors}
+
+    @app.get("/{path:path}")
+    async def not_recorded(path: str) -> Response:
+        return JSONResponse(status_code=404, content={"error": f"no recorded response for /{path}"})
+
+    return app
+
+
+def app_environment(host: str, port: int) -> dict[str, str]:
+    """
+    Environment variables that point the app's upstream clients at a stub on host:port.
+    """
+    base = f"http://{host}:{port}"
+    return {
+        "UASFM_LAYER_URL": f"{base}/arcgis/uasfm/query",
+        "CLASS_AIRSPACE_LAYER_URL": f"{base}/arcgis/class_airspace/query",
+        "NWS_BASE": f"{base}/nws",
+        "FAA_TFR_JSON_URL": f"{base}/tfr/export/json",
+    }
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-ms", type=float, default=30_000.0)
+    parser.add_argument("--seed", type=int, default=None)
+    for upstream in UPSTREAMS:
+        parser.add_argument(f"--{upstream}-latency-ms", type=float, default=None)
+        parser.add_argument(f"--{upstream}-error-rate", type=float, default=None)
+    return parser.parse_args(argv)
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    profiles = {}
+    for upstream in UPSTREAMS:
+        latency = getattr(args, f"{upstream}_latency_ms")
+        error_rate = getattr(args, f"{upstream}_error_rate")
+        profiles[upstream] = UpstreamProfile(
+            latency_ms=args.latency_ms if latency is None else latency,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate if error_rate is None else error_rate,
+            hang_rate=args.hang_rate,
+            hang_ms=args.hang_ms,
+        )
+    return StubConfig(profiles=profiles, seed=args.seed)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    args = _parse_args()
+    print("Point the app at this stub with:")
+    for key, value in app_environment(args.host, args.port).items():
+        print(f"  {key}={value}")
+    uvicorn.run(create_stub_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.server import main
+from apps.server.services import admission
+from apps.server.services.admission import AdmissionGate, Overloaded
+
+
+def test_parse_admission_limits():
+    assert admission.parse_admission_limits("interactive=64:32, batch=8,bad=x,off=0:4") == {
+        "interactive": (64, 32),
+        "batch": (8, 0),
+    }
+
+
+def test_gate_queues_then_sheds():
+    async def scenario():
+        gate = AdmissionGate("test", max_in_flight=1, max_queue=1, queue_timeout_s=1.0)
+        assert await gate.acquire() == 0.0
+
+        queued = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        assert gate.queued() == 1
+
+        with pytest.raises(Overloaded) as full:
+            await gate.acquire()
+        assert full.value.reason == "queue_full"
+
+        gate.release()  # hands the slot to the queued caller
+        assert await queued >= 0.0
+        assert gate.in_flight == 1 and gate.queued() == 0
+        gate.release()
+        assert gate.in_flight == 0
+        return gate.shed
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_gate_queue_timeout_and_cancellation_free_their_place():
+    async def scenario():
+        gate = AdmissionGate("test", max_in_flight=1, max_queue=2, queue_timeout_s=0.05, retry_after_s=2.5)
+        await gate.acquire()
+
+        with pytest.raises(Overloaded) as timed_out:
+            await gate.acquire()
+        assert timed_out.value.reason == "queue_timeout"
+        assert timed_out.value.retry_after_header == "3"
+
+        waiter = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert gate.queued() == 0
+
+        gate.release()
+        assert gate.in_flight == 0
+        assert await gate.acquire() == 0.0
+
+    asyncio.run(scenario())
+
+
+def _laanc(client, **headers):
+    return client.post(
+        "/tools/generate_laanc_deep_link",
+        json={
+            "latitude": 37.77,
+            "longitude": -122.42,
+            "altitude_ft_agl": 200,
+            "start_datetime": "2030-01-01T12:00:00+00:00",
+            "duration_minutes": 30,
+        },
+        headers=headers,
+    )
+
+
+def test_full_lane_sheds_with_503_and_retry_after():
+    admission.reset_admission({"interactive": (1, 0), "batch": (1, 0)})
+    gate = admission.gate_for("interactive")
+    asyncio.run(gate.acquire())  # an in-flight interactive request
+    client = TestClient(main.app)
+    shed_before = admission.ADMISSION_SHED.labels("interactive", "queue_full").value
+
+    r = _laanc(client)
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    body = r.json()
+    assert body["result"]["status"] == "ERROR"
+    assert body["meta"]["coverage"] == {"admission": "shed_queue_full", "lane": "interactive"}
+    assert admission.ADMISSION_SHED.labels("interactive", "queue_full").value == shed_before + 1
+
+    # Batch callers have their own lane.
+    assert _laanc(client, **{"X-Request-Priority": "batch"}).status_code == 200
+
+    gate.release()
+    assert _laanc(client).status_code == 200
+    assert admission.admission_stats()["interactive"] == {
+        "max_in_flight": 1,
+        "max_queue": 0,
+        "in_flight": 0,
+        "queued": 0,
+        "shed": 1,
+    }
+    assert "http_admission_shed_total" in client.get("/metrics").text
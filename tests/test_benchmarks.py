@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from tests.benchmarks import bench_memory
+from tests.benchmarks.bench_hot_paths import _cases, compare, load_baseline, run
+
+
+def test_every_case_runs_on_the_recorded_fixtures():
+    cases = _cases()
+    assert set(cases) == set(load_baseline()["cases"])
+    for name, fn in cases.items():
+        result = fn()
+        if name.startswith(("tfr_", "nws_", "arcgis_", "rules_")):
+            assert result, name
+
+    assert cases["airport_find_nearest_hit"]().icao == "KSFO"
+    assert cases["airport_find_nearest_miss"]() is None
+
+
+def test_compare_flags_slowdowns_and_allocation_growth():
+    baseline = {"cases": {"a": {"ops_per_sec": 1000.0, "relative_ops": 2.0, "bytes_per_call": 1000.0}}}
+
+    assert compare({"a": {"ops_per_sec": 800.0, "relative_ops": 1.6, "bytes_per_call": 1100.0}}, baseline) == []
+    assert compare({"new_case": {"ops_per_sec": 1.0, "relative_ops": 0.1, "bytes_per_call": 1e9}}, baseline) == []
+
+    regressions = compare({"a": {"ops_per_sec": 700.0, "relative_ops": 1.4, "bytes_per_call": 2000.0}}, baseline)
+    assert len(regressions) == 2
+    assert "calibration" in regressions[0] and "B/call" in regressions[1]
+
+
+def test_raw_throughput_is_advisory():
+    # A slower machine: raw ops/s halves, but relative to the calibration loop nothing changed.
+    baseline = {"cases": {"a": {"ops_per_sec": 1000.0, "relative_ops": 2.0, "bytes_per_call": 1000.0}}}
+    assert compare({"a": {"ops_per_sec": 500.0, "relative_ops": 2.0, "bytes_per_call": 1000.0}}, baseline) == []
+
+
+def test_compact_results_hold_less_memory():
+    report = bench_memory.run(n=2000)
+    for kind in ("airport", "airspace", "decision"):
+        assert report[f"{kind}_slots"]["bytes_total"] < report[f"{kind}_dict"]["bytes_total"], kind
+    assert report["airspace_batch"]["bytes_total"] < report["airspace_slots"]["bytes_total"] / 4
+    assert report["decision_batch"]["bytes_total"] < report["decision_slots"]["bytes_total"] / 2
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run benchmarks")
+def test_no_regression_against_baseline():
+    regressions = compare(run(), load_baseline())
+    assert regressions == [], "\n".join(regressions)
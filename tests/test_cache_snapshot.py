@@ -0,0 +1,55 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from apps.server import main
+from apps.server.services import cache_snapshot
+from apps.server.services.cache import TTLCache
+
+
+def test_snapshot_round_trip_keeps_remaining_ttl(tmp_path):
+    path = str(tmp_path / "caches.pickle")
+    hot = TTLCache("test_snapshot_hot", maxsize=8, persistent=True)
+    scratch = TTLCache("test_snapshot_scratch", maxsize=8)
+    expires_at = time.time() + 120
+    hot.set("a", {"v": 1}, expires_at=expires_at)
+    hot.set("b", {"v": 2}, ttl_s=60)
+    hot.set("stale", {"v": 3}, expires_at=time.time() - 1)
+    scratch.set("x", 1, ttl_s=60)
+
+    cache_snapshot.write_snapshot(cache_snapshot.collect_snapshot(), path)
+    hot.clear()
+    scratch.clear()
+    hot.set("b", {"v": "newer"}, ttl_s=60)
+
+    restored = cache_snapshot.restore_snapshot(path)
+    assert restored["test_snapshot_hot"] == 1  # "b" is already fresher, "stale" expired
+    assert "test_snapshot_scratch" not in restored
+    assert hot.get("a") == {"v": 1}
+    assert hot.peek("a")[1] == expires_at
+    assert hot.get("b") == {"v": "newer"}
+    assert hot.get("stale") is None
+    assert scratch.get("x") is None
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "caches.pickle"
+    assert cache_snapshot.restore_snapshot(str(path)) == {}
+    path.write_bytes(b"garbage")
+    assert cache_snapshot.restore_snapshot(str(path)) == {}
+
+
+def test_lifespan_restores_before_serving_and_saves_on_shutdown(tmp_path, monkeypatch):
+    path = str(tmp_path / "caches.pickle")
+    cache = TTLCache("test_snapshot_lifespan", maxsize=8, persistent=True)
+    cache.set("k", "warm", ttl_s=300)
+    cache_snapshot.write_snapshot(cache_snapshot.collect_snapshot(), path)
+    cache.clear()
+    monkeypatch.setattr(main, "CACHE_SNAPSHOT_PATH", path)
+
+    with TestClient(main.app):
+        assert cache.get("k") == "warm"
+        cache.set("k2", "added while serving", ttl_s=300)
+
+    cache.clear()
+    assert cache_snapshot.restore_snapshot(path)["test_snapshot_lifespan"] == 2
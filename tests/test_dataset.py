@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from apps.server.services import airport_database
+from apps.server.services.airport_database import AIRPORTS, build_airport_dataset, find_nearest_airport
+from apps.server.services.dataset import DatasetError, DatasetHandle, MappedDataset, write_dataset
+from apps.server.services.station_catalog import (
+    Station,
+    StationCatalog,
+    build_station_dataset,
+    load_station_catalog,
+)
+
+
+def test_mapped_airports_match_the_builtin_table(tmp_path, monkeypatch):
+    path = str(tmp_path / "airports.dods")
+    build_airport_dataset(path)
+    ds = MappedDataset(path)
+    assert ds.kind == "airports" and len(ds) == len(AIRPORTS)
+    assert sorted(ds.column("icao")[r] for r in range(len(ds))) == sorted(a.icao for a in AIRPORTS)
+
+    rng = random.Random(7)
+    points = [(a.lat + rng.uniform(-0.3, 0.3), a.lon + rng.uniform(-0.3, 0.3)) for a in AIRPORTS]
+    points += [(rng.uniform(25, 49), rng.uniform(-125, -67)) for _ in range(200)]
+    expected = [find_nearest_airport(lat, lon) for lat, lon in points]
+
+    monkeypatch.setattr(airport_database, "_dataset", DatasetHandle(path))
+    monkeypatch.setattr(airport_database, "_dataset_loaded", True)
+    mapped = [find_nearest_airport(lat, lon) for lat, lon in points]
+    assert [a and a.icao for a in mapped] == [a and a.icao for a in expected]
+    assert mapped[0] == expected[0]
+
+
+def test_mapped_station_catalog_answers_like_the_in_memory_one(tmp_path):
+    catalog = StationCatalog(
+        [
+            Station("KSFO", "San Francisco Intl", 37.6196, -122.3656, True, True),
+            Station("KOAK", "Oakland Intl", 37.7213, -122.2208, True, True),
+            Station("C1234", "Backyard mesonet – ünïcode", 37.7750, -122.4190, False, None),
+            Station("KSEA", "Seattle-Tacoma", 47.4502, -122.3088, True, True),
+        ]
+    )
+    path = str(tmp_path / "stations.dods")
+    build_station_dataset(catalog, path)
+    mapped = load_station_catalog(path)
+
+    assert len(mapped) == 4
+    assert mapped.nearest(37.7749, -122.4194, k=8, max_distance_nm=30) == catalog.nearest(
+        37.7749, -122.4194, k=8, max_distance_nm=30
+    )
+    assert mapped.rank_candidates(37.7749, -122.4194, k=3) == ["KSFO", "KOAK", "C1234"]
+    assert {st.station_id: st for st in mapped.stations}["C1234"].reports_ceiling is None
+
+
+def test_handle_swaps_to_a_rebuilt_file(tmp_path):
+    path = str(tmp_path / "points.dods")
+    write_dataset(path, "points", {"lat": ("f8", [1.0]), "lon": ("f8", [2.0])}, build_version=1)
+    handle = DatasetHandle(path, check_interval_s=0.0)
+    old = handle.get()
+    write_dataset(path, "points", {"lat": ("f8", [1.0, 3.0]), "lon": ("f8", [2.0, 4.0])}, build_version=2)
+
+    new = handle.get()
+    assert (new.build_version, len(new)) == (2, 2)
+    assert list(old.column("lat")) == [1.0]  # readers of the old mapping are unaffected
+
+
+def test_rejects_foreign_or_future_files(tmp_path):
+    bogus = tmp_path / "x.dods"
+    bogus.write_bytes(b"not a dataset at all, just some bytes to fill the header")
+    with pytest.raises(DatasetError):
+        MappedDataset(str(bogus))
+
+    path = str(tmp_path / "v.dods")
+    write_dataset(path, "points", {"lat": ("f8", [1.0]), "lon": ("f8", [2.0])})
+    data = bytearray(open(path, "rb").read())
+    data[4] = 99  # format version
+    bogus.write_bytes(bytes(data))
+    with pytest.raises(DatasetError):
+        MappedDataset(str(bogus))
+
+
+@pytest.mark.parametrize("keep_bytes", [0, 40, 200])  # empty, mid-section-table, mid-data
+def test_empty_or_truncated_file_falls_back_at_load_and_is_ignored_at_reload(tmp_path, monkeypatch, keep_bytes):
+    path = tmp_path / "airports.dods"
+    build_airport_dataset(str(path))
+    full = path.read_bytes()
+
+    # At startup: the built-in table answers instead.
+    path.write_bytes(full[:keep_bytes])
+    with pytest.raises(DatasetError):
+        MappedDataset(str(path))
+    monkeypatch.setattr(airport_database, "AIRPORT_DATASET_PATH", str(path))
+    monkeypatch.setattr(airport_database, "_dataset", None)
+    monkeypatch.setattr(airport_database, "_dataset_loaded", False)
+    assert find_nearest_airport(37.6, -122.4).icao == "KSFO"
+    assert airport_database._dataset is None
+
+    # At reload: the handle keeps serving the mapping it has.
+    good = tmp_path / "good.dods"
+    good.write_bytes(full)
+    handle = DatasetHandle(str(good), check_interval_s=0.0)
+    current = handle.get()
+    with open(good, "r+b") as fh:  # truncated in place, not replaced by a rename
+        fh.truncate(keep_bytes)
+    # The old mapping must not be read after an in-place truncate, so only check identity.
+    assert handle.get() is current
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.server import main
+from apps.server.services.cache import TTLCache
+from apps.server.services.deadline import DeadlineExceeded, deadline_scope, remaining_s
+from apps.server.services.resilience import host_state, resilient_get
+
+
+def _preflight(client, **extra):
+    flight = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
+    body = {"latitude": 37.77, "longitude": -122.42, "altitude_ft": 200, "flight_datetime": flight, **extra}
+    return client.post("/api/preflight", json=body)
+
+
+def test_slow_section_is_cut_off_at_the_budget(monkeypatch):
+    async def slow_airspace(lat, lon, alt):
+        await asyncio.sleep(5)
+        return {"airspace_class": "Class G", "laanc_required": False}
+
+    async def fake_observation(lat, lon):
+        return {"visibility_sm": 10.0, "cloud_ceiling_ft": 5000}, {}
+
+    async def fake_tfr(lat, lon):
+        return {"state": "CA", "tfr_count": 0, "status": "CLEAR"}
+
+    monkeypatch.setattr(main, "_preflight_airspace_data", slow_airspace)
+    monkeypatch.setattr(main, "fetch_latest_observation_by_latlon", fake_observation)
+    monkeypatch.setattr(main, "_preflight_tfr_data", fake_tfr)
+
+    start = time.perf_counter()
+    r = _preflight(TestClient(main.app), budget_ms=600)
+    assert time.perf_counter() - start < 1.5
+
+    body = r.json()
+    assert r.status_code == 200
+    assert body["airspace"]["airspace_class"] == "Unknown"
+    assert body["airspace"]["coverage"] == {"airspace": "deadline_exceeded"}
+    assert body["tfr"]["status"] == "CLEAR"
+    assert body["meta"]["budget"] == {"budget_ms": 600, "exhausted": ["airspace"]}
+    assert body["checklist"]["overall_status"] != "GO"
+
+
+def test_budget_is_validated():
+    r = _preflight(TestClient(main.app), budget_ms=10)
+    assert r.status_code == 422
+
+
+class _RecordingClient:
+    timeout = httpx.Timeout(15.0)
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.timeouts = []
+
+    async def get(self, url, **kwargs):
+        self.timeouts.append(kwargs.get("timeout"))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+
+        class _R:
+            status_code = 200
+
+        return _R()
+
+
+def test_upstream_timeout_is_capped_at_remaining_budget():
+    client = _RecordingClient()
+
+    async def scenario():
+        await resilient_get(client, "https://slow.test/a", upstream="t", operation="get")
+        with deadline_scope(1.0):
+            await resilient_get(client, "https://slow.test/a", upstream="t", operation="get")
+
+    asyncio.run(scenario())
+    assert client.timeouts[0] == 15.0
+    assert 0.9 < client.timeouts[1] <= 1.0
+
+
+def test_budget_timeouts_do_not_trip_the_breaker():
+    client = _RecordingClient(error=httpx.ReadTimeout("budget"))
+    state = host_state("https://slow.test/a")
+
+    async def scenario():
+        with deadline_scope(0.5):
+            for _ in range(state.policy.breaker_failure_threshold + 1):
+                with pytest.raises(httpx.ReadTimeout):
+                    await resilient_get(client, "https://slow.test/a", upstream="t", operation="get")
+        with deadline_scope(0.0):
+            with pytest.raises(DeadlineExceeded):
+                await resilient_get(client, "https://slow.test/a", upstream="t", operation="get")
+
+    asyncio.run(scenario())
+    assert state.breaker.state == "closed"
+    assert len(client.timeouts) == state.policy.breaker_failure_threshold + 1  # no retries, none after expiry
+
+
+def test_shared_cache_load_is_detached_from_the_callers_deadline():
+    cache = TTLCache("test_deadline_detached", maxsize=4)
+    seen = []
+
+    async def loader():
+        seen.append(remaining_s())
+        return "value", time.time() + 60
+
+    async def scenario():
+        with deadline_scope(1.0):
+            assert remaining_s() is not None
+            return await cache.get_or_load("k", loader)
+
+    assert asyncio.run(scenario()) == "value"
+    assert seen == [None]
@@ -0,0 +1,37 @@
+from apps.server.services.faa_airspace import AirspaceResult, AirspaceResultBatch
+
+
+def _result(airspace_class, laanc_required, ceiling, facility, restrictions):
+    return AirspaceResult(
+        airspace_class=airspace_class,
+        airspace_name="Name fallback",
+        laanc_required=laanc_required,
+        laanc_available=laanc_required,
+        max_altitude_ft=ceiling,
+        facility=facility,
+        restrictions=restrictions,
+        raw={"features": []},
+        debug={},
+    )
+
+
+def test_batch_rows_match_the_airspace_data_shape():
+    results = [
+        (_result("Class C", True, 200, "SFO", ["Controlled airspace indicated."]), 37.6, -122.4, 200),
+        (_result("Class G", False, None, None, ["No controlled airspace indicated."]), 38.1, -121.9, 350),
+        (_result("Unknown", None, 0, "OAK", ["Controlled airspace indicated."]), 37.7, -122.2, 100),
+    ]
+    batch = AirspaceResultBatch()
+    for res, lat, lon, alt in results:
+        batch.append(res, lat, lon, alt)
+
+    assert len(batch) == 3
+    for i, (res, lat, lon, alt) in enumerate(results):
+        expected = {**res.summary(), "coordinates": {"lat": lat, "lon": lon}, "altitude_ft_agl": alt}
+        assert batch.to_dict(i) == expected
+        assert list(batch.to_dict(i)) == list(expected)
+    assert batch.to_dict(1)["facility"] == "Name fallback"
+    assert batch.to_dict(0)["restrictions"] is not batch.to_dict(2)["restrictions"]
+    assert batch.airspace_classes() == ["Class C", "Class G", "Unknown"]
+    assert batch.laanc_required_values() == [True, False, None]
+    assert [d["altitude_ft_agl"] for d in batch.dicts()] == [200, 350, 100]
@@ -0,0 +1,94 @@
+import json
+import random
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+
+from fastapi.testclient import TestClient
+
+from apps.server import main
+from apps.server.models import ToolMeta, ToolResponse
+from apps.server.services import fast_json, timing
+
+
+def _default_bytes(content):
+    # What FastAPI sends for a returned dict: jsonable_encoder, then JSONResponse.render.
+    return json.dumps(
+        fast_json.jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class _Status(Enum):
+    GO = "GO"
+
+
+def test_dumps_matches_default_encoding():
+    payload = {
+        "text": "Vis 10 SM – 1e5 ft°, line sep, </script>",
+        "floats": [0.1, -0.0, 2.5, 1e-05, 1.5e-07, 1e16, 1.2345678901234568e17, 0.0001, 1e15],
+        "ints": [0, -1, 2**63 - 1],
+        "nested": {"a": [None, True, False, {"b": ()}], "c": (1, 2)},
+        "when": datetime(2026, 5, 1, 12, 30, tzinfo=UTC),
+        "status": _Status.GO,
+        "model": ToolMeta(sources=["x"], request_id="r"),
+        "tags": {"only"},
+        "request_id": "3e4f0c1e-9d2b-4e6a-8c1e-5e7d9f0a1b2c",
+    }
+    assert fast_json.dumps(payload) == _default_bytes(payload)
+    assert fast_json.dumps({"huge": 2**70}) == _default_bytes({"huge": 2**70})
+    assert fast_json.dumps({1: "int key"}) == _default_bytes({1: "int key"})
+
+
+def test_float_formatting_matches_across_magnitudes():
+    rng = random.Random(7)
+    values = [rng.uniform(-1, 1) * 10 ** rng.randint(-12, 20) for _ in range(3000)]
+    values += [round(v, 2) for v in values[:500]]
+    for v in values:
+        assert fast_json.dumps({"v": v}) == _default_bytes({"v": v}), v
+
+
+def test_tool_response_bytes_and_schema(monkeypatch):
+    monkeypatch.setattr(timing, "REQUEST_TIMINGS_ENABLED", False)
+    payload = {"mission_type": "recreational", "airspace_data": {}, "weather_data": {}, "tfr_data": {}}
+    client = TestClient(main.app)
+
+    fast = client.post("/tools/generate_preflight_checklist", json=payload)
+    assert fast.content == _default_bytes(fast.json())
+    assert ToolResponse.model_validate(fast.json()).model_dump() == fast.json()
+
+    monkeypatch.setattr(main, "FAST_JSON_ENABLED", False)
+    validated = client.post("/tools/generate_preflight_checklist", json=payload)
+    assert list(validated.json()) == list(fast.json())
+    assert list(validated.json()["meta"]) == list(fast.json()["meta"])
+    assert validated.json()["result"] == fast.json()["result"]
+
+
+def test_tool_meta_matches_model_dump(monkeypatch):
+    monkeypatch.setattr(main, "utc_now_iso", lambda: "2026-01-01T00:00:00Z")
+    meta = main._tool_meta(sources=["s"], coverage={"c": "x"}, request_id="r")
+    assert meta == ToolMeta(**meta).model_dump()
+    assert list(meta) == list(ToolMeta(**meta).model_dump())
+
+
+def test_preflight_uses_fast_encoding(monkeypatch):
+    async def fake_airspace(lat, lon, alt):
+        return {"airspace_class": "Class G", "laanc_required": False}
+
+    async def fake_observation(lat, lon):
+        return {"visibility_sm": 10.0, "cloud_ceiling_ft": 5000, "wind_speed_kt": 1e-05}, {}
+
+    async def fake_tfr(lat, lon):
+        return {"state": "CA", "tfr_count": 0, "status": "CLEAR"}
+
+    monkeypatch.setattr(main, "_preflight_airspace_data", fake_airspace)
+    monkeypatch.setattr(main, "fetch_latest_observation_by_latlon", fake_observation)
+    monkeypatch.setattr(main, "_preflight_tfr_data", fake_tfr)
+    flight = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
+
+    r = TestClient(main.app).post(
+        "/api/preflight",
+        json={"latitude": 37.77, "longitude": -122.42, "altitude_ft": 200, "flight_datetime": flight},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    assert r.content == _default_bytes(r.json())
+    assert {"mode", "airspace", "weather", "tfr", "checklist", "meta"} <= set(r.json())
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from apps.server import main
+from apps.server.services.nws_weather import ForecastTimeline
+
+
+def _timeline(start):
+    periods = []
+    # Calm, then a windy and wet period, then a breezier one.
+    for i, (wind, precip) in enumerate([("5 mph", 10), ("20 mph", 60), ("10 to 15 mph", 0)]):
+        begin = start + timedelta(hours=12 * i)
+        periods.append(
+            {
+                "name": f"P{i}",
+                "startTime": begin.isoformat(),
+                "endTime": (begin + timedelta(hours=12)).isoformat(),
+                "temperature": 60,
+                "windSpeed": wind,
+                "shortForecast": "Sunny",
+                "detailedForecast": "",
+                "probabilityOfPrecipitation": {"value": precip},
+            }
+        )
+    return ForecastTimeline(periods)
+
+
+def test_launch_windows_fetch_once_and_rank(monkeypatch):
+    start = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    calls = {"airspace": 0, "tfr": 0, "forecast": 0}
+
+    async def fake_airspace(lat, lon, alt):
+        calls["airspace"] += 1
+        return {"airspace_class": "Class G", "laanc_required": False}
+
+    async def fake_tfr(lat, lon):
+        calls["tfr"] += 1
+        return {"state": "CA", "tfr_count": 0, "status": "CLEAR"}
+
+    async def fake_forecast(lat, lon):
+        calls["forecast"] += 1
+        return _timeline(start), {}
+
+    monkeypatch.setattr(main, "_preflight_airspace_data", fake_airspace)
+    monkeypatch.setattr(main, "_preflight_tfr_data", fake_tfr)
+    monkeypatch.setattr(main, "fetch_gridpoint_forecast_by_latlon", fake_forecast)
+
+    body = TestClient(main.app).post(
+        "/api/launch_windows",
+        json={"latitude": 37.77, "longitude": -122.42, "altitude_ft": 200, "hours": 36},
+    ).json()
+
+    assert calls == {"airspace": 1, "tfr": 1, "forecast": 1}
+    assert body["hours_evaluated"] == 36
+    # The 20 mph / 60% period is past the limits and splits the range; the
+    # 15 mph period (13 kt) is flyable with conditions and ranks after the calm one.
+    assert [(w["overall_status"], w["duration_hours"], w["forecast_periods"]) for w in body["windows"]] == [
+        ("GO", 12, ["P0"]),
+        ("GO_WITH_CONDITIONS", 12, ["P2"]),
+    ]
+    assert body["windows"][0]["end"] == (start + timedelta(hours=12)).isoformat()
+    assert body["windows"][1]["start"] == (start + timedelta(hours=24)).isoformat()
+    assert body["windows"][1]["required_actions"] == ["Verify weather at flight time using authoritative sources."]
+    assert body["meta"]["budget"]["exhausted"] == []
+
+
+def test_launch_windows_lookups_run_concurrently_under_the_budget(monkeypatch):
+    start = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+    async def slow_airspace(lat, lon, alt):
+        await asyncio.sleep(5)
+
+    async def slow_tfr(lat, lon):
+        await asyncio.sleep(0.3)
+        return {"state": "CA", "tfr_count": 0, "status": "CLEAR"}
+
+    async def slow_forecast(lat, lon):
+        await asyncio.sleep(0.3)
+        return _timeline(start), {}
+
+    monkeypatch.setattr(main, "_preflight_airspace_data", slow_airspace)
+    monkeypatch.setattr(main, "_preflight_tfr_data", slow_tfr)
+    monkeypatch.setattr(main, "fetch_gridpoint_forecast_by_latlon", slow_forecast)
+
+    t0 = time.perf_counter()
+    body = TestClient(main.app).post(
+        "/api/launch_windows",
+        json={"latitude": 37.77, "longitude": -122.42, "altitude_ft": 200, "hours": 12, "budget_ms": 800},
+    ).json()
+    elapsed = time.perf_counter() - t0
+
+    # TFR and forecast finished side by side; airspace was cut off at the budget.
+    assert elapsed < 1.5
+    assert body["meta"]["budget"] == {"budget_ms": 800, "exhausted": ["airspace"]}
+    assert body["airspace"]["coverage"] == {"airspace": "deadline_exceeded"}
+    assert [w["overall_status"] for w in body["windows"]] == ["GO_WITH_CONDITIONS"]
+
+
+def test_rank_launch_windows_prefers_go_then_calm():
+    t0 = datetime(2026, 10, 19, tzinfo=UTC)
+
+    def hour(i, status, wind):
+        return {
+            "time": t0 + timedelta(hours=i),
+            "overall_status": status,
+            "required_actions": [],
+            "wind_speed_kt": wind,
+            "precipitation_probability": 0,
+            "period_name": "P",
+        }
+
+    hourly = [
+        hour(0, "GO_WITH_CONDITIONS", 4.0),
+        hour(1, "NO_GO", 4.0),
+        hour(2, "GO", 15.0),
+        hour(3, "GO", 12.0),
+        hour(4, "GO_WITH_CONDITIONS", 2.0),
+        hour(6, "GO", 5.0),
+    ]
+    ranked = main._rank_launch_windows(hourly, max_windows=10)
+    assert [(w["start"][11:16], w["duration_hours"]) for w in ranked] == [
+        ("06:00", 1),
+        ("02:00", 2),
+        ("04:00", 1),
+        ("00:00", 1),
+    ]
@@ -0,0 +1,44 @@
+from datetime import UTC, datetime
+
+from fastapi.testclient import TestClient
+
+from tests.loadtest.driver import percentile
+from tests.loadtest.stub_upstreams import StubConfig, UpstreamProfile, create_stub_app
+
+
+def _quiet_stub(**overrides) -> TestClient:
+    profiles = {u: UpstreamProfile(latency_ms=0, jitter_ms=0) for u in ("arcgis", "nws", "tfr")}
+    for upstream, profile in overrides.items():
+        profiles[upstream] = profile
+    return TestClient(create_stub_app(StubConfig(profiles=profiles, seed=0)))
+
+
+def test_stub_points_follow_up_urls_come_back_to_the_stub():
+    client = _quiet_stub()
+    props = client.get("/nws/points/37.7749,-122.4194").json()["properties"]
+    assert props["forecast"] == "http://testserver/nws/gridpoints/MTR/85,105/forecast"
+    assert props["observationStations"].startswith("http://testserver/nws/")
+
+    stations = client.get("/nws/gridpoints/MTR/85,105/stations").json()
+    assert stations["features"][0]["properties"]["stationIdentifier"] == "KSFO"
+
+
+def test_stub_forecast_is_shifted_to_now():
+    client = _quiet_stub()
+    periods = client.get("/nws/gridpoints/MTR/85,105/forecast").json()["properties"]["periods"]
+    first_start = datetime.fromisoformat(periods[0]["startTime"])
+    assert first_start <= datetime.now(UTC) < datetime.fromisoformat(periods[0]["endTime"])
+
+
+def test_stub_injects_errors_per_upstream():
+    client = _quiet_stub(tfr=UpstreamProfile(latency_ms=0, jitter_ms=0, error_rate=1.0))
+    assert client.get("/tfr/export/json").status_code == 503
+    assert client.get("/arcgis/uasfm/query").status_code == 200
+    assert client.get("/stats").json()["errors"] == {"arcgis": 0, "nws": 0, "tfr": 1}
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) is None
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from apps.server.services import metar_bulk, nws_weather
+from apps.server.services.metar_bulk import parse_metar_csv
+
+FIXTURE = Path(__file__).parent / "fixtures" / "metars.cache.csv"
+
+
+def test_parse_metar_csv_matches_observation_shape():
+    table, catalog = parse_metar_csv(FIXTURE.read_text())
+
+    assert set(table) == {"KSFO", "KOAK"}
+    ksfo = table["KSFO"]
+    # Newest row per station wins.
+    assert ksfo["timestamp"] == "2026-10-18T12:56:00+00:00"
+    assert ksfo["wind_speed_kt"] == 12.0
+    assert ksfo["wind_gust_kt"] == 20.0
+    assert ksfo["wind_direction_deg"] == 290
+    assert ksfo["visibility_sm"] == 10.0
+    assert ksfo["cloud_ceiling_ft"] == 800
+    assert ksfo["temperature_f"] == 60.1
+    assert ksfo["conditions"] == "Mostly Cloudy"
+    assert ksfo["raw"]["nws_station_id"] == "KSFO"
+
+    koak = table["KOAK"]
+    assert koak["wind_direction_deg"] is None
+    assert koak["conditions"] == "BR"
+    assert koak["cloud_ceiling_ft"] == 400
+
+    assert catalog.rank_candidates(37.72, -122.22, k=2) == ["KOAK", "KSFO"]
+
+
+@pytest.fixture
+def bulk_table(monkeypatch):
+    """
+    Installs the fixture file as the bulk table; returns the table. No local
+    station catalog, and every NWS request is recorded.
+    """
+    table, catalog = parse_metar_csv(FIXTURE.read_text())
+    monkeypatch.setitem(metar_bulk._STATE, "table", table)
+    monkeypatch.setitem(metar_bulk._STATE, "catalog", catalog)
+    monkeypatch.setitem(metar_bulk._STATE, "loaded_at", time.time())
+    monkeypatch.setattr(nws_weather, "get_station_catalog", lambda: None)
+    for cache in (nws_weather.OBSERVATION_CACHE, nws_weather.POINTS_CACHE):
+        cache.clear()
+    nws_weather._STATION_QUALITY.clear()
+    yield table
+    for cache in (nws_weather.OBSERVATION_CACHE, nws_weather.POINTS_CACHE):
+        cache.clear()
+    nws_weather._STATION_QUALITY.clear()
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def _nws_routes(station_id):
+    base = nws_weather.NWS_BASE
+    return {
+        f"{base}/points/37.7200,-122.2200": {
+            "properties": {"observationStations": f"{base}/gridpoints/MTR/90,105/stations"}
+        },
+        f"{base}/gridpoints/MTR/90,105/stations": {
+            "features": [{"properties": {"stationIdentifier": station_id}}]
+        },
+        f"{base}/stations/{station_id}/observations/latest": {
+            "properties": {
+                "visibility": {"value": 16093.0},
+                "windSpeed": {"value": 9.0},
+                "windDirection": {"value": 270},
+                "temperature": {"value": 18.0},
+                "cloudLayers": [{"base": {"value": 1500.0}}],
+                "textDescription": "Clear",
+                "timestamp": "2026-10-18T12:53:00+00:00",
+            }
+        },
+    }
+
+
+def _route(monkeypatch, routes):
+    requested = []
+
+    async def fake_get(client, url, **kwargs):
+        requested.append(url)
+        return _Response(routes[url])
+
+    monkeypatch.setattr(nws_weather, "resilient_get", fake_get)
+    return requested
+
+
+def test_latest_observation_is_answered_from_the_bulk_table(bulk_table, monkeypatch):
+    requested = _route(monkeypatch, {})
+
+    parsed, debug = asyncio.run(nws_weather.fetch_latest_observation_by_latlon(37.72, -122.22))
+
+    assert requested == []
+    assert debug["station_source"] == "bulk_metar"
+    assert debug["points_url"] is None
+    assert parsed is bulk_table[debug["selected_station_id"]]
+    assert debug["selected_station_id"] in ("KOAK", "KSFO")
+
+
+@pytest.mark.parametrize("case", ["stale_table", "station_not_in_table"])
+def test_latest_observation_falls_back_to_per_station_fetches(bulk_table, monkeypatch, case):
+    if case == "stale_table":
+        monkeypatch.setitem(metar_bulk._STATE, "loaded_at", time.time() - metar_bulk.MAX_TABLE_AGE_S - 1)
+        station_id = "KSFO"  # in the table, but the table is too old to use
+    else:
+        station_id = "KHAF"  # ranked by the local catalog, absent from the bulk file
+
+        class _Catalog:
+            def rank_candidates(self, lat, lon, k):
+                return [station_id]
+
+        monkeypatch.setattr(nws_weather, "get_station_catalog", lambda: _Catalog())
+    requested = _route(monkeypatch, _nws_routes(station_id))
+
+    parsed, debug = asyncio.run(nws_weather.fetch_latest_observation_by_latlon(37.72, -122.22))
+
+    latest = f"{nws_weather.NWS_BASE}/stations/{station_id}/observations/latest"
+    assert requested[-1] == latest
+    assert debug["selected_station_id"] == station_id
+    assert debug["station_source"] == ("nws_points" if case == "stale_table" else "catalog")
+    assert parsed["conditions"] == "Clear"
+    assert parsed is not bulk_table.get(station_id)
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.server.main import app
+from apps.server.services.metrics import (
+    UPSTREAM_ERRORS,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_LATENCY,
+    UPSTREAM_REQUESTS,
+    Histogram,
+    Registry,
+    render_metrics,
+    upstream_call,
+)
+
+
+def test_upstream_call_records_status_latency_and_errors():
+    async def _ok():
+        with upstream_call("test_upstream", "ok_op") as call:
+            await asyncio.sleep(0)
+            call.status = 200
+
+    async def _boom():
+        with upstream_call("test_upstream", "boom_op"):
+            raise TimeoutError("slow")
+
+    asyncio.run(_ok())
+    with pytest.raises(TimeoutError):
+        asyncio.run(_boom())
+
+    assert UPSTREAM_REQUESTS.labels("test_upstream", "ok_op", "200").value == 1
+    assert UPSTREAM_REQUESTS.labels("test_upstream", "boom_op", "error").value == 1
+    assert UPSTREAM_ERRORS.labels("test_upstream", "boom_op", "TimeoutError").value == 1
+    assert UPSTREAM_LATENCY.labels("test_upstream", "ok_op").count == 1
+    assert UPSTREAM_IN_FLIGHT.labels("test_upstream", "ok_op").value == 0
+
+
+def test_histogram_exposition_is_cumulative():
+    import apps.server.services.metrics as metrics
+
+    saved = metrics.REGISTRY
+    metrics.REGISTRY = Registry()
+    try:
+        h = Histogram("demo_seconds", "Demo.", ("op",), buckets=(0.1, 1.0))
+        for v in (0.05, 0.5, 5.0):
+            h.labels(op='a"b').observe(v)
+        text = metrics.REGISTRY.render()
+    finally:
+        metrics.REGISTRY = saved
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{op="a\\"b",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{op="a\\"b",le="1"} 2' in text
+    assert 'demo_seconds_bucket{op="a\\"b",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{op="a\\"b"} 3' in text
+
+
+def test_metrics_endpoint_reports_api_requests_and_caches():
+    client = TestClient(app)
+    payload = {"mission_type": "recreational", "airspace_data": {}, "weather_data": {}, "tfr_data": {}}
+    assert client.post("/tools/generate_preflight_checklist", json=payload).status_code == 200
+    client.get("/healthz")
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{endpoint="/tools/generate_preflight_checklist",status="200"}' in r.text
+    assert 'endpoint="/healthz"' not in r.text
+    assert 'cache_lookups_total{cache="rules_decision",result="miss"}' in r.text
+    assert 'cache_entries{cache="nws_observation"}' in r.text
+    assert r.text == r.text.rstrip("\n") + "\n"
+    assert render_metrics().startswith("# HELP")
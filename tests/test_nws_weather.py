@@ -0,0 +1,313 @@
+import asyncio
+import time
+from datetime import UTC, datetime
+
+import pytest
+
+from apps.server.services import nws_weather
+from apps.server.services.nws_weather import (
+    FORECAST_CACHE,
+    OBSERVATION_CACHE,
+    POINTS_CACHE,
+    _get_gridpoint_forecast,
+    _score_conditions,
+    _select_best_station,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    for cache in (OBSERVATION_CACHE, POINTS_CACHE, FORECAST_CACHE):
+        cache.clear()
+    nws_weather._STATION_QUALITY.clear()
+    yield
+    for cache in (OBSERVATION_CACHE, POINTS_CACHE, FORECAST_CACHE):
+        cache.clear()
+    nws_weather._STATION_QUALITY.clear()
+
+
+def _obs(visibility_m=None, wind_mps=None, text="", timestamp="2026-10-18T12:53:00+00:00"):
+    return {
+        "properties": {
+            "visibility": {"value": visibility_m},
+            "windSpeed": {"value": wind_mps},
+            "windDirection": {"value": 270 if wind_mps is not None else None},
+            "temperature": {"value": 20.0},
+            "cloudLayers": [{"base": {"value": 900.0}}] if visibility_m is not None else [],
+            "textDescription": text,
+            "timestamp": timestamp,
+        }
+    }
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.status_code = 502 if payload is None else 200
+
+    def raise_for_status(self):
+        if self._payload is None:
+            raise RuntimeError("502 Bad Gateway")
+
+    def json(self):
+        return self._payload
+
+
+class _FakeClient:
+    def __init__(self, payloads, delays=None):
+        self.payloads = payloads
+        self.delays = delays or {}
+        self.requested: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def get(self, url, **kwargs):
+        station_id = url.split("/stations/")[1].split("/")[0]
+        self.requested.append(station_id)
+        try:
+            await asyncio.sleep(self.delays.get(station_id, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(station_id)
+            raise
+        return _FakeResponse(self.payloads[station_id])
+
+
+def _sequential_pick(payloads, station_ids):
+    best_id, best_score = None, -1
+    for station_id in station_ids:
+        if payloads[station_id] is None:
+            continue
+        score = _score_conditions(nws_weather._parse_observation(payloads[station_id], station_id))
+        if score > best_score:
+            best_id, best_score = station_id, score
+        if best_score >= nws_weather.GOOD_STATION_SCORE:
+            break
+    return best_id, best_score
+
+
+def test_concurrent_selection_matches_sequential_when_no_station_is_good():
+    payloads = {
+        "KAAA": _obs(wind_mps=3.0),
+        "KBBB": None,
+        "KCCC": _obs(wind_mps=4.0, text="Clear"),
+        "KDDD": _obs(),
+        "KEEE": _obs(wind_mps=2.0, text="Fog"),
+    }
+    ids = list(payloads)
+    client = _FakeClient(payloads, delays={"KAAA": 0.03, "KCCC": 0.01})
+
+    parsed, station_id, score, attempted, errors = asyncio.run(_select_best_station(client, ids, concurrency=2))
+
+    assert (station_id, score) == _sequential_pick(payloads, ids)
+    assert parsed["raw"]["nws_station_id"] == station_id
+    assert attempted == ids
+    assert len(errors) == 1 and errors[0].startswith("KBBB")
+
+
+def test_good_station_cancels_remaining_requests():
+    payloads = {
+        "KAAA": _obs(wind_mps=3.0),
+        "KBBB": _obs(visibility_m=16000.0, wind_mps=5.0, text="Clear"),
+        "KCCC": _obs(visibility_m=16000.0, wind_mps=5.0, text="Clear"),
+        "KDDD": _obs(wind_mps=1.0),
+        "KEEE": _obs(wind_mps=1.0),
+    }
+    ids = list(payloads)
+    client = _FakeClient(payloads, delays={"KCCC": 0.0, "KDDD": 5.0})
+
+    _, station_id, score, attempted, _ = asyncio.run(_select_best_station(client, ids, concurrency=4))
+
+    assert (station_id, score) == _sequential_pick(payloads, ids)
+    assert station_id == "KBBB"
+    assert attempted == ["KAAA", "KBBB"]
+    assert "KDDD" in client.cancelled
+    assert "KEEE" not in client.requested
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, UTC).isoformat()
+
+
+def test_observation_cache_serves_until_next_report_is_due():
+    now = time.time()
+    payloads = {"KAAA": _obs(visibility_m=16000.0, wind_mps=5.0, text="Clear", timestamp=_iso(now - 600))}
+    client = _FakeClient(payloads)
+
+    for _ in range(3):
+        asyncio.run(_select_best_station(client, ["KAAA"]))
+
+    assert client.requested == ["KAAA"]
+    assert OBSERVATION_CACHE.stats()["hits"] == 2
+    _, expires_at = OBSERVATION_CACHE.peek("KAAA")
+    # Hourly default cadence: next report due ~50 minutes from now (+ grace).
+    assert now + 2900 < expires_at < now + 3200
+
+
+def test_observation_cache_learns_station_cadence():
+    now = time.time()
+    asyncio.run(nws_weather._cache_observation("KAAA", {"timestamp": _iso(now - 1300)}))
+    asyncio.run(nws_weather._cache_observation("KAAA", {"timestamp": _iso(now - 100)}))
+
+    (_, _, cadence), expires_at = OBSERVATION_CACHE.peek("KAAA")
+    assert cadence == pytest.approx(1200, abs=1)
+    assert expires_at == pytest.approx(now - 100 + 1200 + nws_weather.OBSERVATION_PUBLISH_GRACE_S, abs=2)
+
+
+class _RoutingUpstream:
+    """
+    Stand-in for resilient_get: canned responses per URL, after `delay`. Like httpx,
+    it refuses to send through a closed client.
+    """
+
+    def __init__(self, routes, delay=0.0):
+        self.routes = routes
+        self.delay = delay
+        self.requested: list[str] = []
+
+    async def __call__(self, client, url, **kwargs):
+        self.requested.append(url)
+        await asyncio.sleep(self.delay)
+        if client.is_closed:
+            raise RuntimeError("Cannot send a request, as the client has been closed.")
+        return _FakeResponse(self.routes[url])
+
+
+def _points(lat, lon):
+    return {
+        "properties": {
+            "gridId": "MTR",
+            "gridX": 85,
+            "gridY": 105,
+            "forecast": "https://api.weather.gov/gridpoints/MTR/85,105/forecast",
+        }
+    }
+
+
+_FORECAST_URL = "https://api.weather.gov/gridpoints/MTR/85,105/forecast"
+
+
+def test_forecast_is_shared_per_gridpoint(monkeypatch):
+    upstream = _RoutingUpstream(
+        {_FORECAST_URL: {"properties": {"updateTime": _iso(time.time() - 60), "periods": [{"name": "Tonight"}]}}},
+        delay=0.01,
+    )
+    monkeypatch.setattr(nws_weather, "resilient_get", upstream)
+
+    async def _many():
+        return await asyncio.gather(
+            *[_get_gridpoint_forecast(_points(37.77 + i * 0.001, -122.42)) for i in range(5)]
+        )
+
+    results = asyncio.run(_many())
+    asyncio.run(_get_gridpoint_forecast(_points(37.78, -122.43)))
+
+    assert upstream.requested == [_FORECAST_URL]
+    assert all(entry is results[0][0] for entry, _ in results)
+    assert FORECAST_CACHE.peek(("MTR", 85, 105))[1] == pytest.approx(
+        time.time() - 60 + nws_weather.FORECAST_UPDATE_INTERVAL_S, abs=2
+    )
+
+
+def test_shared_load_survives_the_first_caller_being_cancelled(monkeypatch):
+    upstream = _RoutingUpstream(
+        {_FORECAST_URL: {"properties": {"updateTime": _iso(time.time() - 60), "periods": [{"name": "Tonight"}]}}},
+        delay=0.05,
+    )
+    monkeypatch.setattr(nws_weather, "resilient_get", upstream)
+
+    async def scenario():
+        first = asyncio.create_task(_get_gridpoint_forecast(_points(37.77, -122.42)))
+        await asyncio.sleep(0.01)  # the load is in flight
+        second = asyncio.create_task(_get_gridpoint_forecast(_points(37.771, -122.42)))
+        await asyncio.sleep(0)
+        first.cancel()  # e.g. its deadline ran out
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    timeline, _ = asyncio.run(scenario())
+    assert upstream.requested == [_FORECAST_URL]
+    assert FORECAST_CACHE.peek(("MTR", 85, 105))[0] is timeline
+    assert timeline.update_time is not None
+
+
+def _periods():
+    return [
+        {
+            "name": "Tonight",
+            "startTime": "2026-10-18T18:00:00-07:00",
+            "endTime": "2026-10-19T06:00:00-07:00",
+            "temperature": 52,
+            "windSpeed": "5 to 10 mph",
+            "shortForecast": "Mostly Clear",
+            "detailedForecast": "Mostly clear, with a low around 52.",
+            "probabilityOfPrecipitation": {"value": None},
+        },
+        {
+            "name": "Sunday",
+            "startTime": "2026-10-19T06:00:00-07:00",
+            "endTime": "2026-10-19T18:00:00-07:00",
+            "temperature": 68,
+            "windSpeed": "",
+            "shortForecast": "Chance Showers",
+            "detailedForecast": "A chance of showers. West wind around 15 mph.",
+            "probabilityOfPrecipitation": {"value": 40},
+        },
+    ]
+
+
+def test_forecast_timeline_lookup_matches_period_parser():
+    periods = _periods()
+    timeline = nws_weather.ForecastTimeline(list(reversed(periods)))
+
+    def at(iso):
+        return datetime.fromisoformat(iso)
+
+    # Shared boundary resolves to the earlier period, like the original linear scan.
+    assert timeline.period_at(at("2026-10-19T06:00:00-07:00"))["name"] == "Tonight"
+    assert timeline.period_at(at("2026-10-19T12:00:00-07:00"))["name"] == "Sunday"
+    # Before the first period: closest future period. After the last: no match.
+    assert timeline.period_at(at("2026-10-18T12:00:00-07:00"))["name"] == "Tonight"
+    assert timeline.period_at(at("2026-10-20T12:00:00-07:00")) is None
+    # The one-off helper gives the same answers.
+    for iso in ("2026-10-19T06:00:00-07:00", "2026-10-19T12:00:00-07:00", "2026-10-18T12:00:00-07:00"):
+        assert nws_weather._find_matching_period(periods, at(iso)) is timeline.period_at(at(iso))
+    assert nws_weather._find_matching_period(periods, at("2026-10-20T12:00:00-07:00")) is None
+
+    target = at("2026-10-19T12:00:00-07:00")
+    expected = nws_weather._parse_forecast_period(periods[1], target)
+    got = timeline.forecast_at(target)
+    for result in (expected, got):
+        result.pop("forecast_generated")
+    assert got == expected
+    assert got["wind_speed_kt"] == 13.0
+    assert got["precipitation_probability"] == 40
+
+
+def test_learned_quality_puts_complete_station_first():
+    good = _obs(visibility_m=16000.0, wind_mps=5.0, text="Clear")
+    payloads = {"KAAA": _obs(wind_mps=3.0), "KBBB": _obs(), "KCCC": good}
+    ids = ["KAAA", "KBBB", "KCCC"]
+
+    asyncio.run(_select_best_station(_FakeClient(payloads), ids))
+    ordered = nws_weather._order_by_quality(ids + ["KNEW"])
+    assert ordered == ["KCCC", "KNEW", "KAAA", "KBBB"]
+    assert nws_weather.station_quality_rankings(limit=1)[0]["station_id"] == "KCCC"
+
+    OBSERVATION_CACHE.clear()
+    client = _FakeClient(payloads)
+    _, station_id, _, attempted, _ = asyncio.run(
+        _select_best_station(client, ordered, first_wave=1 if nws_weather._is_known_complete(ordered[0]) else 4)
+    )
+    assert station_id == "KCCC"
+    assert client.requested == ["KCCC"]
+
+
+def test_quality_counts_each_observation_once():
+    payloads = {"KAAA": _obs(visibility_m=16000.0, wind_mps=5.0, text="Clear")}
+
+    asyncio.run(_select_best_station(_FakeClient(payloads), ["KAAA"]))
+    client = _FakeClient(payloads)
+    asyncio.run(_select_best_station(client, ["KAAA"]))  # served from OBSERVATION_CACHE
+
+    assert client.requested == []
+    assert nws_weather.station_quality_rankings()[0]["samples"] == 1
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from apps.server.services import prefetch
+from apps.server.services.cache import TTLCache, refresh_ahead
+from apps.server.services.ratelimit import BACKGROUND, current_priority
+
+
+def test_popularity_decays_and_ranks():
+    tracker = prefetch.PopularityTracker(half_life_s=3600)
+    for _ in range(3):
+        tracker.record(40.0, -105.0, 200)
+    tracker.record(40.00001, -105.00001, 300)  # same ~100 m bucket, newer exact point
+    tracker.record(41.0, -106.0)
+    assert len(tracker) == 2
+
+    top = tracker.top(5)
+    assert [(lat, lon, alt) for lat, lon, alt, _ in top] == [(40.00001, -105.00001, 300), (41.0, -106.0, 400)]
+    assert top[0][3] > top[1][3]
+    assert tracker.top(1) == top[:1]
+
+
+def test_seed_weights_rows_by_age():
+    tracker = prefetch.PopularityTracker(half_life_s=3600)
+    now = time.time()
+    old = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - 3 * 3600))
+    new = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - 60))
+    rows = (
+        [{"location_lat": 35.0, "location_lon": -80.0, "altitude_ft": 100, "timestamp_utc": old}] * 4
+        + [{"location_lat": 36.0, "location_lon": -81.0, "altitude_ft": 150, "timestamp_utc": new}]
+        + [{"location_lat": None, "location_lon": -81.0}]
+    )
+    assert tracker.seed(rows) == 5
+
+    (first, second) = tracker.top(2)
+    # Four hits three half-lives ago (~0.5) rank below one recent hit (~1.0).
+    assert first[:3] == (36.0, -81.0, 150)
+    assert second[:3] == (35.0, -80.0, 100)
+    assert 0.45 < second[3] < 0.55
+
+
+def test_refresh_ahead_reloads_entries_near_expiry():
+    cache = TTLCache("test_prefetch_ahead", maxsize=4)
+    cache.set("soon", 1, ttl_s=30)
+    cache.set("later", 2, ttl_s=600)
+
+    with refresh_ahead(60):
+        assert cache.get("soon") is None
+        assert cache.get("later") == 2
+    assert cache.get("soon") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 0
+
+
+def test_prefetch_once_refreshes_top_sites_in_background(monkeypatch):
+    calls = []
+
+    def _fake(kind):
+        async def _call(*args):
+            calls.append((kind, args, current_priority()))
+            if kind == "observation":
+                raise RuntimeError("upstream down")
+            return {}
+
+        return _call
+
+    monkeypatch.setattr(prefetch, "fetch_tfr_list_json", _fake("tfr_list"))
+    monkeypatch.setattr(prefetch, "analyze_airspace", _fake("airspace"))
+    monkeypatch.setattr(prefetch, "fetch_gridpoint_forecast_by_latlon", _fake("forecast"))
+    monkeypatch.setattr(prefetch, "fetch_latest_observation_by_latlon", _fake("observation"))
+
+    tracker = prefetch.PopularityTracker()
+    tracker.record(40.0, -105.0, 200)
+    tracker.record(40.0, -105.0, 200)
+    tracker.record(41.0, -106.0)
+    tracker.record(42.0, -107.0, at=time.time() - 3600)
+
+    visited = asyncio.run(prefetch.prefetch_once(tracker, top_k=2, concurrency=2))
+    assert visited == 2
+    assert {priority for _, _, priority in calls} == {BACKGROUND}
+    assert sum(1 for kind, _, _ in calls if kind == "tfr_list") == 1
+    assert sorted(args for kind, args, _ in calls if kind == "airspace")[0] == (40.0, -105.0, 200)
+    assert all(args[:2] != (42.0, -107.0) for _, args, _ in calls)
+
+    assert asyncio.run(prefetch.prefetch_once(prefetch.PopularityTracker())) == 0
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from apps.server.services.ratelimit import (
+    BACKGROUND,
+    BATCH,
+    INTERACTIVE,
+    QUEUE_WAIT,
+    TokenBucket,
+    bucket_for,
+    parse_rate_limits,
+    request_priority,
+    reset_rate_limits,
+)
+from apps.server.services.resilience import resilient_get
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("nws=10:20, arcgis=5,bad,tfr=x:1,zero=0") == {
+        "nws": (10.0, 20.0),
+        "arcgis": (5.0, 5.0),
+    }
+
+
+def test_queued_calls_are_served_by_priority_then_arrival():
+    async def scenario():
+        bucket = TokenBucket("test", rate=50.0, burst=1.0)
+        assert await bucket.acquire() == 0.0
+        order = []
+
+        async def call(name, priority):
+            await bucket.acquire(priority)
+            order.append(name)
+
+        tasks = []
+        for name, priority in [("bg", BACKGROUND), ("batch-1", BATCH), ("ui-1", INTERACTIVE), ("batch-2", BATCH), ("ui-2", INTERACTIVE)]:
+            tasks.append(asyncio.create_task(call(name, priority)))
+            await asyncio.sleep(0)  # enqueue in this order
+        assert not bucket.try_acquire()  # nobody jumps an existing queue
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["ui-1", "ui-2", "batch-1", "batch-2", "bg"]
+
+
+def test_cancelled_waiter_does_not_consume_a_token():
+    async def scenario():
+        bucket = TokenBucket("test", rate=20.0, burst=1.0)
+        await bucket.acquire()
+        waiter = asyncio.create_task(bucket.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0.06)
+        return bucket.try_acquire(), bucket.queued()
+
+    assert asyncio.run(scenario()) == (True, 0)
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _Client:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    async def get(self, url, **kwargs):
+        return self.responses.pop(0) if self.responses else _Response(200)
+
+
+def test_resilient_get_waits_for_a_token_at_the_request_priority():
+    reset_rate_limits({"limited": (20.0, 1.0)})
+    before = QUEUE_WAIT.labels("limited", "batch").count
+
+    async def scenario():
+        client = _Client([])
+        with request_priority(BATCH):
+            for _ in range(3):
+                await resilient_get(client, "https://limited.test/x", upstream="limited", operation="get")
+
+    asyncio.run(scenario())
+    # The first call used the burst token; the next two queued ~50 ms each.
+    child = QUEUE_WAIT.labels("limited", "batch")
+    assert child.count - before == 3
+    assert child.sum >= 0.08
+
+
+def test_429_retry_after_pauses_the_bucket():
+    reset_rate_limits({"limited": (10.0, 5.0)})
+    client = _Client([_Response(429, {"Retry-After": "1"}), _Response(200)])
+    start = time.perf_counter()
+    r = asyncio.run(resilient_get(client, "https://limited.test/x", upstream="limited", operation="get"))
+    # The retry queued until the upstream's back-off had passed.
+    assert r.status_code == 200
+    assert time.perf_counter() - start >= 0.9
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from apps.server import main
+from apps.server.services import timing
+from apps.server.services.metrics import upstream_call
+
+
+def _patch_upstreams(monkeypatch):
+    async def fake_airspace(lat, lon, alt):
+        with upstream_call("arcgis", "uasfm"):
+            await asyncio.sleep(0)
+        return {"airspace_class": "Class G", "laanc_required": False}
+
+    async def fake_observation(lat, lon):
+        return {"visibility_sm": 10.0, "cloud_ceiling_ft": 5000}, {}
+
+    async def fake_tfr(lat, lon):
+        return {"state": "CA", "tfr_count": 0, "status": "CLEAR"}
+
+    monkeypatch.setattr(main, "_preflight_airspace_data", fake_airspace)
+    monkeypatch.setattr(main, "fetch_latest_observation_by_latlon", fake_observation)
+    monkeypatch.setattr(main, "_preflight_tfr_data", fake_tfr)
+
+
+def _preflight(client):
+    flight = (datetime.now(UTC) + timedelta(hours=1)).isoformat()
+    return client.post(
+        "/api/preflight",
+        json={"latitude": 37.77, "longitude": -122.42, "altitude_ft": 200, "flight_datetime": flight},
+    )
+
+
+def test_preflight_reports_stage_timings(monkeypatch):
+    _patch_upstreams(monkeypatch)
+    r = _preflight(TestClient(main.app))
+
+    timings = r.json()["meta"]["timings_ms"]
+    assert {"airspace", "arcgis.uasfm", "weather", "tfr", "rules", "snapshot"} <= set(timings)
+    assert all(ms >= 0 for ms in timings.values())
+
+    header = r.headers["Server-Timing"]
+    assert "airspace;dur=" in header
+    assert "total;dur=" in header
+
+
+def test_tool_meta_carries_timings():
+    payload = {"mission_type": "recreational", "airspace_data": {}, "weather_data": {}, "tfr_data": {}}
+    r = TestClient(main.app).post("/tools/generate_preflight_checklist", json=payload)
+    assert "rules" in r.json()["meta"]["timings_ms"]
+    assert "rules;dur=" in r.headers["Server-Timing"]
+
+
+def test_timings_off_leaves_response_unchanged(monkeypatch):
+    _patch_upstreams(monkeypatch)
+    monkeypatch.setattr(timing, "REQUEST_TIMINGS_ENABLED", False)
+    client = TestClient(main.app)
+
+    r = _preflight(client)
+    assert "timings_ms" not in r.json()["meta"]
+    assert "Server-Timing" not in r.headers
+
+    payload = {"mission_type": "recreational", "airspace_data": {}, "weather_data": {}, "tfr_data": {}}
+    r = client.post("/tools/generate_preflight_checklist", json=payload)
+    assert "timings_ms" not in r.json()["meta"]
+    assert timing.span("anything") is timing.span("other")  # shared no-op
@@ -0,0 +1,144 @@
+import asyncio
+
+import httpx
+import pytest
+
+from apps.server import main
+from apps.server.services import faa_airspace
+from apps.server.services.ratelimit import bucket_for, reset_rate_limits
+from apps.server.services.resilience import (
+    CircuitBreaker,
+    ResiliencePolicy,
+    UpstreamUnavailable,
+    host_state,
+    resilient_get,
+)
+
+URL = "https://upstream.test/query"
+FAST = ResiliencePolicy(retry_base_delay_s=0.0, breaker_cooldown_s=60.0)
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class _ScriptedClient:
+    """
+    Each get() pops the next (delay_s, status_code | exception) step.
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def get(self, url, **kwargs):
+        delay, outcome = self.steps.pop(0) if self.steps else (0.0, 200)
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _Response(outcome)
+
+
+def _get(client):
+    return asyncio.run(resilient_get(client, URL, upstream="test", operation="query"))
+
+
+def test_retries_a_failed_attempt_once():
+    host_state(URL, FAST)
+    client = _ScriptedClient([(0, 503), (0, 200)])
+    assert _get(client).status_code == 200
+    assert client.calls == 2
+
+    client = _ScriptedClient([(0, httpx.ConnectError("refused")), (0, httpx.ConnectError("refused"))])
+    with pytest.raises(httpx.ConnectError):
+        _get(client)
+    assert client.calls == 2
+
+
+def test_retry_budget_caps_extra_attempts():
+    state = host_state(URL, FAST)
+    state.budget.tokens = 0.0
+    client = _ScriptedClient([(0, 503), (0, 200)])
+    assert _get(client).status_code == 503
+    assert client.calls == 1
+
+
+def test_breaker_opens_then_half_open_probe_closes_it():
+    state = host_state(URL, ResiliencePolicy(retry_base_delay_s=0.0, max_attempts=1, breaker_cooldown_s=60.0))
+    for _ in range(state.policy.breaker_failure_threshold):
+        _get(_ScriptedClient([(0, 502)]))
+    assert state.breaker.state == CircuitBreaker.OPEN
+
+    client = _ScriptedClient([])
+    with pytest.raises(UpstreamUnavailable):
+        _get(client)
+    assert client.calls == 0
+
+    state.breaker.opened_at -= 61.0  # cooldown elapsed
+    assert _get(_ScriptedClient([(0, 200)])).status_code == 200
+    assert state.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    state = host_state(URL, FAST)
+    for _ in range(state.policy.hedge_min_samples):
+        state.latency.record(0.01)
+    client = _ScriptedClient([(1.0, 200), (0.0, 200)])
+    assert _get(client).status_code == 200
+    assert client.calls == 2
+    assert client.cancelled == 1
+
+
+def test_hedge_refused_by_retry_budget_spends_no_rate_limit_token():
+    reset_rate_limits({"test": (0.001, 5.0)})
+    state = host_state(URL, FAST)
+    for _ in range(state.policy.hedge_min_samples):
+        state.latency.record(0.01)
+    state.budget.tokens = 0.0
+    client = _ScriptedClient([(0.2, 200)])
+    assert _get(client).status_code == 200
+    assert client.calls == 1
+    assert bucket_for("test").tokens == pytest.approx(4.0, abs=0.01)  # the primary's token only
+
+
+def test_timeout_adapts_to_observed_latency():
+    state = host_state(URL, FAST)
+    assert state.timeout_s(15.0) == 15.0  # not enough samples yet
+    for _ in range(50):
+        state.latency.record(1.0)
+    assert state.timeout_s(15.0) == 3.0  # 3 x p99
+    for _ in range(256):
+        state.latency.record(0.05)
+    assert state.timeout_s(15.0) == FAST.timeout_floor_s
+
+
+def _open_breaker(url):
+    state = host_state(url)
+    state.breaker.opened_at = 10**12
+    state.breaker.state = CircuitBreaker.OPEN
+
+
+def test_open_arcgis_breaker_falls_back_to_unknown_airspace():
+    _open_breaker(faa_airspace.UASFM_LAYER_URL)
+    _open_breaker(faa_airspace.CLASS_AIRSPACE_LAYER_URL)
+    # Far from any airport in the fallback database: must not conclude Class G.
+    res = asyncio.run(faa_airspace.analyze_airspace(39.5, -111.5, 200))
+    assert res.airspace_class == "Unknown"
+    assert res.laanc_required is None
+    assert res.debug["unavailable_layers"] == ["class_airspace", "uasfm", "uasfm"]
+
+
+def test_open_nws_breaker_makes_tfr_status_unknown():
+    from apps.server.services.faa_tfr import NWS_POINTS_URL
+
+    _open_breaker(NWS_POINTS_URL.format(lat=0.0, lon=0.0))
+    tfr = asyncio.run(main._preflight_tfr_data(37.77, -122.42))
+    assert tfr["status"] == "UNKNOWN"
+    assert tfr["coverage"]["tfr"] == "upstream_unavailable"
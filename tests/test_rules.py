@@ -34,3 +34,93 @@ def test_class_g_go():
         tfr_data={"status": "CLEAR", "tfr_count": 0},
     )
     assert decision.overall_status == "GO"
+
+
+def test_batch_matches_scalar_for_every_category():
+    from itertools import product
+
+    from packages.core.rules import decide_preflight_batch
+
+    rows = list(
+        product(
+            ["CLEAR", "clear", "DO_NOT_FLY", "UNKNOWN", None, "ACTIVE"],
+            [True, False, None, "yes"],
+            ["Class B", "Controlled (heuristic)", "Unknown", "UNKNOWN", None],
+            ["GOOD", "MARGINAL", "UNKNOWN", "POOR", "VERIFY_24HR_BEFORE", None],
+        )
+    )
+    batch = decide_preflight_batch(*(list(col) for col in zip(*rows, strict=True)))
+
+    assert len(batch) == len(rows)
+    for i, (tfr, laanc, airspace_class, wx) in enumerate(rows):
+        expected = decide_preflight(
+            mission_type="recreational",
+            airspace_data={"airspace_class": airspace_class, "laanc_required": laanc},
+            weather_data={"part107_compliance": {"overall_status": wx}},
+            tfr_data={"status": tfr},
+        )
+        assert batch.overall_status[i] == expected.overall_status
+        assert batch.decision(i) == expected
+        assert {k: list(v) if isinstance(v, tuple) else v for k, v in batch.to_dict(i).items()} == expected.to_dict()
+    assert sum(1 for _ in batch.dicts()) == len(rows)
+
+
+def test_compiled_rules_match_reference_implementation():
+    from itertools import product
+
+    from tests.benchmarks.reference_rules import reference_decide_preflight
+
+    for tfr, laanc, airspace_class, wx in product(
+        ["CLEAR", "do_not_fly", "UNKNOWN", None, "ACTIVE"],
+        [True, False, None, "yes"],
+        ["Class D", "Unknown", "", None],
+        ["GOOD", "marginal", "UNKNOWN", "POOR", "VERIFY_24HR_BEFORE", None],
+    ):
+        kwargs = {
+            "mission_type": "recreational",
+            "airspace_data": {"airspace_class": airspace_class, "laanc_required": laanc},
+            "weather_data": {"part107_compliance": {"overall_status": wx}},
+            "tfr_data": {"status": tfr},
+        }
+        assert decide_preflight(**kwargs) == reference_decide_preflight(**kwargs)
+
+
+def test_checklist_items_are_shared_and_immutable():
+    import pytest
+
+    kwargs = {
+        "mission_type": "recreational",
+        "airspace_data": {"laanc_required": False, "airspace_class": "Class G"},
+        "weather_data": {"part107_compliance": {"overall_status": "GOOD"}},
+        "tfr_data": {"status": "CLEAR"},
+    }
+    first, second = decide_preflight(**kwargs), decide_preflight(**kwargs)
+    assert all(a is b for a, b in zip(first.checklist_items, second.checklist_items, strict=True))
+    with pytest.raises(TypeError):
+        first.checklist_items[0]["status"] = "ACTION_NEEDED"
+
+
+def test_cached_decision_is_shared_and_matches_scalar():
+    from dataclasses import asdict
+
+    from packages.core.rules import decide_preflight_cached, decision_cache_stats
+
+    def kwargs(airspace_class):
+        return {
+            "mission_type": "recreational",
+            "airspace_data": {"laanc_required": True, "airspace_class": airspace_class, "facility": "ignored"},
+            "weather_data": {"part107_compliance": {"overall_status": "good"}, "current_conditions": {"x": 1}},
+            "tfr_data": {"status": "CLEAR", "tfr_count": 0},
+        }
+
+    before = decision_cache_stats()["hits"]
+    first = decide_preflight_cached(**kwargs("Class C"))
+    second = decide_preflight_cached(**kwargs("Class C"))
+    other = decide_preflight_cached(**kwargs("Class D"))
+
+    assert first is second
+    assert other is not first
+    assert decision_cache_stats()["hits"] >= before + 1
+    assert {k: list(v) if isinstance(v, tuple) else v for k, v in asdict(first).items()} == asdict(
+        decide_preflight(**kwargs("Class C"))
+    )
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from apps.server.services import faa_tfr
+from apps.server.services.cache import TTLCache
+from apps.server.services.shared_cache import SQLiteBackend, create_backend, set_backend
+
+
+@pytest.fixture
+def sqlite_l2(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"))
+    set_backend(backend)
+    yield backend
+    set_backend(None)
+
+
+def test_l1_miss_reads_through_to_the_shared_tier(sqlite_l2):
+    expires_at = time.time() + 60
+    worker_a = TTLCache("test_shared_roundtrip", maxsize=8, shared=True)
+    asyncio.run(worker_a.set_shared(("MTR", 85, 105), {"periods": [1, 2, 3]}, expires_at=expires_at))
+
+    worker_b = TTLCache("test_shared_roundtrip", maxsize=8, shared=True)  # fresh process, empty L1
+    assert worker_b.get(("MTR", 85, 105)) is None  # the sync path never touches the L2
+    assert asyncio.run(worker_b.get_shared(("MTR", 85, 105))) == {"periods": [1, 2, 3]}
+    assert worker_b.peek(("MTR", 85, 105))[1] == pytest.approx(expires_at)
+    assert worker_b.get(("MTR", 85, 105)) is not None
+    assert worker_b.stats()["l2_hits"] == 1
+    assert worker_b.stats()["hits"] == 1
+
+
+def test_l2_io_runs_off_the_event_loop(sqlite_l2, monkeypatch):
+    threads = []
+    get, put = sqlite_l2.get, sqlite_l2.set
+
+    def recording_get(*args):
+        threads.append(threading.get_ident())
+        return get(*args)
+
+    def recording_set(*args):
+        threads.append(threading.get_ident())
+        return put(*args)
+
+    monkeypatch.setattr(sqlite_l2, "get", recording_get)
+    monkeypatch.setattr(sqlite_l2, "set", recording_set)
+
+    async def load():
+        return "v", time.time() + 60
+
+    async def scenario():
+        cache = TTLCache("test_shared_threads", maxsize=8, shared=True)
+        assert await cache.get_or_load("k", load) == "v"  # L2 miss, load, write-through
+        assert cache.get("k") == "v"
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert len(threads) == 2
+    assert loop_thread not in threads
+
+
+def test_expired_and_unshared_entries_are_not_served(sqlite_l2):
+    shared = TTLCache("test_shared_expiry", maxsize=8, shared=True)
+    asyncio.run(shared.set_shared("gone", "v", expires_at=time.time() - 1))
+    local_only = TTLCache("test_shared_local", maxsize=8)
+    asyncio.run(local_only.set_shared("k", "v", ttl_s=60))
+
+    assert asyncio.run(TTLCache("test_shared_expiry", maxsize=8, shared=True).get_shared("gone")) is None
+    assert asyncio.run(TTLCache("test_shared_local", maxsize=8).get_shared("k")) is None
+
+
+def test_backend_errors_are_misses():
+    class _Broken:
+        def get(self, namespace, key):
+            raise OSError("disk gone")
+
+        def set(self, namespace, key, payload, expires_at):
+            raise OSError("disk gone")
+
+        def close(self):
+            pass
+
+    set_backend(_Broken())
+    try:
+        cache = TTLCache("test_shared_broken", maxsize=8, shared=True)
+        asyncio.run(cache.set_shared("k", "v", ttl_s=60))
+        assert asyncio.run(cache.get_shared("k")) == "v"  # L1 unaffected
+        assert asyncio.run(cache.get_shared("other")) is None
+    finally:
+        set_backend(None)
+
+
+def test_tfr_list_is_fetched_once_across_workers(sqlite_l2, monkeypatch):
+    calls = []
+
+    class _Response:
+        status_code = 200
+        text = '<html><body>[{"notam_id": "1/2345", "state": "CA"}]</body></html>'
+
+        def raise_for_status(self):
+            pass
+
+    async def fake_get(client, url, **kwargs):
+        calls.append(url)
+        return _Response()
+
+    monkeypatch.setattr(faa_tfr, "resilient_get", fake_get)
+    faa_tfr.TFR_LIST_CACHE.clear()
+    first = asyncio.run(faa_tfr.fetch_tfr_list_json())
+    faa_tfr.TFR_LIST_CACHE.clear()  # another worker: empty L1, same L2
+    second = asyncio.run(faa_tfr.fetch_tfr_list_json())
+    faa_tfr.TFR_LIST_CACHE.clear()
+
+    assert first == second == [{"notam_id": "1/2345", "state": "CA"}]
+    assert len(calls) == 1
+
+
+def test_backend_urls(tmp_path):
+    assert create_backend("") is None
+    backend = create_backend(f"sqlite://{tmp_path}/x.db")
+    assert isinstance(backend, SQLiteBackend) and backend.path == f"{tmp_path}/x.db"
+    backend.close()
+    with pytest.raises(ValueError):
+        create_backend("memcached://localhost")
+
+
+def test_no_backend_means_no_thread_hop(monkeypatch):
+    set_backend(None)
+
+    async def no_thread(*args, **kwargs):
+        raise AssertionError("L2 thread hop without a backend")
+
+    monkeypatch.setattr(asyncio, "to_thread", no_thread)
+
+    async def load():
+        return "v", time.time() + 60
+
+    async def scenario():
+        cache = TTLCache("test_shared_disabled", maxsize=8, shared=True)
+        assert await cache.get_or_load("k", load) == "v"
+        await cache.set_shared("k2", "v2", ttl_s=60)
+        assert await cache.get_shared("k2") == "v2"
+        assert await cache.get_shared("missing") is None
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["hits"], stats["l2_hits"], stats["misses"]) == (1, 0, 2)
@@ -0,0 +1,48 @@
+import json
+
+from apps.server.services.station_catalog import Station, StationCatalog, load_station_catalog
+
+
+def _catalog():
+    return StationCatalog(
+        [
+            Station("KSFO", "San Francisco Intl", 37.6196, -122.3656, True, True),
+            Station("KOAK", "Oakland Intl", 37.7213, -122.2208, True, True),
+            Station("C1234", "Backyard mesonet", 37.7750, -122.4190, False, False),
+            Station("KSEA", "Seattle-Tacoma", 47.4502, -122.3088, True, True),
+        ]
+    )
+
+
+def test_nearest_uses_distance_and_radius():
+    near = _catalog().nearest(37.7749, -122.4194, k=8, max_distance_nm=30)
+    assert [st.station_id for st, _ in near] == ["C1234", "KSFO", "KOAK"]
+    assert near[0][1] < 0.1
+
+
+def test_rank_candidates_demotes_stations_without_aviation_sensors():
+    assert _catalog().rank_candidates(37.7749, -122.4194, k=3) == ["KSFO", "KOAK", "C1234"]
+
+
+def test_load_nws_geojson_dump(tmp_path):
+    path = tmp_path / "stations.json"
+    path.write_text(
+        json.dumps(
+            {
+                "features": [
+                    {
+                        "geometry": {"coordinates": [-122.3656, 37.6196]},
+                        "properties": {"stationIdentifier": "KSFO", "name": "San Francisco"},
+                    },
+                    {
+                        "geometry": {"coordinates": [-122.419, 37.775]},
+                        "properties": {"stationIdentifier": "AW020", "name": "Mesonet"},
+                    },
+                ]
+            }
+        )
+    )
+    catalog = load_station_catalog(str(path))
+    by_id = {st.station_id: st for st in catalog.stations}
+    assert by_id["KSFO"].reports_visibility is True
+    assert by_id["AW020"].reports_visibility is None